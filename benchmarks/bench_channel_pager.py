@@ -0,0 +1,62 @@
+"""
+Pages through channel video lists with channel_pager.ChannelPager against the local fake
+YouTube and reports channels/s, videos/s and continuation requests. Needs no browser: the
+first page is fetched over HTTP as well. The paging itself is checked by
+tests/test_channel_pager.py.
+
+Usage:
+    python benchmarks/bench_channel_pager.py --channels 50 --latency 0.05
+    python benchmarks/bench_channel_pager.py --fixtures recorded/   # replay browse_<n>.json
+"""
+from pathlib import Path
+
+import argparse
+import tempfile
+import json
+import time
+import sys
+import os
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_youtube import FakeYouTube, WORDS
+from run_offline import write_config
+
+
+def run(args: argparse.Namespace) -> None:
+    from channel_pager import ChannelPager
+    from http_client import fetch_text, youtube_url
+
+    handles = [f"{WORDS[i % len(WORDS)]}{i}" for i in range(args.channels)]
+    videos = pages = 0
+
+    started = time.perf_counter()
+    for handle in handles:
+        pager = ChannelPager.from_html(fetch_text(youtube_url(f"/@{handle}/videos")) or "")
+        ids = [video.video_id for video in pager]
+        videos += len(ids)
+        pages += pager.pages
+        if pager.failed:
+            print(f"@{handle}: a continuation failed after {len(ids)} videos")
+    elapsed = time.perf_counter() - started
+
+    print(f"channels: {len(handles)} in {elapsed:.2f}s ({len(handles) / elapsed:.1f}/s)")
+    print(f"videos:   {videos} ({videos / elapsed:.0f}/s), {pages} continuation requests")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Continuation paging benchmark against the fake YouTube.")
+    parser.add_argument("--config", default="config copy.json", help="config to copy")
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds to every response")
+    parser.add_argument("--fixtures", help="directory with recorded channel_videos.html and browse_<n>.json")
+    args = parser.parse_args()
+
+    with FakeYouTube(fixtures=args.fixtures, latency=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        os.environ["KEYWORD_MASTER_CONFIG"] = write_config(args.config, server.base_url, directory)
+        run(args)
+        print(f"requests: {json.dumps(server.requests)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares page load time and bytes transferred per page with Lean_Mode on and off.
+
+Loads the same search results, channel videos and watch pages in a normal and a lean
+Firefox (utils.start_firefox(lean=...)), waits for each page's load event and reads its
+Navigation and Resource Timing entries with utils.page_transfer. Cross-origin responses
+without Timing-Allow-Origin report 0 bytes, so the byte totals are a lower bound; the
+request counts include them.
+
+Usage:
+    python benchmarks/bench_lean.py
+    python benchmarks/bench_lean.py --query "python tutorial" --channel @YouTube --video dQw4w9WgXcQ --repeat 3
+"""
+from pathlib import Path
+from urllib.parse import quote_plus
+
+import argparse
+import time
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def load(driver, url: str, timeout: float = 30.0) -> dict:
+    """
+    Opens the url, waits for the load event and returns its page_transfer numbers.
+    """
+    from utils import page_transfer
+
+    driver.get(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if driver.execute_script("return document.readyState") == "complete":
+            break
+        time.sleep(0.1)
+    driver.execute_script("performance.setResourceTimingBufferSize(100000)")
+    # Let late requests of the page (player, comments) land in the resource timing buffer
+    time.sleep(2)
+    return page_transfer(driver)
+
+
+def measure(lean: bool, urls: dict[str, str], repeat: int) -> dict[str, list[dict]]:
+    from utils import start_firefox
+
+    driver = start_firefox(lean=lean)
+    try:
+        return {page: [load(driver, url) for _ in range(repeat)] for page, url in urls.items()}
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lean browsing mode benchmark.")
+    parser.add_argument("--base-url", default="https://www.youtube.com")
+    parser.add_argument("--query", default="python tutorial")
+    parser.add_argument("--channel", default="@YouTube")
+    parser.add_argument("--video", default="dQw4w9WgXcQ")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    urls = {
+        "search": f"{args.base_url}/results?search_query={quote_plus(args.query)}",
+        "channel": f"{args.base_url}/{args.channel}/videos",
+        "watch": f"{args.base_url}/watch?v={args.video}",
+    }
+
+    results = {mode: measure(mode == "lean", urls, args.repeat) for mode in ("normal", "lean")}
+
+    print(f"{'page':<8} {'mode':<7} {'load s':>8} {'KB':>9} {'requests':>9}")
+    for page in urls:
+        for mode, pages in results.items():
+            runs = pages[page]
+            seconds = sum(run["load_seconds"] for run in runs) / len(runs)
+            kilobytes = sum(run["bytes"] for run in runs) / len(runs) / 1024
+            requests = sum(run["requests"] for run in runs) / len(runs)
+            print(f"{page:<8} {mode:<7} {seconds:>8.2f} {kilobytes:>9.0f} {requests:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures the throughput of the metric text parsers in parsing.py on millions of strings,
+as in offline re-processing. Their results are checked by tests/test_parsing.py.
+
+Usage: python benchmarks/bench_metrics.py [strings]
+"""
+from pathlib import Path
+
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import parsing
+from parsing import parse_age_days, parse_count, parse_duration_minutes
+
+
+def random_texts(count: int, distinct: int, seed: int = 0) -> dict[str, list[str]]:
+    rng = random.Random(seed)
+    suffixes = ["", "K", "M", "B"]
+    pools = {
+        "count": [f"{rng.randint(1, 999)}{'.' + str(rng.randint(1, 9)) if rng.random() < 0.5 else ''}"
+                  f"{rng.choice(suffixes)} views" for _ in range(distinct)],
+        "age": [f"{rng.choice(['', 'Streamed '])}{rng.randint(1, 59)} "
+                f"{rng.choice(['minute', 'hour', 'day', 'week', 'month', 'year'])}s ago" for _ in range(distinct)],
+        "duration": [f"{rng.randint(0, 59)}:{rng.randint(0, 59):02d}" for _ in range(distinct)],
+    }
+    return {name: rng.choices(pool, k=count) for name, pool in pools.items()}
+
+
+def bench(count: int) -> None:
+    texts = random_texts(count, distinct=5000)
+    parsers = {"count": parse_count, "age": parse_age_days, "duration": parse_duration_minutes}
+
+    for name, parser in parsers.items():
+        parser.cache_clear()
+        column = texts[name]
+
+        started = time.perf_counter()
+        for text in column:
+            parser(text)
+        elapsed = time.perf_counter() - started
+
+        # The same strings without memoization
+        uncached = parser.__wrapped__
+        started = time.perf_counter()
+        for text in column[:count // 10]:
+            uncached(text)
+        uncached_elapsed = (time.perf_counter() - started) * 10
+
+        print(f"{name:<9} {count / elapsed:12,.0f} strings/s memoized, {count / uncached_elapsed:12,.0f} strings/s uncached")
+
+
+def main() -> None:
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
+    print(f"cache size per parser: {parsing.CACHE_SIZE}")
+
+
+if __name__ == "__main__":
+    main()
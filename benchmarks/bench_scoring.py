@@ -0,0 +1,62 @@
+"""
+Times yt_keywords.calculate_video_rating against scoring.score_videos over a large synthetic
+corpus. Their parity is checked by tests/test_scoring.py.
+
+Usage: python benchmarks/bench_scoring.py [videos]
+"""
+from pathlib import Path
+
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from yt_keywords import calculate_video_rating, calculate_similarity_weight
+from scoring import score_videos, CHANNEL_SCORE_EDGES, LENGTH_SCORE_EDGES, RECENCY_SCORE_EDGES
+
+WORDS = ["minecraft", "tutorial", "how", "to", "build", "house", "guitar", "lesson", "easy", "recipe", "cake", "review"]
+
+
+def random_corpus(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    # Bucket edges and their neighbours, so every branch is timed
+    edge_values = [e + d for edges in (CHANNEL_SCORE_EDGES, LENGTH_SCORE_EDGES, RECENCY_SCORE_EDGES)
+                   for e in edges for d in (-0.01, 0, 0.01)]
+
+    corpus = []
+    for _ in range(count):
+        keyword = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        title = " ".join(rng.sample(WORDS, rng.randint(2, 6)))
+        corpus.append({
+            "title": title,
+            "keyword": keyword,
+            "views": rng.choice([0, 1, rng.randint(0, 10**9)]),
+            "recency": rng.choice([0.01, rng.choice(edge_values), round(rng.uniform(0.01, 500), 2)]),
+            "duration": rng.choice([0.01, rng.choice(edge_values), round(rng.uniform(0, 120), 2)]),
+            "subscribers": rng.choice([int(rng.choice(edge_values)), rng.randint(0, 10**7)]),
+        })
+    return corpus
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    corpus = random_corpus(count, seed=2)
+    similarity = [calculate_similarity_weight(v["title"], v["keyword"]) for v in corpus]
+    columns = {name: [v[name] for v in corpus] for name in ("views", "recency", "duration", "subscribers")}
+
+    started = time.perf_counter()
+    for video in corpus:
+        calculate_video_rating(**video)
+    per_video = time.perf_counter() - started
+
+    started = time.perf_counter()
+    score_videos(**columns, similarity=similarity)
+    batch = time.perf_counter() - started
+
+    print(f"{count} videos: per-video {per_video:.2f}s (includes similarity), batch {batch:.3f}s (similarity precomputed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Times title/keyword similarity: one fuzz.partial_ratio call per pair (the original
+calculate_similarity_weight, on difflib) against SimilarityEngine with each backend.
+
+The fuzzywuzzy backend must match the per-pair scores exactly (tests/test_similarity.py
+checks this as well); for rapidfuzz the share and size of the differing scores are reported.
+
+Usage: python benchmarks/bench_similarity.py [pairs]
+"""
+from pathlib import Path
+
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fuzzywuzzy import fuzz
+from similarity import SimilarityEngine
+
+WORDS = ["minecraft", "tutorial", "How", "to", "build", "a", "house", "guitar", "lesson", "EASY", "recipe",
+         "cake", "review", "2024", "best", "beginner", "tips", "survival", "vlog", "|", "part", "1"]
+
+
+def random_pairs(count: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    # Rescoring sees every keyword with a handful of titles, and popular titles under many keywords
+    keywords = [" ".join(rng.sample(WORDS, rng.randint(1, 4))) for _ in range(max(1, count // 3))]
+    titles = [" ".join(rng.choices(WORDS, k=rng.randint(3, 12))) for _ in range(max(1, count // 2))]
+    keyword_column = [keywords[i // 3 % len(keywords)] for i in range(count)]
+    title_column = [rng.choice(titles) for _ in range(count)]
+    return keyword_column, title_column
+
+
+def timed(label: str, function, count: int):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.3f}s  {count / elapsed:12,.0f} pairs/s")
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    keywords, titles = random_pairs(count)
+
+    expected = timed("per-pair fuzz.partial_ratio",
+                     lambda: [fuzz.partial_ratio(t.lower(), k.lower()) for k, t in zip(keywords, titles)], count)
+
+    engine = SimilarityEngine("fuzzywuzzy")
+    actual = timed("engine fuzzywuzzy (cold)", lambda: engine.score_pairs(keywords, titles), count)
+    assert actual.tolist() == expected, "fuzzywuzzy backend does not match per-pair partial_ratio"
+    timed("engine fuzzywuzzy (cached)", lambda: engine.score_pairs(keywords, titles), count)
+    print(f"parity: fuzzywuzzy backend matches on {count} pairs, cache hit rate {engine.hit_rate:.0%}")
+
+    engine = SimilarityEngine("rapidfuzz")
+    fast = timed("engine rapidfuzz (cold)", lambda: engine.score_pairs(keywords, titles), count)
+    differences = [a - b for a, b in zip(fast.tolist(), expected) if a != b]
+    print(f"rapidfuzz differs from fuzzywuzzy on {len(differences)} of {count} pairs ({len(differences) / count:.2%}), "
+          f"by {min(differences, default=0)} to {max(differences, default=0)} points")
+
+
+if __name__ == "__main__":
+    main()
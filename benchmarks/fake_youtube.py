@@ -0,0 +1,339 @@
+"""
+A local stand-in for youtube.com serving search, channel-videos and watch pages, and
+the youtubei/v1/browse continuation pages of channel video lists.
+
+Pages are generated deterministically from the request path, laid out so the scraper's
+XPaths, readiness checks and ytInitialData/ytInitialPlayerResponse parsers all find
+what they expect. Recorded pages can be served instead by putting search.html,
+channel_videos.html and watch.html in a fixtures directory, and recorded continuation
+responses as browse_1.json, browse_2.json, ... (served in that order, following the
+continuation tokens they contain).
+
+Usage: python benchmarks/fake_youtube.py [--port 8765] [--fixtures DIR] [--latency 0.05]
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit, unquote
+from html import escape
+from pathlib import Path
+
+import threading
+import argparse
+import hashlib
+import random
+import json
+import time
+
+
+WORDS = ["minecraft", "tutorial", "how", "to", "build", "house", "guitar", "lesson", "easy", "recipe", "cake",
+         "review", "best", "beginner", "tips", "survival", "vlog", "setup", "budget", "speedrun", "guide"]
+AGES = ["5 minutes ago", "3 hours ago", "Streamed 5 hours ago", "1 day ago", "4 days ago", "2 weeks ago",
+        "1 month ago", "5 months ago", "1 year ago"]
+
+
+def _rng(*parts: str) -> random.Random:
+    return random.Random(hashlib.sha1("/".join(parts).encode()).hexdigest())
+
+
+def _count(rng: random.Random, high: int) -> str:
+    value = rng.randint(0, high)
+    if value >= 1000000:
+        return f"{value / 1000000:.1f}M".replace(".0M", "M")
+    if value >= 1000:
+        return f"{value / 1000:.1f}K".replace(".0K", "K")
+    return str(value)
+
+
+def _video_id(rng: random.Random) -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(11))
+
+
+def _page(body: str, variable: str, data: dict, title: str) -> str:
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{escape(title)} - YouTube</title></head>"
+            f"<body>{body}<script>var {variable} = {json.dumps(data)};</script></body></html>")
+
+
+def search_page(keyword: str, results: int = 20) -> str:
+    """
+    Returns a search results page for a keyword.
+    """
+    rng = _rng("search", keyword)
+    renderers, items = [], []
+    for _ in range(results):
+        video_id = _video_id(rng)
+        title = " ".join([keyword] + rng.sample(WORDS, rng.randint(1, 5)))
+        views = f"{_count(rng, 5000000)} views"
+        published = rng.choice(AGES)
+        duration = f"{rng.randint(0, 40)}:{rng.randint(0, 59):02d}"
+        subscribers = f"{_count(rng, 200000)} subscribers"
+        handle = "@" + "".join(rng.sample(WORDS, 2)) + str(rng.randint(1, 999))
+
+        renderers.append(
+            f'<ytd-video-renderer><div id="dismissible">'
+            f'<ytd-thumbnail><a href="/watch?v={video_id}"><div id="overlays">'
+            f'<ytd-thumbnail-overlay-time-status-renderer><div><badge-shape><div>{duration}</div></badge-shape></div>'
+            f'</ytd-thumbnail-overlay-time-status-renderer></div></a></ytd-thumbnail>'
+            f'<div class="text-wrapper">'
+            f'<div id="meta"><div id="title-wrapper"><h3><a href="/watch?v={video_id}">'
+            f'<yt-formatted-string>{escape(title)}</yt-formatted-string></a></h3></div>'
+            f'<ytd-video-meta-block><div id="metadata"><div id="byline-container"></div>'
+            f'<div><span>{views}</span><span>{published}</span></div></div></ytd-video-meta-block></div>'
+            f'<div id="channel-info"><div><div><div>{subscribers}</div></div></div>'
+            f'<ytd-channel-name><div><div><yt-formatted-string><a href="/{handle}">{handle[1:]}</a>'
+            f'</yt-formatted-string></div></div></ytd-channel-name></div>'
+            f'</div></div></ytd-video-renderer>')
+
+        items.append({"videoRenderer": {
+            "videoId": video_id,
+            "title": {"runs": [{"text": title}]},
+            "shortViewCountText": {"simpleText": views},
+            "publishedTimeText": {"simpleText": published},
+            "lengthText": {"simpleText": duration},
+            "ownerText": {"runs": [{"text": handle[1:], "navigationEndpoint": {
+                "browseEndpoint": {"browseId": "UC" + video_id * 2, "canonicalBaseUrl": f"/{handle}"}}}]},
+        }})
+
+    body = ('<ytd-app><div id="content"><ytd-page-manager><ytd-search><div id="container">'
+            '<ytd-two-column-search-results-renderer><div id="primary"><ytd-section-list-renderer>'
+            '<div id="header"></div><div id="contents"><ytd-item-section-renderer>'
+            '<div id="header"></div><div id="spinner"></div><div id="contents">'
+            + "".join(renderers) +
+            '</div></ytd-item-section-renderer></div></ytd-section-list-renderer></div>'
+            '</ytd-two-column-search-results-renderer></div></ytd-search></ytd-page-manager></div></ytd-app>')
+
+    data = {"contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {"sectionListRenderer": {
+        "contents": [{"itemSectionRenderer": {"contents": items}}]}}}}}
+    return _page(body, "ytInitialData", data, keyword)
+
+
+# Videos per page of a channel's grid, as YouTube serves them
+CHANNEL_PAGE_SIZE = 30
+
+YTCFG = {"INNERTUBE_API_KEY": "fake-key",
+         "INNERTUBE_CONTEXT": {"client": {"clientName": "WEB", "clientVersion": "2.20241010.00.00", "hl": "en"}}}
+
+
+def channel_videos(handle: str, videos: int = 90) -> list[dict]:
+    """
+    Returns every video of a channel, newest first.
+    """
+    rng = _rng("channel", handle, "videos")
+    return [{"id": _video_id(rng), "title": " ".join(rng.sample(WORDS, rng.randint(2, 6))),
+             "views": f"{_count(rng, 100000)} views", "age": AGES[age]}
+            for age in sorted(rng.choices(range(len(AGES)), k=videos))]
+
+
+def _grid_items(handle: str, page: int) -> list[dict]:
+    """
+    Returns the richItemRenderers of one page of a channel's grid, followed by the
+    continuationItemRenderer of the next page if there is one.
+    """
+    videos = channel_videos(handle)
+    start = page * CHANNEL_PAGE_SIZE
+    items = [{"richItemRenderer": {"content": {"videoRenderer": {
+        "videoId": video["id"],
+        "title": {"runs": [{"text": video["title"]}]},
+        "viewCountText": {"simpleText": video["views"]},
+        "publishedTimeText": {"simpleText": video["age"]},
+    }}}} for video in videos[start:start + CHANNEL_PAGE_SIZE]]
+
+    if start + CHANNEL_PAGE_SIZE < len(videos):
+        items.append({"continuationItemRenderer": {"continuationEndpoint": {
+            "continuationCommand": {"token": f"{handle}:{page + 1}", "request": "CONTINUATION_REQUEST_TYPE_BROWSE"}}}})
+    return items
+
+
+def channel_videos_page(handle: str) -> str:
+    """
+    Returns the videos tab of a channel with its first page of videos, newest first.
+    """
+    rng = _rng("channel", handle)
+    subscribers = f"{_count(rng, 20000)} subscribers"
+
+    cards = []
+    for video in channel_videos(handle)[:CHANNEL_PAGE_SIZE]:
+        cards.append(
+            f'<ytd-rich-item-renderer><div id="details"><h3><a id="video-title" href="/watch?v={video["id"]}">'
+            f'{escape(video["title"])}</a></h3><div id="metadata-line"><span>{video["views"]}</span>'
+            f'<span>{video["age"]}</span></div></div></ytd-rich-item-renderer>')
+
+    data = {
+        "metadata": {"channelMetadataRenderer": {"title": handle, "externalId": "UC" + handle,
+                                                 "vanityChannelUrl": f"http://www.youtube.com/@{handle}"}},
+        "header": {"c4TabbedHeaderRenderer": {"title": handle, "subscriberCountText": {"simpleText": subscribers}}},
+        "contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {
+            "title": "Videos", "selected": True,
+            "content": {"richGridRenderer": {"contents": _grid_items(handle, 0)}}}}]}},
+    }
+    ytcfg = ("<script>var ytcfg = {data_: {}, set: function (o) { for (var k in o) this.data_[k] = o[k]; }};"
+             f"ytcfg.set({json.dumps(YTCFG)});</script>")
+    return _page(ytcfg + "<ytd-app><div id=\"contents\">" + "".join(cards) + "</div></ytd-app>",
+                 "ytInitialData", data, handle)
+
+
+def browse_response(token: str) -> dict | None:
+    """
+    Returns the continuation page of a channel's grid for a token from channel_videos_page.
+    """
+    handle, _, page = token.rpartition(":")
+    if not handle or not page.isdigit():
+        return None
+    return {"onResponseReceivedActions": [{"appendContinuationItemsAction": {
+        "continuationItems": _grid_items(handle, int(page))}}]}
+
+
+def watch_page(video_id: str) -> str:
+    """
+    Returns the watch page of a video with its tags.
+    """
+    rng = _rng("watch", video_id)
+    keywords = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(rng.randint(0, 12))]
+    data = {"videoDetails": {"videoId": video_id, "keywords": keywords}}
+    return _page(f'<ytd-app><div id="player">{video_id}</div></ytd-app>', "ytInitialPlayerResponse", data, video_id)
+
+
+def _continuation_token(node) -> str | None:
+    """
+    Returns the first continuationCommand token in a decoded response.
+    """
+    if isinstance(node, dict):
+        if "continuationCommand" in node:
+            return node["continuationCommand"].get("token")
+        node = list(node.values())
+    if isinstance(node, list):
+        for item in node:
+            token = _continuation_token(item)
+            if token:
+                return token
+    return None
+
+
+class FakeYouTube:
+    """
+    Serves the fake pages on a background thread.
+
+    Attributes:
+        base_url (str): The URL to use as YouTube_Base_URL.
+        requests (dict): Requests served per page kind.
+    """
+
+    def __init__(self, port: int = 0, fixtures: str | None = None, latency: float = 0.0):
+        self.fixtures = Path(fixtures) if fixtures else None
+        self.latency = latency
+        self.requests = {"search": 0, "channel": 0, "watch": 0, "browse": 0, "other": 0}
+        self._lock = threading.Lock()
+        # continuation token -> number of the recorded browse_<n>.json that answers it
+        self._recorded_tokens: dict[str, int] = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                kind, html = server.render(self.path)
+                self.reply(kind, html, "text/html")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    request = {}
+                if urlsplit(self.path).path == "/youtubei/v1/browse":
+                    self.reply("browse", server.browse(str(request.get("continuation", ""))), "application/json")
+                else:
+                    self.reply("other", "", "application/json")
+
+            def reply(self, kind: str, text: str, content_type: str):
+                with server._lock:
+                    server.requests[kind] += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                body = text.encode()
+                self.send_response(200 if text else 404)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _recorded(self, name: str) -> str | None:
+        if self.fixtures and (self.fixtures / name).is_file():
+            return (self.fixtures / name).read_text(encoding="utf-8")
+        return None
+
+    def render(self, path: str) -> tuple[str, str]:
+        """
+        Returns the page kind and HTML for a request path.
+        """
+        url = urlsplit(path)
+        query = parse_qs(url.query)
+
+        if url.path == "/results":
+            keyword = query.get("search_query", [""])[0]
+            return "search", self._recorded("search.html") or search_page(keyword)
+        if url.path == "/watch":
+            video_id = query.get("v", [""])[0]
+            return "watch", self._recorded("watch.html") or watch_page(video_id)
+        if url.path.startswith("/@"):
+            handle = unquote(url.path[2:]).split("/")[0]
+            return "channel", self._recorded("channel_videos.html") or channel_videos_page(handle)
+        return "other", ""
+
+    def browse(self, token: str) -> str:
+        """
+        Returns the JSON continuation page for a token.
+        """
+        if self.fixtures and (self.fixtures / "browse_1.json").is_file():
+            with self._lock:
+                number = self._recorded_tokens.get(token, 1)
+            text = self._recorded(f"browse_{number}.json") or ""
+            next_token = _continuation_token(json.loads(text)) if text else None
+            if next_token:
+                with self._lock:
+                    self._recorded_tokens[next_token] = number + 1
+            return text
+
+        response = browse_response(token)
+        return json.dumps(response) if response else ""
+
+    def start(self) -> "FakeYouTube":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve fake YouTube pages for offline benchmarks.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="directory with recorded search.html, channel_videos.html, watch.html "
+                                           "and browse_<n>.json")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    with FakeYouTube(args.port, args.fixtures, args.latency) as server:
+        print(f"Serving fake YouTube on {server.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Measures keyword and channel throughput end to end against the local fake YouTube.
+
+Starts benchmarks/fake_youtube.py, points YouTube_Base_URL at it through a temporary
+copy of the config, drives a real Firefox through keyword_search/scrape_keyword_data and
+search_youtube_channel/get_channel_subs/get_channel_videos, and reports keywords/min,
+channels/min and the p50/p95 latency of every stage. Database writes go to an in-memory
+stand-in unless --db is given.
+
+Usage:
+    python benchmarks/run_offline.py --keywords 20 --channels 5
+    python benchmarks/run_offline.py --save baseline.json
+    python benchmarks/run_offline.py --baseline baseline.json --tolerance 0.15
+"""
+from pathlib import Path
+
+import argparse
+import tempfile
+import random
+import json
+import math
+import time
+import sys
+import os
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_youtube import FakeYouTube, WORDS
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of the samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class StageTimer:
+    """
+    Collects the duration of every run of every stage.
+    """
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+
+    def time(self, stage: str, function, *args):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.samples.setdefault(stage, []).append(time.perf_counter() - started)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {stage: {"runs": len(samples), "p50": percentile(samples, 0.5), "p95": percentile(samples, 0.95)}
+                for stage, samples in self.samples.items()}
+
+
+def write_config(config_path: str, base_url: str, directory: str) -> str:
+    """
+    Writes a copy of the config with YouTube_Base_URL pointing at the fake server.
+    """
+    with open(config_path) as file:
+        raw = json.load(file)
+    raw["YouTube_Base_URL"] = base_url
+
+    path = os.path.join(directory, "config.json")
+    with open(path, "w") as file:
+        json.dump(raw, file)
+    return path
+
+
+def run(args: argparse.Namespace, base_url: str) -> dict:
+    import yt_keywords
+
+    from readiness import wait_for_search_results
+    from youtube import search_youtube_channel, get_channel_subs, get_channel_videos
+    from utils import start_firefox
+
+    stored_channels = []
+    if not args.db:
+        # In-memory stand-in for the channel table
+        yt_keywords.add_channel_to_db = lambda channel_id, subscribers: stored_channels.append((channel_id, subscribers))
+
+    rng = random.Random(args.seed)
+    keywords = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(args.keywords)]
+    channels = ["".join(rng.sample(WORDS, 2)) + str(rng.randint(1, 999)) for _ in range(args.channels)]
+
+    timer = StageTimer()
+    driver = start_firefox()
+    try:
+        started = time.perf_counter()
+        for keyword in keywords:
+            timer.time("keyword_search", yt_keywords.keyword_search, keyword, driver)
+            timer.time("wait_for_search_results", wait_for_search_results, driver)
+            timer.time("scrape_keyword_data", yt_keywords.scrape_keyword_data, keyword, driver)
+        keyword_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        videos = 0
+        for channel in channels:
+            timer.time("search_youtube_channel", search_youtube_channel, channel, driver)
+            timer.time("get_channel_subs", get_channel_subs, driver)
+            videos += len(timer.time("get_channel_videos", get_channel_videos, driver))
+        channel_seconds = time.perf_counter() - started
+    finally:
+        driver.quit()
+
+    return {
+        "keywords": len(keywords),
+        "channels": len(channels),
+        "videos": videos,
+        "channels_stored": len(stored_channels),
+        "keywords_per_minute": len(keywords) / keyword_seconds * 60 if keywords else 0.0,
+        "channels_per_minute": len(channels) / channel_seconds * 60 if channels else 0.0,
+        "stages": timer.summary(),
+    }
+
+
+def report(result: dict) -> None:
+    print(f"keywords/min: {result['keywords_per_minute']:.1f} ({result['keywords']} keywords)")
+    print(f"channels/min: {result['channels_per_minute']:.1f} ({result['channels']} channels, {result['videos']} videos)")
+    print(f"{'stage':<26}{'runs':>6}{'p50 s':>10}{'p95 s':>10}")
+    for stage, stats in result["stages"].items():
+        print(f"{stage:<26}{stats['runs']:>6}{stats['p50']:>10.3f}{stats['p95']:>10.3f}")
+
+
+def regressions(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Lists the throughputs that fell, and the stage p95s that rose, by more than `tolerance`.
+    """
+    found = []
+    for key in ("keywords_per_minute", "channels_per_minute"):
+        if baseline.get(key) and result[key] < baseline[key] * (1 - tolerance):
+            found.append(f"{key}: {result[key]:.1f} < baseline {baseline[key]:.1f}")
+    for stage, stats in result["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if before and before["p95"] and stats["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{stage} p95: {stats['p95']:.3f}s > baseline {before['p95']:.3f}s")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline keyword/channel throughput benchmark.")
+    parser.add_argument("--config", default="config.json", help="config to copy (browser and database settings)")
+    parser.add_argument("--keywords", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds to every response")
+    parser.add_argument("--fixtures", help="directory with recorded pages, see fake_youtube.py")
+    parser.add_argument("--db", action="store_true", help="write channels to the configured database")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    with FakeYouTube(fixtures=args.fixtures, latency=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        # Must be set before settings is imported, so every module reads the copied config
+        os.environ["KEYWORD_MASTER_CONFIG"] = write_config(args.config, server.base_url, directory)
+        result = run(args, server.base_url)
+        result["requests"] = dict(server.requests)
+
+    report(result)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(result, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(result, json.load(file), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
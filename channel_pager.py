@@ -0,0 +1,104 @@
+from yt_data import ChannelVideo, extract_json_variable, parse_channel_videos, parse_ytcfg
+from http_client import fetch_text, youtube_url
+from selenium import webdriver
+from typing import Iterator
+
+import metrics
+import json
+
+
+# Used when the page does not carry its own InnerTube client context
+DEFAULT_CLIENT = {"clientName": "WEB", "clientVersion": "2.20241010.00.00", "hl": "en", "gl": "US"}
+
+# Upper bound on continuation requests per channel, in case the Days cutoff is never reached
+MAX_PAGES = 100
+
+# Reads the InnerTube API key and client context the page was rendered with
+YTCFG_SCRIPT = """
+const data = (window.ytcfg && window.ytcfg.data_) || {};
+return {INNERTUBE_API_KEY: data.INNERTUBE_API_KEY || "", INNERTUBE_CONTEXT: data.INNERTUBE_CONTEXT || null};
+"""
+
+
+class ChannelPager:
+    """
+    Pages through a channel's videos tab without scrolling.
+
+    The first page comes from the videos tab's ytInitialData; every further page is
+    fetched as JSON from the youtubei/v1/browse endpoint with the continuation token of
+    the page before. Pages are fetched lazily while iterating, so stopping at the Days
+    cutoff costs no extra request.
+
+    Attributes:
+        pages (int): Continuation pages fetched.
+        failed (bool): True if a continuation could not be fetched or parsed, so the list may be incomplete.
+    """
+
+    def __init__(self, initial_data: dict | None, ytcfg: dict | None = None, max_pages: int = MAX_PAGES):
+        self.videos, self.token = parse_channel_videos(initial_data) if initial_data else ([], None)
+        self.api_key = (ytcfg or {}).get("INNERTUBE_API_KEY", "")
+        self.context = (ytcfg or {}).get("INNERTUBE_CONTEXT") or {"client": DEFAULT_CLIENT}
+        self.max_pages = max_pages
+        self.pages = 0
+        self.failed = False
+
+    @classmethod
+    def from_driver(cls, driver: webdriver.Firefox, initial_data: dict | None) -> "ChannelPager":
+        """
+        Creates a pager for the videos tab the driver is on.
+        """
+        try:
+            ytcfg = driver.execute_script(YTCFG_SCRIPT) or {}
+        except Exception:
+            ytcfg = {}
+        return cls(initial_data, ytcfg)
+
+    @classmethod
+    def from_html(cls, html: str) -> "ChannelPager":
+        """
+        Creates a pager from the source of a videos tab fetched over HTTP.
+        """
+        return cls(extract_json_variable(html, "ytInitialData"), parse_ytcfg(html))
+
+    def fetch(self, token: str) -> dict | None:
+        """
+        Fetches one continuation page.
+
+        Args:
+            token (str): The continuation token of the page.
+
+        Returns:
+            dict | None: The decoded response, or None if the request failed.
+        """
+        path = "/youtubei/v1/browse?prettyPrint=false" + (f"&key={self.api_key}" if self.api_key else "")
+        body = json.dumps({"context": self.context, "continuation": token}).encode()
+
+        # Not a navigation_seconds page: those count browser page loads
+        with metrics.timed("http_seconds", request="browse_continuation"):
+            text = fetch_text(youtube_url(path), method="POST", body=body,
+                              headers={"Content-Type": "application/json"})
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def __iter__(self) -> Iterator[ChannelVideo]:
+        yield from self.videos
+
+        while self.token and self.pages < self.max_pages:
+            data = self.fetch(self.token)
+            self.pages += 1
+            if data is None:
+                self.failed = True
+                metrics.inc("retries_total", stage="browse_continuation")
+                return
+
+            with metrics.timed("extraction_seconds", stage="browse_continuation"):
+                videos, self.token = parse_channel_videos(data)
+            if not videos and self.token is None:
+                # A page without items means the response layout is not understood, not that the channel ended
+                self.failed = True
+                return
+            yield from videos
@@ -1,81 +1,655 @@
-from utils import load_config
+from db_pool import ConnectionPool
+from datetime import datetime
+from collections import deque
+from typing import Iterator
+from settings import get_config
 
-import mysql.connector
+import threading
+import metrics
+import socket
+import os
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database: str) -> ConnectionPool:
+    """
+    Returns the shared connection pool for a database, creating it on first use.
+
+    Args:
+        database (str): Either "Channel" or "Keyword", matching the config key prefixes.
+
+    Returns:
+        ConnectionPool: The pool for that database.
+    """
+    pool = _pools.get(database)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        if database not in _pools:
+            config = get_config()
+            _pools[database] = ConnectionPool(database, config.db_pool_size, **config.db_params(database))
+        return _pools[database]
+
+
+def pool_stats() -> dict[str, dict]:
+    """
+    Returns the connection churn and pool wait counters of every open pool.
+    """
+    return {name: dict(pool.stats) for name, pool in _pools.items()}
+
+
+def close_pools() -> None:
+    """
+    Closes all pooled connections. Call once on shutdown.
+    """
+    for pool in _pools.values():
+        pool.close_all()
+
+
+def _has_index(database: str, table: str, index: str) -> bool:
+    """
+    Returns True if a table has an index with that name.
+    """
+    query = """SELECT 1 FROM information_schema.statistics
+               WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1"""
+    return bool(get_pool(database).run(query, (table, index), fetch="one"))
+
+
+def _ensure_index(database: str, table: str, index: str, definition: str) -> None:
+    """
+    Adds an index to a table unless an index with that name already exists.
+
+    Args:
+        database (str): Either "Channel" or "Keyword".
+        table (str): The table name.
+        index (str): The index name.
+        definition (str): The index definition, e.g. "UNIQUE KEY name (col)".
+    """
+    if not _has_index(database, table, index):
+        get_pool(database).run(f"ALTER TABLE {table} ADD {definition}", commit=True, prepared=False)
+
+
+def _ensure_column(database: str, table: str, column: str, definition: str) -> bool:
+    """
+    Adds a column to a table unless it already exists.
+
+    Args:
+        database (str): Either "Channel" or "Keyword".
+        table (str): The table name.
+        column (str): The column name.
+        definition (str): The column type and options, e.g. "DATETIME NULL".
+
+    Returns:
+        bool: True if the column was added.
+    """
+    pool = get_pool(database)
+
+    query = """SELECT 1 FROM information_schema.columns
+               WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1"""
+    if pool.run(query, (table, column), fetch="one"):
+        return False
+
+    pool.run(f"ALTER TABLE {table} ADD COLUMN {column} {definition}", commit=True, prepared=False)
+    return True
+
+
+def _ensure_column_definition(database: str, table: str, column: str, definition: str, marker: str) -> bool:
+    """
+    Changes the definition of an existing column unless its type or generation expression
+    already contains `marker`.
+
+    Args:
+        database (str): Either "Channel" or "Keyword".
+        table (str): The table name.
+        column (str): The column name.
+        definition (str): The new column type and options.
+        marker (str): Text only the new definition contains, e.g. an added ENUM value.
+
+    Returns:
+        bool: True if the column was changed.
+    """
+    pool = get_pool(database)
+
+    query = """SELECT CONCAT(column_type, ' ', COALESCE(generation_expression, '')) FROM information_schema.columns
+               WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1"""
+    row = pool.run(query, (table, column), fetch="one")
+    if row is None or marker in row[0]:
+        return False
+
+    pool.run(f"ALTER TABLE {table} MODIFY COLUMN {column} {definition}", commit=True, prepared=False)
+    return True
+
+
+def _drop_index(database: str, table: str, index: str) -> None:
+    """
+    Drops an index from a table if it exists.
+    """
+    if _has_index(database, table, index):
+        get_pool(database).run(f"ALTER TABLE {table} DROP INDEX {index}", commit=True, prepared=False)
+
+
+def migrate_schema() -> None:
+    """
+    Brings the channel and keyword tables up to the schema the scraper expects.
+
+    Safe to run on every start; existing columns and indexes are left alone.
+    Duplicate keywords are removed before the unique key on (term, source) is added.
+    """
+    # A keyword row is unique per (term, source). The key is on a hash of both, as a prefix
+    # key would make distinct long terms collide; NULL in either column never conflicts.
+    _ensure_column("Keyword", "keywords", "keyword_source_hash",
+                   "BINARY(32) AS (UNHEX(SHA2(CONCAT(keyword_term, 0x00, keyword_from), 256))) STORED")
+    if not _has_index("Keyword", "keywords", "uq_keyword_source_hash"):
+        clean_duplicate_keywords()
+        _ensure_index("Keyword", "keywords", "uq_keyword_source_hash",
+                      "UNIQUE KEY uq_keyword_source_hash (keyword_source_hash)")
+    _drop_index("Keyword", "keywords", "uq_keyword_source")
+
+    # Work claiming: a lease per row, plus an indexable flag for rows that still need scraping
+    _ensure_column("Keyword", "keywords", "claimed_by", "VARCHAR(64) NULL")
+    _ensure_column("Keyword", "keywords", "lease_expires", "DATETIME NULL")
+    _ensure_column("Keyword", "keywords", "keyword_pending",
+                   """TINYINT(1) AS (keyword_term IS NOT NULL
+                                     AND (volume IS NULL OR competition IS NULL OR recency IS NULL)) STORED""")
+    _ensure_index("Keyword", "keywords", "ix_keyword_claim", "INDEX ix_keyword_claim (keyword_pending, lease_expires)")
+
+    _ensure_column("Channel", "channels", "claimed_by", "VARCHAR(64) NULL")
+    _ensure_column("Channel", "channels", "lease_expires", "DATETIME NULL")
+    # Channels are claimed in next_visit_at order (ix_channel_next_visit below)
+    _drop_index("Channel", "channels", "ix_channel_due")
+    _ensure_index("Channel", "channels", "ix_channel_lease", "INDEX ix_channel_lease (lease_expires)")
+
+    # Job lifecycle: pending -> claimed -> scraped -> stored, or failed (and abandoned after Max_Attempts)
+    states = "ENUM(" + ", ".join(f"'{state}'" for state in JOB_STATES) + ") NOT NULL DEFAULT 'pending'"
+    if _ensure_column("Keyword", "keywords", "job_state", states):
+        get_pool("Keyword").run("UPDATE keywords SET job_state = 'stored' WHERE keyword_pending = 0",
+                                commit=True, prepared=False)
+    if _ensure_column("Channel", "channels", "job_state", states):
+        get_pool("Channel").run("""UPDATE channels SET job_state = 'stored'
+                                   WHERE channel_researched IS NOT NULL AND channel_researched > 0""",
+                                commit=True, prepared=False)
+    _ensure_column_definition("Keyword", "keywords", "job_state", states, "'abandoned'")
+    _ensure_column_definition("Channel", "channels", "job_state", states, "'abandoned'")
+    # Abandoned keywords leave the pending index, so claims no longer scan them
+    _ensure_column_definition("Keyword", "keywords", "keyword_pending",
+                              """TINYINT(1) AS (keyword_term IS NOT NULL AND job_state <> 'abandoned'
+                                                AND (volume IS NULL OR competition IS NULL OR recency IS NULL)) STORED""",
+                              "abandoned")
+    for database, table in (("Keyword", "keywords"), ("Channel", "channels")):
+        _ensure_column(database, table, "heartbeat_at", "DATETIME NULL")
+        _ensure_column(database, table, "attempts", "INT UNSIGNED NOT NULL DEFAULT 0")
+        _ensure_index(database, table, f"ix_{table}_owner", f"INDEX ix_{table}_owner (claimed_by, job_state)")
+        # The restart-stable slot a job was claimed under; claimed_by also names the process
+        if _ensure_column(database, table, "claimed_slot", "VARCHAR(64) NULL"):
+            # Older claims were made under the slot id itself
+            get_pool(database).run(f"""UPDATE {table} SET claimed_slot = claimed_by
+                                       WHERE job_state IN ('claimed', 'scraped')""", commit=True, prepared=False)
+        _ensure_index(database, table, f"ix_{table}_slot", f"INDEX ix_{table}_slot (claimed_slot, job_state)")
+
+    # Retry backoff of failed keywords; failed channels wait on next_visit_at instead
+    _ensure_column("Keyword", "keywords", "next_attempt_at", "DATETIME NULL")
+    # Rows that ran out of attempts before failures were resolved, or under a higher Max_Attempts
+    max_attempts = get_config().max_attempts
+    get_pool("Keyword").run("""UPDATE keywords SET job_state = 'abandoned'
+                               WHERE keyword_pending = 1 AND job_state = 'failed' AND attempts >= %s""",
+                            (max_attempts,), commit=True, prepared=False)
+
+    # High-water mark: the newest video seen on the last visit, where the next crawl stops
+    _ensure_column("Channel", "channels", "last_video_id", "VARCHAR(16) NULL")
+    _ensure_column("Channel", "channels", "last_video_at", "DATETIME NULL")
+
+    # Adaptive revisits: each channel's next due time, from its upload rate and keyword yield
+    if _ensure_column("Channel", "channels", "next_visit_at", "DATETIME NULL"):
+        get_pool("Channel").run("""UPDATE channels SET next_visit_at = channel_researched + INTERVAL %s DAY
+                                   WHERE channel_researched IS NOT NULL AND channel_researched > 0""",
+                                (get_config().revisit_base_days,), commit=True, prepared=False)
+    _ensure_column("Channel", "channels", "upload_rate", "DOUBLE NULL")
+    _ensure_column("Channel", "channels", "idle_visits", "INT UNSIGNED NOT NULL DEFAULT 0")
+    _ensure_column("Channel", "channels", "keyword_yield", "INT UNSIGNED NULL")
+    _ensure_index("Channel", "channels", "ix_channel_next_visit", "INDEX ix_channel_next_visit (next_visit_at)")
+    # Channels that ran out of attempts are visited again on the regular schedule (see fail_job)
+    get_pool("Channel").run("""UPDATE channels SET attempts = 0, next_visit_at = NOW() + INTERVAL %s DAY
+                               WHERE job_state = 'failed' AND attempts >= %s""",
+                            (get_config().revisit_base_days, max_attempts), commit=True, prepared=False)
+
+    # Keyword priority: value signals stored on the row, and a precomputed rank the claim scans in index order
+    _ensure_column("Keyword", "keywords", "source_subs", "BIGINT UNSIGNED NULL")
+    _ensure_column("Keyword", "keywords", "source_growth", "DOUBLE NULL")
+    _ensure_column("Keyword", "keywords", "keyword_sources", "INT UNSIGNED NOT NULL DEFAULT 1")
+    _ensure_column("Keyword", "keywords", "keyword_added", "DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP")
+    added_priority = _ensure_column("Keyword", "keywords", "priority", "DOUBLE NOT NULL DEFAULT 0")
+    _ensure_index("Keyword", "keywords", "ix_keyword_priority", "INDEX ix_keyword_priority (keyword_pending, priority)")
+    if added_priority:
+        reprioritize_keywords()
+
+    get_pool("Keyword").run("""
+        CREATE TABLE IF NOT EXISTS serp_cache (
+            keyword_norm VARCHAR(191) NOT NULL PRIMARY KEY,
+            volume INT NOT NULL,
+            competition INT NOT NULL,
+            recency VARCHAR(16) NULL,
+            fetched_at DATETIME NOT NULL,
+            INDEX ix_serp_cache_fetched (fetched_at)
+        )""", commit=True, prepared=False)
+
+    # Append-only raw search results, so scores can be recomputed without re-scraping
+    get_pool("Keyword").run("""
+        CREATE TABLE IF NOT EXISTS observations (
+            observation_id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            scrape_id CHAR(32) NOT NULL,
+            keyword_term VARCHAR(255) NOT NULL,
+            position TINYINT UNSIGNED NOT NULL,
+            video_id VARCHAR(16) NOT NULL DEFAULT '',
+            title VARCHAR(255) NOT NULL,
+            views BIGINT UNSIGNED NOT NULL,
+            recency DOUBLE NOT NULL,
+            duration DOUBLE NOT NULL,
+            subscribers BIGINT UNSIGNED NOT NULL,
+            observed_at DATETIME NOT NULL,
+            INDEX ix_observation_keyword (keyword_term(191), observation_id)
+        ) ENGINE=InnoDB ROW_FORMAT=COMPRESSED""", commit=True, prepared=False)
+
+
+JOB_STATES = ("pending", "claimed", "scraped", "stored", "failed", "abandoned")
+
+# Seconds a failed job waits before its first retry; doubled on every further failure, up to a day
+RETRY_BACKOFF_SECONDS = 300
+
+# kind -> (database, table, key column)
+_JOB_TABLES = {
+    "keyword": ("Keyword", "keywords", "keyword_term"),
+    "channel": ("Channel", "channels", "channel_handle"),
+}
+
+_worker_slot = 0
+
+
+def set_worker_slot(slot: int) -> None:
+    """
+    Sets the slot (supervisor worker index) that is part of this process's worker id.
+    """
+    global _worker_slot
+    _worker_slot = slot
+
+
+def worker_slot_id() -> str:
+    """
+    Returns the identifier this process stores in claimed_slot, e.g. "host:0".
+
+    The id is stable across restarts (Worker_Name, or the host name, plus the worker
+    slot), so a restarted worker finds the jobs it had claimed; see resume_claims.
+    """
+    return f"{get_config().worker_name or socket.gethostname()}"[:48] + f":{_worker_slot}"
+
+
+def worker_id(pid: int | None = None) -> str:
+    """
+    Returns the identifier this process stores in claimed_by, e.g. "host:0:4242".
+
+    The slot id plus the process id, so two live scrapers never share a lease owner,
+    even when they run on one host under the same slot without a Worker_Name. With `pid`,
+    returns the id an earlier process in this slot claimed its jobs under.
+    """
+    return f"{worker_slot_id()}:{pid or os.getpid()}"
 
 
 # channel_id, channel_handle, channel_status, channel_researched, channel_subs
 
-def next_channel() -> str | None:
+def claim_channels(limit: int, lease_seconds: int) -> list[str]:
     """
-    Retrieves the next channel from the database that has not been researched in over 2 weeks.
+    Leases up to `limit` channels that are due for a visit (never visited, or past their
+    next_visit_at), earliest due first, with a range scan of the next_visit_at index.
 
-    Function:
-        Connects to the channel database, executes a query to select the next channel,
-        and updates the researched date to the current date.
+    The rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers never
+    claim the same channel. A lease that is not completed before it expires makes
+    the channel claimable again. A failed channel waits for its retry, or after
+    Max_Attempts failures for its next regular visit, on next_visit_at (see fail_job).
+
+    Args:
+        limit (int): The maximum number of channels to claim.
+        lease_seconds (int): How long the claim is held.
 
     Returns:
-        The selected channel handle
+        list[str]: The claimed channel handles.
     """
-    config = load_config('config.json')
-    mydb = mysql.connector.connect(
-        host=config["Channel_DB_host"],
-        user=config["Channel_DB_user"],
-        database=config["Channel_DB_name"],
-        password=config["Channel_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Channel")
 
-    query = """SELECT channel_handle FROM channels
-               WHERE channel_researched IS NULL or 0
-               OR channel_researched < NOW() - INTERVAL 20 DAY
-               ORDER BY channel_researched ASC LIMIT 1"""
-    mycursor.execute(query)
-    result = mycursor.fetchone()
+    query = """SELECT channel_id, channel_handle FROM channels
+               WHERE (next_visit_at IS NULL OR next_visit_at <= NOW())
+                 AND (lease_expires IS NULL OR lease_expires < NOW())
+               ORDER BY next_visit_at ASC LIMIT %s
+               FOR UPDATE SKIP LOCKED"""
+    with pool.connection() as connection:
+        rows = connection.execute(query, (limit,), fetch="all")
+
+        if rows:
+            placeholders = ", ".join(["%s"] * len(rows))
+            query = f"""UPDATE channels SET job_state = 'claimed', claimed_by = %s, claimed_slot = %s,
+                               heartbeat_at = NOW(), lease_expires = NOW() + INTERVAL %s SECOND
+                        WHERE channel_id IN ({placeholders})"""
+            connection.execute(query, (worker_id(), worker_slot_id(), lease_seconds, *[row[0] for row in rows]),
+                               prepared=False)
+        connection.commit()
+
+    return [row[1] for row in rows]
+
+
+def get_channel_high_water(channel_handle: str) -> tuple[str | None, datetime | None]:
+    """
+    Returns the newest video seen on a channel's previous visit.
+
+    Args:
+        channel_handle (str): The handle of the channel.
+
+    Returns:
+        tuple: The video id and its earliest upload time, either None if unknown.
+    """
+    query = "SELECT last_video_id, last_video_at FROM channels WHERE channel_handle = %s"
+    row = get_pool("Channel").run(query, (channel_handle,), fetch="one")
+    return (row[0], row[1]) if row else (None, None)
+
+
+def get_channel_revisit(channel_handle: str) -> tuple[datetime | None, float | None, int]:
+    """
+    Returns what the previous visits of a channel learned about its cadence.
 
-    if result:
-        query = """UPDATE channels SET channel_researched = NOW() WHERE channel_handle = %s"""
-        mycursor.execute(query, (result[0],))
-        mydb.commit()
+    Args:
+        channel_handle (str): The handle of the channel.
+
+    Returns:
+        tuple: When it was last researched (None if never), its smoothed upload rate in
+        videos per day (None if unknown) and its visits in a row without keywords.
+    """
+    query = "SELECT channel_researched, upload_rate, idle_visits FROM channels WHERE channel_handle = %s"
+    row = get_pool("Channel").run(query, (channel_handle,), fetch="one")
+    if not row:
+        return None, None, 0
+    researched = row[0] if isinstance(row[0], datetime) else None
+    return researched, row[1], row[2] or 0
+
+
+def complete_channels(channels: list[tuple]) -> int:
+    """
+    Marks channels whose keywords have been stored as researched now, moves their
+    high-water marks, schedules their next visits and releases their leases, in one transaction.
+
+    Args:
+        channels (list[tuple]): (channel_handle, newest video id, its earliest upload time, Revisit | None)
+            tuples; a None video keeps the previous high-water mark, and a None revisit schedules
+            the next visit Revisit_Base_Days from now.
 
-    mydb.close()
-    return result[0] if result else None
+    Returns:
+        int: The number of channels updated.
+    """
+    if not channels:
+        return 0
+
+    query = """UPDATE channels SET job_state = 'stored', channel_researched = NOW(), attempts = 0,
+                      last_video_id = COALESCE(%s, last_video_id), last_video_at = COALESCE(%s, last_video_at),
+                      next_visit_at = COALESCE(%s, NOW() + INTERVAL %s DAY), upload_rate = COALESCE(%s, upload_rate),
+                      idle_visits = COALESCE(%s, idle_visits), keyword_yield = %s,
+                      claimed_by = NULL, lease_expires = NULL
+               WHERE channel_handle = %s"""
+    base_days = get_config().revisit_base_days
+    rows = []
+    for handle, video_id, video_at, revisit in channels:
+        if revisit is None:
+            rows.append((video_id, video_at, None, base_days, None, None, None, handle))
+        else:
+            rows.append((video_id, video_at, revisit.next_visit_at, base_days, revisit.upload_rate,
+                         revisit.idle_visits, revisit.keyword_yield, handle))
+
+    with get_pool("Channel").connection() as connection:
+        cursor = connection.cnx.cursor()
+        try:
+            cursor.executemany(query, rows)
+            changed = cursor.rowcount
+        finally:
+            cursor.close()
+        connection.commit()
+
+    return changed
 
 
 # keyword_id, keyword_term, volume, competition, recency, keyword_from
 
-def next_keyword() -> str | None:
+def claim_keywords(limit: int, lease_seconds: int) -> list[str]:
     """
-    Retrieves the next keyword from the database that has any null values.
+    Leases up to `limit` keywords that still have a null volume, competition or recency.
+
+    Highest priority first (see reprioritize_keywords). Walks the (keyword_pending, priority)
+    index with FOR UPDATE SKIP LOCKED, so the claim only touches the rows it returns and
+    concurrent workers never claim the same row. Failed keywords wait out their retry backoff;
+    abandoned ones (Max_Attempts failures) are no longer pending, so the scan never sees them.
+
+    Args:
+        limit (int): The maximum number of keywords to claim.
+        lease_seconds (int): How long the claim is held.
 
     Returns:
-        The next keyword (str) if found, otherwise None
+        list[str]: The distinct claimed keyword terms.
+    """
+    pool = get_pool("Keyword")
+
+    query = """SELECT keyword_id, keyword_term FROM keywords
+               WHERE keyword_pending = 1
+                 AND (lease_expires IS NULL OR lease_expires < NOW())
+                 AND (next_attempt_at IS NULL OR next_attempt_at <= NOW())
+               ORDER BY priority DESC LIMIT %s
+               FOR UPDATE SKIP LOCKED"""
+    with pool.connection() as connection:
+        rows = connection.execute(query, (limit,), fetch="all")
+
+        if rows:
+            placeholders = ", ".join(["%s"] * len(rows))
+            query = f"""UPDATE keywords SET job_state = 'claimed', claimed_by = %s, claimed_slot = %s,
+                               heartbeat_at = NOW(), lease_expires = NOW() + INTERVAL %s SECOND
+                        WHERE keyword_id IN ({placeholders})"""
+            connection.execute(query, (worker_id(), worker_slot_id(), lease_seconds, *[row[0] for row in rows]),
+                               prepared=False)
+        connection.commit()
+
+    return list(dict.fromkeys(row[1] for row in rows))
+
+
+def start_job(kind: str, key: str) -> None:
     """
-    config = load_config('config.json')
-    mydb = mysql.connector.connect(
-        host=config["Keyword_DB_host"],
-        user=config["Keyword_DB_user"],
-        database=config["Keyword_DB_name"],
-        password=config["Keyword_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    Counts an attempt at a claimed keyword or channel, right before it is scraped.
 
-    query = """
-    SELECT * FROM keywords
-    WHERE keyword_term IS NULL
-       OR volume IS NULL
-       OR competition IS NULL
-       OR recency IS NULL
-       OR keyword_from IS NULL
-    LIMIT 1;
+    Args:
+        kind (str): Either "keyword" or "channel".
+        key (str): The keyword term or channel handle.
+    """
+    database, table, column = _JOB_TABLES[kind]
+    query = f"""UPDATE {table} SET attempts = attempts + 1, heartbeat_at = NOW()
+                WHERE {column} = %s AND claimed_by = %s"""
+    get_pool(database).run(query, (key, worker_id()), commit=True)
+
+
+def mark_scraped(kind: str, key: str) -> None:
+    """
+    Moves a claimed keyword or channel to "scraped": its page was read, but the results are not stored yet.
+
+    Args:
+        kind (str): Either "keyword" or "channel".
+        key (str): The keyword term or channel handle.
+    """
+    database, table, column = _JOB_TABLES[kind]
+    query = f"""UPDATE {table} SET job_state = 'scraped', heartbeat_at = NOW()
+                WHERE {column} = %s AND claimed_by = %s"""
+    get_pool(database).run(query, (key, worker_id()), commit=True)
+
+
+def fail_job(kind: str, key: str) -> None:
     """
+    Moves a keyword or channel to "failed" and releases its lease.
 
-    mycursor.execute(query)
-    result = mycursor.fetchone()
+    It is retried after RETRY_BACKOFF_SECONDS, doubled for every failure in a row. After
+    Max_Attempts failures a keyword is "abandoned" (it leaves the pending index for good),
+    and a channel's attempts are reset and it is next visited Revisit_Base_Days from now,
+    like a channel that was researched.
 
-    if result:
-        return result[1]
+    Args:
+        kind (str): Either "keyword" or "channel".
+        key (str): The keyword term or channel handle.
+    """
+    config = get_config()
+    database, table, column = _JOB_TABLES[kind]
+    # attempts was counted by start_job; MySQL assigns left to right, so attempts is reset last
+    backoff = "NOW() + INTERVAL LEAST(%s * POW(2, GREATEST(attempts, 1) - 1), 86400) SECOND"
+    if kind == "keyword":
+        query = f"""UPDATE keywords SET job_state = IF(attempts >= %s, 'abandoned', 'failed'),
+                           next_attempt_at = {backoff}, claimed_by = NULL, lease_expires = NULL
+                    WHERE keyword_term = %s AND claimed_by = %s"""
+        params = (config.max_attempts, RETRY_BACKOFF_SECONDS, key, worker_id())
     else:
-        return None
+        query = f"""UPDATE channels SET job_state = 'failed',
+                           next_visit_at = IF(attempts >= %s, NOW() + INTERVAL %s DAY, {backoff}),
+                           attempts = IF(attempts >= %s, 0, attempts), claimed_by = NULL, lease_expires = NULL
+                    WHERE channel_handle = %s AND claimed_by = %s"""
+        params = (config.max_attempts, config.revisit_base_days, RETRY_BACKOFF_SECONDS, config.max_attempts,
+                  key, worker_id())
+    get_pool(database).run(query, params, commit=True)
+    metrics.inc("jobs_failed_total", kind=kind)
+
+
+def heartbeat(lease_seconds: int) -> tuple[int, int]:
+    """
+    Extends the leases of every keyword and channel this worker holds.
+
+    Args:
+        lease_seconds (int): How long the claims are held from now.
+
+    Returns:
+        tuple: The number of keywords and channels extended.
+    """
+    counts = []
+    for kind in ("keyword", "channel"):
+        database, table, _ = _JOB_TABLES[kind]
+        query = f"""UPDATE {table} SET heartbeat_at = NOW(), lease_expires = NOW() + INTERVAL %s SECOND
+                    WHERE claimed_by = %s AND job_state IN ('claimed', 'scraped')"""
+        counts.append(get_pool(database).run(query, (lease_seconds, worker_id()), commit=True))
+    return counts[0], counts[1]
+
+
+def reclaim_expired_leases() -> tuple[int, int]:
+    """
+    Re-queues keywords and channels whose lease expired without a heartbeat, i.e. whose worker died.
+
+    Returns:
+        tuple: The number of keywords and channels released.
+    """
+    query = """UPDATE keywords SET job_state = 'pending', claimed_by = NULL, lease_expires = NULL
+               WHERE keyword_pending = 1 AND lease_expires < NOW()"""
+    keywords = get_pool("Keyword").run(query, commit=True)
+
+    query = """UPDATE channels SET job_state = 'pending', claimed_by = NULL, lease_expires = NULL
+               WHERE lease_expires < NOW() AND job_state IN ('claimed', 'scraped')"""
+    channels = get_pool("Channel").run(query, commit=True)
+
+    return keywords, channels
+
+
+_claimed_channels: deque[str] = deque()
+_claimed_keywords: deque[str] = deque()
+
+
+def resume_claims(lease_seconds: int, stale_seconds: float, predecessor_pid: int | None = None) -> tuple[int, int]:
+    """
+    Queues the keywords and channels this worker claimed but never stored, e.g. before a
+    crash or a browser death, ahead of any new claims, and renews their leases.
+
+    Jobs claimed under this worker's slot by an earlier process are taken over right away
+    if that process is `predecessor_pid` (the supervisor passes the pid of the worker it
+    replaces), and otherwise once their heartbeat is older than `stale_seconds`. A live
+    process sharing the slot id (a second scraper on the host without a Worker_Name)
+    keeps its heartbeats fresh, so its jobs are left alone.
+
+    Channels left "scraped" are scraped again: their keywords may not have been written.
+
+    Args:
+        lease_seconds (int): How long the claims are held from now.
+        stale_seconds (float): How old a heartbeat must be for its process to count as dead.
+        predecessor_pid (int | None): The pid of the dead process this one replaces in its slot.
+
+    Returns:
+        tuple: The number of keywords and channels resumed.
+    """
+    heartbeat(lease_seconds)
+
+    for kind in ("keyword", "channel"):
+        database, table, _ = _JOB_TABLES[kind]
+        query = f"""UPDATE {table} SET claimed_by = %s, heartbeat_at = NOW(), lease_expires = NOW() + INTERVAL %s SECOND
+                    WHERE claimed_slot = %s AND job_state IN ('claimed', 'scraped') AND claimed_by <> %s
+                      AND (claimed_by = %s OR heartbeat_at IS NULL OR heartbeat_at < NOW() - INTERVAL %s SECOND)"""
+        predecessor = worker_id(predecessor_pid) if predecessor_pid else None
+        get_pool(database).run(query, (worker_id(), lease_seconds, worker_slot_id(), worker_id(), predecessor,
+                                       int(stale_seconds)), commit=True)
+
+    query = """SELECT DISTINCT keyword_term FROM keywords
+               WHERE claimed_by = %s AND job_state IN ('claimed', 'scraped') AND keyword_pending = 1"""
+    keywords = [row[0] for row in get_pool("Keyword").run(query, (worker_id(),), fetch="all")]
+
+    query = """SELECT channel_handle FROM channels
+               WHERE claimed_by = %s AND job_state IN ('claimed', 'scraped')"""
+    channels = [row[0] for row in get_pool("Channel").run(query, (worker_id(),), fetch="all")]
+
+    _claimed_keywords.extendleft(reversed([k for k in keywords if k not in _claimed_keywords]))
+    _claimed_channels.extendleft(reversed([c for c in channels if c not in _claimed_channels]))
+
+    return len(keywords), len(channels)
+
+
+def release_claims() -> None:
+    """
+    Releases the leases this process still holds, so other workers can pick the rows up immediately.
+    """
+    _claimed_channels.clear()
+    _claimed_keywords.clear()
+
+    query = """UPDATE keywords SET job_state = 'pending', claimed_by = NULL, lease_expires = NULL
+               WHERE keyword_pending = 1 AND claimed_by = %s"""
+    get_pool("Keyword").run(query, (worker_id(),), commit=True)
+
+    query = """UPDATE channels SET job_state = 'pending', claimed_by = NULL, lease_expires = NULL
+               WHERE claimed_by = %s AND job_state IN ('claimed', 'scraped')"""
+    get_pool("Channel").run(query, (worker_id(),), commit=True)
+
+
+def next_channel() -> str | None:
+    """
+    Retrieves the next channel that is due for a visit.
+
+    Function:
+        Claims a batch of channels the first time it is called and hands them
+        out one by one, claiming the next batch once the current one runs out.
+
+    Returns:
+        The selected channel handle
+    """
+    if not _claimed_channels:
+        config = get_config()
+        _claimed_channels.extend(claim_channels(config.claim_batch_size, config.lease_seconds))
+
+    return _claimed_channels.popleft() if _claimed_channels else None
+
+
+def next_keyword() -> str | None:
+    """
+    Retrieves the next keyword from the database that has any null values.
+
+    Returns:
+        The next keyword (str) if found, otherwise None
+    """
+    if not _claimed_keywords:
+        config = get_config()
+        _claimed_keywords.extend(claim_keywords(config.claim_batch_size, config.lease_seconds))
+
+    return _claimed_keywords.popleft() if _claimed_keywords else None
 
 
 def remove_channel(channel_handle: str) -> None:
@@ -88,20 +662,10 @@ def remove_channel(channel_handle: str) -> None:
     Returns:
         bool: True if the channel was successfully removed, False otherwise.
     """
-    config = load_config('config.json')
-
-    mydb = mysql.connector.connect(
-        host=config["Channel_DB_host"],
-        user=config["Channel_DB_user"],
-        database=config["Channel_DB_name"],
-        password=config["Channel_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Channel")
 
     query = "DELETE FROM channels WHERE channel_handle = %s"
-    mycursor.execute(query, (channel_handle,))
-    mydb.commit()
-    mydb.close()
+    pool.run(query, (channel_handle,), commit=True)
     print(f"Removed channel: {channel_handle}")
 
     return
@@ -117,54 +681,123 @@ def remove_keyword(keyword_term: str) -> None:
     Returns:
         bool: True if the keyword was successfully removed, False otherwise.
     """
-    config = load_config('config.json')
-
-    mydb = mysql.connector.connect(
-        host=config["Keyword_DB_host"],
-        user=config["Keyword_DB_user"],
-        database=config["Keyword_DB_name"],
-        password=config["Keyword_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Keyword")
 
     query = "DELETE FROM keywords WHERE keyword_term = %s"
-    mycursor.execute(query, (keyword_term,))
-    mydb.commit()
-    mydb.close()
+    pool.run(query, (keyword_term,), commit=True)
 
     return
 
 
-def add_null_keyword(keyword_term: str, channel_handle: str) -> None:
+def add_null_keyword(keyword_term: str, channel_handle: str, subscribers: int | None = None) -> None:
     """
     Adds a null keyword to the database based on the provided keyword term.
 
     Args:
         channel_handle (str): The handle of the channel to be added.
         keyword_term (str): The term of the keyword to be added.
+        subscribers (int | None): The subscribers of that channel, a priority signal.
 
     Returns:
         bool: True if the keyword was successfully added, False otherwise.
     """
-    channel_handle = channel_handle.strip("@")
-    channel_handle = "@" + channel_handle
-    config = load_config('config.json')
+    add_null_keywords([(keyword_term, channel_handle, subscribers)])
+
+    return
 
-    mydb = mysql.connector.connect(
-        host=config["Keyword_DB_host"],
-        user=config["Keyword_DB_user"],
-        database=config["Keyword_DB_name"],
-        password=config["Keyword_DB_password"]
-    )
-    mycursor = mydb.cursor()
 
-    query = "INSERT INTO keywords (keyword_term, keyword_from) VALUES (%s, %s)"
-    mycursor.execute(query, (keyword_term, channel_handle))
+def add_null_keywords(keywords: list[tuple]) -> int:
+    """
+    Adds many null keywords to the database with a single multi-row insert, then
+    reprioritizes every pending row of the inserted terms.
 
-    mydb.commit()
-    mydb.close()
+    Pairs that already exist for the same channel are skipped by the unique key.
 
-    return
+    Args:
+        keywords (list[tuple]): (keyword_term, channel_handle), (keyword_term, channel_handle, subscribers) or
+            (keyword_term, channel_handle, subscribers, growth) tuples; growth is the channel's
+            priority.subscriber_growth.
+
+    Returns:
+        int: The number of keywords actually inserted.
+    """
+    if not keywords:
+        return 0
+
+    pool = get_pool("Keyword")
+
+    rows = []
+    for keyword_term, channel_handle, *source in keywords:
+        source = [*source, None, None][:2]
+        rows.extend((keyword_term, "@" + channel_handle.strip("@"), *source))
+
+    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(keywords))
+    query = f"""INSERT IGNORE INTO keywords (keyword_term, keyword_from, source_subs, source_growth)
+                VALUES {placeholders}"""
+    inserted = pool.run(query, rows, commit=True, prepared=False)
+
+    if inserted:
+        reprioritize_keywords(list(dict.fromkeys(row[0] for row in keywords)))
+
+    metrics.inc("keywords_found_total", inserted)
+    return inserted
+
+
+def reprioritize_keywords(keyword_terms: list[str] | None = None) -> int:
+    """
+    Recomputes the priority of pending keywords (priority.keyword_priority), highest claimed first:
+
+        Priority_Subscriber_Weight * log10(1 + source channel subscribers)
+        + Priority_Growth_Weight * the source channel's subscriber growth
+        + Priority_Sources_Weight * ln(channels the term was found on)
+        - Priority_Age_Weight * (days since 1970 the keyword was added)
+
+    The age term grows by Priority_Age_Weight per day a keyword waits, relative to newer
+    ones, without the stored priority having to change over time, so the claim can read
+    it straight from the (keyword_pending, priority) index.
+
+    Args:
+        keyword_terms (list[str] | None): Only these terms (e.g. just inserted); None for every
+            pending keyword, after changing the weights.
+
+    Returns:
+        int: The number of keyword rows updated.
+    """
+    config = get_config()
+    terms = ""
+    params: list = [config.priority_subscriber_weight, config.priority_growth_weight, config.priority_sources_weight,
+                    config.priority_age_weight]
+    if keyword_terms is not None:
+        if not keyword_terms:
+            return 0
+        terms = "WHERE keyword_term IN (" + ", ".join(["%s"] * len(keyword_terms)) + ")"
+        params = [*keyword_terms, *params]
+
+    query = f"""UPDATE keywords k
+                JOIN (SELECT keyword_term, COUNT(*) AS sources FROM keywords {terms}
+                      GROUP BY keyword_term) s ON s.keyword_term = k.keyword_term
+                SET k.keyword_sources = s.sources,
+                    k.priority = %s * LOG10(1 + COALESCE(k.source_subs, 0)) + %s * COALESCE(k.source_growth, 0)
+                                 + %s * LN(s.sources) - %s * UNIX_TIMESTAMP(k.keyword_added) / 86400
+                WHERE k.keyword_pending = 1"""
+    return get_pool("Keyword").run(query, params, commit=True, prepared=False)
+
+
+def get_channel_previous_subs(channel_handle: str) -> tuple[int | None, datetime | None]:
+    """
+    Returns the subscribers stored for a channel and when it was last researched.
+
+    Args:
+        channel_handle (str): The handle of the channel.
+
+    Returns:
+        tuple: The subscribers (None if unknown) and the last research time (None if never).
+    """
+    query = "SELECT channel_subs, channel_researched FROM channels WHERE channel_handle = %s"
+    row = get_pool("Channel").run(query, (channel_handle,), fetch="one")
+    if not row:
+        return None, None
+    return row[0], row[1] if isinstance(row[1], datetime) else None
 
 
 def update_channel(channel, subscribers) -> None:
@@ -178,48 +811,33 @@ def update_channel(channel, subscribers) -> None:
     Returns:
         None
     """
-    config = load_config('config.json')
-
-    mydb = mysql.connector.connect(
-        host=config["Channel_DB_host"],
-        user=config["Channel_DB_user"],
-        database=config["Channel_DB_name"],
-        password=config["Channel_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Channel")
 
     query = "UPDATE channels SET channel_subs = %s WHERE channel_handle = %s"
-    mycursor.execute(query, (subscribers, channel))
-
-    mydb.commit()
-    mydb.close()
+    pool.run(query, (subscribers, channel), commit=True)
 
     return
 
 
 def clean_duplicate_keywords() -> None:
-    config = load_config('config.json')
+    """
+    Deletes all but the oldest row of every (keyword_term, keyword_from) pair.
 
-    mydb = mysql.connector.connect(
-        host=config["Keyword_DB_host"],
-        user=config["Keyword_DB_user"],
-        database=config["Keyword_DB_name"],
-        password=config["Keyword_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    Rows are matched on keyword_source_hash, the column the unique key is on, so
+    migrate_schema runs this right before adding that key.
+    """
+    pool = get_pool("Keyword")
 
     # Query to delete duplicates based on keyword_term and keyword_from
     delete_duplicates_query = """
-    DELETE k1 FROM keywords k1
-    INNER JOIN keywords k2
-    ON k1.keyword_term = k2.keyword_term
-    AND k1.keyword_from = k2.keyword_from
-    AND k1.keyword_id > k2.keyword_id
+    DELETE k FROM keywords k
+    INNER JOIN (SELECT keyword_source_hash, MIN(keyword_id) AS keep_id FROM keywords
+                WHERE keyword_source_hash IS NOT NULL
+                GROUP BY keyword_source_hash HAVING COUNT(*) > 1) d
+    ON k.keyword_source_hash = d.keyword_source_hash
+    AND k.keyword_id > d.keep_id
     """
-    mycursor.execute(delete_duplicates_query)
-
-    mydb.commit()
-    mydb.close()
+    pool.run(delete_duplicates_query, commit=True, prepared=False)
 
     return
 
@@ -235,16 +853,7 @@ def add_channel_to_db(channel_id: str, subscribers: int) -> None:
     Returns:
         None
     """
-    config = load_config('config.json')
-
-    # Connect to the database
-    mydb = mysql.connector.connect(
-        host=config["Channel_DB_host"],
-        user=config["Channel_DB_user"],
-        database=config["Channel_DB_name"],
-        password=config["Channel_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Channel")
 
     query = """
         INSERT INTO channels (channel_handle, channel_researched, channel_subs)
@@ -254,10 +863,9 @@ def add_channel_to_db(channel_id: str, subscribers: int) -> None:
             channel_subs = VALUES(channel_subs)
     """
 
-    mycursor.execute(query, (channel_id, 0, subscribers))
-
-    mydb.commit()
-    mydb.close()
+    # 1 affected row for a new channel, 2 for an updated one
+    if pool.run(query, (channel_id, 0, subscribers), commit=True) == 1:
+        metrics.inc("channels_found_total")
 
     return
 
@@ -267,15 +875,7 @@ def clean_duplicate_channels() -> None:
     Removes duplicate channels from the database, retaining the row with the smallest channel_id
     for each unique channel_handle.
     """
-    config = load_config('config.json')
-
-    mydb = mysql.connector.connect(
-        host=config["Channel_DB_host"],
-        user=config["Channel_DB_user"],
-        database=config["Channel_DB_name"],
-        password=config["Channel_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    pool = get_pool("Channel")
 
     # Query to delete duplicates based on channel_handle, keeping the one with the smallest channel_id
     delete_duplicates_query = """
@@ -285,10 +885,7 @@ def clean_duplicate_channels() -> None:
     AND c1.channel_id > c2.channel_id
     """
 
-    mycursor.execute(delete_duplicates_query)
-
-    mydb.commit()
-    mydb.close()
+    pool.run(delete_duplicates_query, commit=True, prepared=False)
 
     return
 
@@ -307,20 +904,189 @@ def update_keyword(keyword_term: str, volume: int, competition: int, recency: in
     Returns:
         None
     """
-    config = load_config('config.json')
+    pool = get_pool("Keyword")
+
+    query = """UPDATE keywords SET volume = %s, competition = %s, recency = %s, job_state = 'stored', attempts = 0,
+                      next_attempt_at = NULL, claimed_by = NULL, lease_expires = NULL
+               WHERE keyword_term = %s"""
+    pool.run(query, (volume, competition, recency, keyword_term), commit=True)
+
+    return
+
+
+def get_serp_cache(keyword_norm: str, ttl_hours: float) -> tuple[int, int, str, int] | None:
+    """
+    Looks up the cached scores of a normalized keyword.
+
+    Args:
+        keyword_norm (str): The normalized keyword.
+        ttl_hours (float): Entries older than this are ignored.
+
+    Returns:
+        tuple | None: (volume, competition, recency, age in seconds) if a fresh entry exists, otherwise None.
+    """
+    pool = get_pool("Keyword")
+
+    query = """SELECT volume, competition, recency, TIMESTAMPDIFF(SECOND, fetched_at, NOW()) FROM serp_cache
+               WHERE keyword_norm = %s AND fetched_at > NOW() - INTERVAL %s SECOND"""
+    result = pool.run(query, (keyword_norm, int(ttl_hours * 3600)), fetch="one")
+
+    return tuple(result) if result else None
+
+
+def put_serp_cache(keyword_norm: str, volume: int, competition: int, recency: str) -> None:
+    """
+    Stores the scores of a normalized keyword, replacing any previous entry.
+
+    Args:
+        keyword_norm (str): The normalized keyword.
+        volume (int): The volume score.
+        competition (int): The competition score.
+        recency (str): The recency rating.
+    """
+    pool = get_pool("Keyword")
 
-    mydb = mysql.connector.connect(
-        host=config["Keyword_DB_host"],
-        user=config["Keyword_DB_user"],
-        database=config["Keyword_DB_name"],
-        password=config["Keyword_DB_password"]
-    )
-    mycursor = mydb.cursor()
+    query = """
+        INSERT INTO serp_cache (keyword_norm, volume, competition, recency, fetched_at)
+        VALUES (%s, %s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE
+            volume = VALUES(volume),
+            competition = VALUES(competition),
+            recency = VALUES(recency),
+            fetched_at = VALUES(fetched_at)
+    """
+    pool.run(query, (keyword_norm, volume, competition, recency), commit=True)
+
+
+def evict_serp_cache(ttl_hours: float, max_entries: int) -> int:
+    """
+    Deletes expired cache entries and, beyond `max_entries`, the oldest ones.
+
+    Args:
+        ttl_hours (float): Entries older than this are deleted.
+        max_entries (int): The maximum number of entries to keep.
+
+    Returns:
+        int: The number of entries deleted.
+    """
+    pool = get_pool("Keyword")
+
+    query = "DELETE FROM serp_cache WHERE fetched_at < NOW() - INTERVAL %s SECOND"
+    deleted = pool.run(query, (int(ttl_hours * 3600),), commit=True)
+
+    query = "SELECT fetched_at FROM serp_cache ORDER BY fetched_at DESC LIMIT 1 OFFSET %s"
+    cutoff = pool.run(query, (max_entries,), fetch="one")
+    if cutoff:
+        query = "DELETE FROM serp_cache WHERE fetched_at <= %s"
+        deleted += pool.run(query, (cutoff[0],), commit=True)
+
+    return deleted
+
+
+def add_observations(observations: list[tuple]) -> int:
+    """
+    Appends raw search result observations with a single multi-row insert.
+
+    Args:
+        observations (list[tuple]): (scrape_id, keyword_term, position, video_id, title,
+            views, recency, duration, subscribers) tuples.
+
+    Returns:
+        int: The number of observations inserted.
+    """
+    if not observations:
+        return 0
+
+    pool = get_pool("Keyword")
+
+    rows = []
+    for observation in observations:
+        rows.extend(observation)
+
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())"] * len(observations))
+    query = f"""INSERT INTO observations (scrape_id, keyword_term, position, video_id, title,
+                                          views, recency, duration, subscribers, observed_at)
+                VALUES {placeholders}"""
+    return pool.run(query, rows, commit=True, prepared=False)
+
+
+def iter_latest_observations(keyword_term: str | None = None) -> Iterator[tuple[str, list[tuple]]]:
+    """
+    Streams the most recent scrape of every keyword (or of one keyword) from the observations table.
+    Terms that differ in case are separate keywords here.
+
+    Args:
+        keyword_term (str | None): Only read this keyword.
+
+    Yields:
+        tuple: (keyword_term, rows) where each row is (position, video_id, title, views, recency, duration, subscribers).
+    """
+    query = """SELECT scrape_id, keyword_term, position, video_id, title, views, recency, duration, subscribers
+               FROM observations"""
+    params: tuple = ()
+    if keyword_term is not None:
+        query += " WHERE keyword_term = %s"
+        params = (keyword_term,)
+    # Sorted byte-wise, like the grouping below: under the column's case-insensitive collation,
+    # terms differing only in case would interleave and split into several groups
+    query += " ORDER BY CAST(keyword_term AS BINARY), observation_id"
+
+    with get_pool("Keyword").connection() as connection:
+        cursor = connection.cnx.cursor()
+        try:
+            cursor.execute(query, params)
+
+            current_keyword, current_scrape, rows = None, None, []
+            while batch := cursor.fetchmany(5000):
+                for scrape_id, term, *row in batch:
+                    if term != current_keyword:
+                        if rows:
+                            yield current_keyword, rows
+                        current_keyword, current_scrape, rows = term, scrape_id, []
+                    elif scrape_id != current_scrape:
+                        # A later scrape of the same keyword replaces the earlier one
+                        current_scrape, rows = scrape_id, []
+                    rows.append(tuple(row))
+
+            if rows:
+                yield current_keyword, rows
+        finally:
+            # Drain what is left if the caller stopped early, so the connection can be reused
+            connection.cnx.consume_results()
+            cursor.close()
+
+
+def update_keyword_scores(scores: list[tuple[int, int, str, str]]) -> int:
+    """
+    Overwrites the volume, competition and recency of many keywords in one transaction.
+
+    Args:
+        scores (list[tuple]): (volume, competition, recency, keyword_term) tuples.
+
+    Returns:
+        int: The number of rows changed.
+    """
+    if not scores:
+        return 0
 
     query = "UPDATE keywords SET volume = %s, competition = %s, recency = %s WHERE keyword_term = %s"
-    mycursor.execute(query, (volume, competition, recency, keyword_term))
+    with get_pool("Keyword").connection() as connection:
+        cursor = connection.cnx.cursor()
+        try:
+            cursor.executemany(query, scores)
+            changed = cursor.rowcount
+        finally:
+            cursor.close()
+        connection.commit()
 
-    mydb.commit()
-    mydb.close()
+    return changed
 
-    return
+
+def clear_serp_cache() -> int:
+    """
+    Deletes every SERP cache entry, e.g. after the scoring formula changed.
+
+    Returns:
+        int: The number of entries deleted.
+    """
+    return get_pool("Keyword").run("DELETE FROM serp_cache", commit=True, prepared=False)
@@ -0,0 +1,303 @@
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Any, Iterator
+
+import mysql.connector
+import threading
+import metrics
+import queue
+import time
+
+
+# Errors after which a connection is considered broken and gets re-established
+RECONNECT_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+# Prepared statements kept per connection before the least recently used one is dropped
+MAX_CACHED_STATEMENTS = 32
+
+# A connection idle for longer is pinged (and reconnected) before use, so a statement is never sent on a dead one
+IDLE_PING_SECONDS = 30
+
+
+class PooledConnection:
+    """
+    A long-lived MySQL connection owned by a ConnectionPool.
+
+    Keeps one prepared cursor per distinct statement so that repeated queries
+    skip the server-side prepare step.
+    """
+
+    def __init__(self, pool: "ConnectionPool"):
+        self.pool = pool
+        self.cnx = mysql.connector.connect(**pool.connect_args)
+        self.cursors: OrderedDict[str, Any] = OrderedDict()
+        self.last_used = time.monotonic()
+
+    def cursor(self, query: str, prepared: bool = True):
+        """
+        Returns a cursor for the given statement, reusing the cached one when possible.
+
+        Args:
+            query (str): The SQL statement the cursor will execute.
+            prepared (bool): Whether to use a server-side prepared statement.
+
+        Returns:
+            A MySQL cursor.
+        """
+        if not prepared:
+            return self.cnx.cursor()
+
+        cursor = self.cursors.get(query)
+        if cursor is not None:
+            self.cursors.move_to_end(query)
+            self.pool.count("statements_reused")
+            return cursor
+
+        cursor = self.cnx.cursor(prepared=True)
+        self.cursors[query] = cursor
+        if len(self.cursors) > MAX_CACHED_STATEMENTS:
+            _, stale = self.cursors.popitem(last=False)
+            try:
+                stale.close()
+            except mysql.connector.Error:
+                pass
+        return cursor
+
+    def execute(self, query: str, params: tuple | list = (), prepared: bool = True, fetch: str | None = None) -> Any:
+        """
+        Executes a single statement and optionally fetches its result.
+
+        Args:
+            query (str): The SQL statement.
+            params (tuple | list): The statement parameters.
+            prepared (bool): Whether to use a server-side prepared statement.
+            fetch (str | None): "one", "all" or None.
+
+        Returns:
+            The fetched row(s) if fetch is set, otherwise the affected row count.
+        """
+        cursor = self.cursor(query, prepared)
+        cursor.execute(query, tuple(params))
+
+        if fetch == "one":
+            result = cursor.fetchone()
+            # Drain anything left so the cached cursor can be executed again
+            cursor.fetchall()
+        elif fetch == "all":
+            result = cursor.fetchall()
+        else:
+            result = cursor.rowcount
+
+        if not prepared:
+            cursor.close()
+        return result
+
+    def commit(self) -> None:
+        self.cnx.commit()
+
+    def rollback(self) -> None:
+        try:
+            self.cnx.rollback()
+        except mysql.connector.Error:
+            pass
+
+    def reconnect(self) -> None:
+        """
+        Re-establishes the underlying connection after a failure, dropping cached statements.
+        """
+        self.cursors.clear()
+        self.cnx.reconnect(attempts=3, delay=1)
+        self.pool.count("reconnects")
+        self.pool.count("connections_opened")
+
+    def ensure_alive(self) -> None:
+        """
+        Pings the server if the connection sat idle for IDLE_PING_SECONDS, reconnecting if it was dropped.
+        """
+        if time.monotonic() - self.last_used < IDLE_PING_SECONDS:
+            return
+        try:
+            self.cnx.ping()
+        except mysql.connector.Error:
+            metrics.inc("db_reconnects_total", database=self.pool.name)
+            self.reconnect()
+
+    def close(self) -> None:
+        self.cursors.clear()
+        try:
+            self.cnx.close()
+        except mysql.connector.Error:
+            pass
+        self.pool.count("connections_closed")
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of long-lived MySQL connections for a single database.
+
+    Connections are opened lazily up to `size` and handed out one per caller.
+    When every connection is busy, callers wait for one to be returned. A connection
+    that sat idle is pinged before it is handed out.
+
+    Attributes:
+        name (str): The name used in logs and stats (e.g. "Channel", "Keyword").
+        stats (dict): Counters for connection churn and pool waits.
+    """
+
+    def __init__(self, name: str, size: int, **connect_args):
+        self.name = name
+        self.size = max(1, size)
+        self.connect_args = connect_args
+
+        self._idle: queue.LifoQueue[PooledConnection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "checkouts": 0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "reconnects": 0,
+            "pool_waits": 0,
+            "pool_wait_seconds": 0.0,
+            "statements_reused": 0,
+        }
+
+    def count(self, key: str, amount: float = 1) -> None:
+        """
+        Adds to one of the stats; connections on several threads update them.
+        """
+        with self._lock:
+            self.stats[key] += amount
+
+    def _acquire(self) -> PooledConnection:
+        connection = self._checkout()
+        self.count("checkouts")
+        try:
+            connection.ensure_alive()
+        except mysql.connector.Error:
+            self._discard(connection)
+            raise
+        return connection
+
+    def _release(self, connection: PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        self._idle.put(connection)
+
+    def _checkout(self) -> PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    connection = PooledConnection(self)
+                except Exception:
+                    self._opened -= 1
+                    raise
+                self.stats["connections_opened"] += 1
+                return connection
+
+        started = time.perf_counter()
+        connection = self._idle.get()
+        with self._lock:
+            self.stats["pool_waits"] += 1
+            self.stats["pool_wait_seconds"] += time.perf_counter() - started
+        return connection
+
+    def _discard(self, connection: PooledConnection) -> None:
+        connection.close()
+        with self._lock:
+            self._opened -= 1
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """
+        Checks out a connection for the duration of the `with` block.
+
+        The transaction is rolled back if the block raises; the connection is
+        returned to the pool either way.
+        """
+        connection = self._acquire()
+        started = time.perf_counter()
+        try:
+            yield connection
+            metrics.observe("db_seconds", time.perf_counter() - started, database=self.name)
+        except RECONNECT_ERRORS:
+            self._discard(connection)
+            raise
+        except Exception:
+            connection.rollback()
+            self._release(connection)
+            raise
+        else:
+            self._release(connection)
+
+    def run(self, query: str, params: tuple | list = (), fetch: str | None = None, commit: bool = False,
+            prepared: bool = True, retry: bool | None = None) -> Any:
+        """
+        Executes one statement on a pooled connection.
+
+        Idle connections are pinged before the statement is sent, so a connection the
+        server dropped is replaced without running anything twice. If the connection
+        breaks while the statement or its commit is in flight, it is reconnected, but the
+        statement is only run again if it is safe to repeat: a read, or `retry` is set.
+        A write may have been applied (or committed) before the error, so repeating
+        e.g. `attempts = attempts + 1` or an INSERT could apply it twice.
+
+        Args:
+            query (str): The SQL statement.
+            params (tuple | list): The statement parameters.
+            fetch (str | None): "one", "all" or None.
+            commit (bool): Whether to commit after the statement.
+            prepared (bool): Whether to use a server-side prepared statement.
+            retry (bool | None): Whether the statement may run again after a broken connection;
+                None retries reads (`fetch` set, no commit) only.
+
+        Returns:
+            The fetched row(s) if fetch is set, otherwise the affected row count.
+        """
+        if retry is None:
+            retry = fetch is not None and not commit
+
+        for attempt in range(2):
+            connection = self._acquire()
+            started = time.perf_counter()
+            try:
+                result = connection.execute(query, params, prepared=prepared, fetch=fetch)
+                if commit:
+                    connection.commit()
+                metrics.observe("db_seconds", time.perf_counter() - started, database=self.name)
+
+            except RECONNECT_ERRORS:
+                metrics.inc("db_reconnects_total", database=self.name)
+                try:
+                    connection.reconnect()
+                except mysql.connector.Error:
+                    self._discard(connection)
+                    raise
+                self._release(connection)
+                if attempt or not retry:
+                    raise
+
+            except Exception:
+                connection.rollback()
+                self._release(connection)
+                raise
+
+            else:
+                self._release(connection)
+                return result
+
+    def close_all(self) -> None:
+        """
+        Closes every idle connection in the pool.
+        """
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
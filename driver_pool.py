@@ -0,0 +1,234 @@
+from selenium import webdriver
+from termcolor import colored
+from http_client import youtube_url
+from settings import get_config
+from utils import start_firefox
+from typing import Callable
+
+import threading
+import metrics
+import psutil
+import time
+
+
+class DriverPool:
+    """
+    Hands out one Firefox at a time and replaces it before it degrades.
+
+    Between jobs, `checkpoint()` closes windows left open by failed video tabs and
+    recycles the browser when it has crashed, after Driver_Max_Pages page loads, or
+    once Firefox and its content processes use more than Driver_Max_RSS_MB.
+    Driver_Spares browsers are started in the background and kept on the
+    YouTube home page, so a recycle swaps browsers without waiting for a cold start.
+
+    Attributes:
+        stats (dict): Browsers started, total startup seconds, pages per retired driver and recycles per reason.
+    """
+
+    def __init__(self, spares: int = 1, max_pages: int = 0, max_rss_mb: int = 0,
+                 factory: Callable[[], webdriver.Firefox] = start_firefox):
+        self.spares = spares
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.factory = factory
+
+        self._spares: list[webdriver.Firefox] = []
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.driver: webdriver.Firefox | None = None
+        self._main_window: str | None = None
+        self._pages_at_start = 0.0
+
+        self.stats = {"started": 0, "startup_seconds": 0.0, "pages_per_driver": [], "recycles": {}}
+
+    @classmethod
+    def from_config(cls) -> "DriverPool":
+        config = get_config()
+        return cls(config.driver_spares, config.driver_max_pages, config.driver_max_rss_mb)
+
+    def _start(self) -> webdriver.Firefox:
+        """
+        Cold-starts a browser and opens the YouTube home page in it.
+        """
+        started = time.perf_counter()
+        driver = self.factory()
+        try:
+            driver.get(youtube_url("/"))
+        except Exception:
+            driver.quit()
+            raise
+        seconds = time.perf_counter() - started
+
+        metrics.observe("browser_startup_seconds", seconds)
+        with self._lock:
+            self.stats["started"] += 1
+            self.stats["startup_seconds"] += seconds
+        return driver
+
+    def _warm(self) -> None:
+        try:
+            driver = self._start()
+        except Exception as e:
+            print(colored(f"⚠️  | Could not start a spare browser: {e}", "red"))
+            driver = None
+
+        with self._lock:
+            self._starting -= 1
+            if driver is not None and not self._closed:
+                self._spares.append(driver)
+                driver = None
+        if driver is not None:
+            driver.quit()
+
+    def _top_up(self) -> None:
+        """
+        Starts spare browsers in the background until Driver_Spares are ready or starting.
+        """
+        with self._lock:
+            missing = self.spares - len(self._spares) - self._starting
+            self._starting += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._warm, name="driver-warmup", daemon=True).start()
+
+    def _take(self) -> webdriver.Firefox:
+        with self._lock:
+            driver = self._spares.pop(0) if self._spares else None
+        if driver is None:
+            print(colored("⏳  | Starting Firefox...", "yellow"))
+            driver = self._start()
+        self._top_up()
+        return driver
+
+    def acquire(self) -> webdriver.Firefox:
+        """
+        Returns the current browser, starting one if there is none.
+        """
+        while self.driver is None:
+            driver = self._take()
+            try:
+                self._main_window = driver.current_window_handle
+            except Exception:
+                # A spare that died while waiting
+                _quit(driver)
+                continue
+            self.driver = driver
+            self._pages_at_start = metrics.registry.count("navigation_seconds")
+        return self.driver
+
+    @property
+    def pages(self) -> int:
+        """
+        Page loads made by the current browser.
+        """
+        return int(metrics.registry.count("navigation_seconds") - self._pages_at_start)
+
+    def rss_mb(self) -> float | None:
+        """
+        Returns the resident memory of the current Firefox and its child processes in MB,
+        or None if it cannot be measured.
+        """
+        if self.driver is None:
+            return None
+        try:
+            pid = self.driver.capabilities.get("moz:processID") or self.driver.service.process.pid
+            process = psutil.Process(pid)
+            rss = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+        except (psutil.Error, AttributeError):
+            return None
+        return rss / 1024 / 1024
+
+    def close_stray_windows(self) -> int:
+        """
+        Closes every window but the main one and switches back to it.
+
+        Returns:
+            int: The number of windows closed.
+        """
+        closed = 0
+        for handle in self.driver.window_handles:
+            if handle != self._main_window:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+                closed += 1
+        self.driver.switch_to.window(self._main_window)
+        if closed:
+            metrics.inc("stray_windows_closed_total", closed)
+        return closed
+
+    def recycle(self, reason: str) -> webdriver.Firefox:
+        """
+        Retires the current browser (quitting it in the background) and switches to a spare.
+
+        Args:
+            reason (str): Why, e.g. "pages", "rss" or "crashed"; counted in driver_recycles_total.
+
+        Returns:
+            webdriver.Firefox: The new current browser.
+        """
+        old, self.driver = self.driver, None
+        if old is not None:
+            pages = self.pages
+            self.stats["pages_per_driver"].append(pages)
+            self.stats["recycles"][reason] = self.stats["recycles"].get(reason, 0) + 1
+            metrics.inc("driver_recycles_total", reason=reason)
+            print(colored(f"♻️  | Recycling Firefox after {pages} pages ({reason})", "cyan"))
+            threading.Thread(target=_quit, args=(old,), name="driver-quit", daemon=True).start()
+        return self.acquire()
+
+    def checkpoint(self) -> webdriver.Firefox:
+        """
+        Runs the between-jobs maintenance and returns the browser to use for the next job.
+        """
+        driver = self.acquire()
+        try:
+            self.close_stray_windows()
+        except Exception:
+            return self.recycle("crashed")
+
+        metrics.set_gauge("driver_pages", self.pages)
+        if self.max_pages and self.pages >= self.max_pages:
+            return self.recycle("pages")
+
+        rss = self.rss_mb()
+        if rss is not None:
+            metrics.set_gauge("driver_rss_bytes", rss * 1024 * 1024)
+            if self.max_rss_mb and rss > self.max_rss_mb:
+                return self.recycle("rss")
+
+        return driver
+
+    def close(self) -> None:
+        """
+        Quits the current browser and every spare.
+        """
+        with self._lock:
+            self._closed = True
+            drivers, self._spares = self._spares, []
+        if self.driver is not None:
+            self.stats["pages_per_driver"].append(self.pages)
+            drivers.append(self.driver)
+            self.driver = None
+        for driver in drivers:
+            _quit(driver)
+
+    def print_summary(self) -> None:
+        pages = self.stats["pages_per_driver"]
+        average = sum(pages) / len(pages) if pages else 0
+        startup = self.stats["startup_seconds"] / self.stats["started"] if self.stats["started"] else 0
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in self.stats["recycles"].items()) or "none"
+        print(colored(f"🦊  | Browsers: {self.stats['started']} started, avg startup {startup:.1f}s, "
+                      f"avg {average:.0f} pages per browser, recycles: {reasons}", "yellow"))
+
+
+def _quit(driver: webdriver.Firefox) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -0,0 +1,65 @@
+from settings import get_config
+
+import threading
+import urllib3
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:132.0) Gecko/20100101 Firefox/132.0",
+    "Accept-Language": "en-US,en;q=0.9",
+    # Skip the EU cookie consent interstitial
+    "Cookie": "CONSENT=YES+cb; SOCS=CAI",
+}
+
+_pool: urllib3.PoolManager | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http() -> urllib3.PoolManager:
+    """
+    Returns the process-wide HTTP connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = urllib3.PoolManager(
+                    num_pools=4,
+                    maxsize=8,
+                    retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+                )
+    return _pool
+
+
+def youtube_url(path: str) -> str:
+    """
+    Resolves a YouTube path such as "/watch?v=..." against the configured YouTube_Base_URL.
+    Absolute URLs are returned unchanged.
+    """
+    if path.startswith(("http://", "https://")):
+        return path
+    return get_config().youtube_base_url.rstrip("/") + "/" + path.lstrip("/")
+
+
+def fetch_text(url: str, method: str = "GET", body: bytes | None = None, headers: dict | None = None) -> str | None:
+    """
+    Fetches a URL over the pooled client.
+
+    Args:
+        url (str): The absolute URL.
+        method (str): The HTTP method.
+        body (bytes | None): The request body.
+        headers (dict | None): Extra request headers.
+
+    Returns:
+        str | None: The decoded response body, or None on a network error or non-200 status.
+    """
+    try:
+        response = get_http().request(method, url, body=body, headers={**HEADERS, **(headers or {})},
+                                      timeout=urllib3.Timeout(connect=5, read=get_config().timeout))
+    except urllib3.exceptions.HTTPError:
+        return None
+
+    if response.status != 200:
+        return None
+    return response.data.decode("utf-8", errors="replace")
@@ -8,12 +8,15 @@ r"""
 # Coded by : https://github.com/mod-hamza/
 # Date : 6/9/2024
 
+from supervisor import run_supervisor
 from termcolor import colored
-from yt_keywords import *
+from worker import run_worker
+from driver_pool import DriverPool
 from database import *
-from youtube import *
+from settings import *
 from utils import *
 
+import metrics
 import time
 import sys
 
@@ -24,92 +27,45 @@ def main():
 
     This function cleans duplicate keywords from the database,
     prints the YouTube ASCII and the Keyword Master ASCII,
-    and enters a loop where it checks the database for keywords.
-    If a keyword is found, it scrapes the keyword data and adds it to the database.
-    Then it moves on to channel selection.
-    Scrapes channels for keywords
+    and starts scraping. Keywords are analysed first, then channels
+    are scraped for new keywords.
+    With "Workers" above 1, that many browsers run in parallel worker processes.
     """
+    counts = {"keywords_analysed": 0, "channels_analysed": 0, "keywords_found": 0, "channels_found": 0}
+    time_start = time.time()
+
     try:
-        clean_duplicate_keywords()
         clean_duplicate_channels()
+        migrate_schema()
+        reclaim_expired_leases()
+
+        config = get_config()
+        print(colored(config.youtube_ascii, "red"))
+        print(colored(config.keyword_master, "green"))
+
+        if config.workers > 1:
+            counts = run_supervisor(config.workers)
+        else:
+            metrics.serve()
+            drivers = DriverPool.from_config()
+            try:
+                drivers.acquire()
+                time_start = time.time()
+
+                run_worker(drivers, counts)
+            finally:
+                drivers.close()
 
-        config = load_config('config.json')
-        print(colored(config["YouTube ASCII"], "red"))
-        print(colored(config["Keyword Master"], "green"))
-
-        print(colored("⏳  | Starting Firefox...", "yellow"))
-        driver = start_firefox()
-        driver.get("https://www.youtube.com/")
-        time_start = time.time()
-
-        keywords_analysed, keywords_found, channels_analysed, channels_found = 0, 0, 0, 0
-
-        while True:
-            print(colored("-"*50, "white"))
-            keyword = next_keyword()
-
-            if keyword:
-                print(colored(f"✅  | Keyword selected: {keyword}", "green"))
-
-                count = 0
-                while not keyword_search(keyword, driver):
-                    count += 1
-
-                    if count == 3:
-                        print(colored("❌  | Keyword not found", "red"))
-                        remove_keyword(keyword)
-                        continue
-
-                time.sleep(10)
-                print(colored("⏳  | Analyzing Keyword...", "yellow"))
-                volume, competition, recency = scrape_keyword_data(keyword, driver)
-                print(colored("✅  | Keyword analyzed...", "green"))
-
-                update_keyword(keyword, volume, competition, recency)
-                time_end = time.time()
-                print(colored(f"🕒  | Time running: {time_end - time_start:.2f} seconds", "yellow"))
-
-            else:
-                channel = next_channel()
-                if channel is None:
-                    print(colored("🚫  | No keyword or channel found", "red"))
-                    break
-
-                print(colored(f"✅  | Channel selected: {channel}", "green"))
-
-                count = 0
-                while not search_youtube_channel(channel, driver):
-                    print(colored(f"⏳  | Searching YouTube for channel...", "yellow"))
-                    count += 1
-
-                    if count == 3:
-                        print(colored("❌  | Channel not found", "red"))
-                        remove_channel(channel)
-                        continue
-
-                channel_subs = get_channel_subs(driver)
-                print(colored(f"✅  | Subscribers: {channel_subs}", "green"))
-                update_channel(channel, channel_subs)
-
-                print(colored("⏳  | Scraping videos...", "yellow"))
-                video_data = get_channel_videos(driver)
-
-                if video_data:
-                    for videos in video_data:
-                        keywords = videos.get("keywords")
-                        for keyword in keywords:
-                            add_null_keyword(keyword, channel)
+    except KeyboardInterrupt:
+        pass
 
-                    clean_duplicate_keywords()
-                print(colored("✅  | Videos scraped, keywords stored", "green"))
-                time_end = time.time()
-                print(colored(f"🕒  | Time running: {time_end - time_start:.2f} seconds", "yellow"))
+    store_report(counts["keywords_analysed"], counts["keywords_found"],
+                 counts["channels_analysed"], counts["channels_found"], time_start)
+    close_pools()
+    print(colored("✅  | Report stored in reports.md", "green"))
+    print(colored("🛑  | Exiting...", "red"))
+    sys.exit()
 
-    except KeyboardInterrupt:
-        store_report(keywords_analysed, keywords_found, channels_analysed, channels_found, time_start)
-        print(colored("✅  | Report stored in reports.md", "green"))
-        print(colored("🛑  | Exiting...", "red"))
-        sys.exit()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,308 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Iterator
+from termcolor import colored
+from settings import get_config
+
+import threading
+import socket
+import json
+import math
+import time
+import os
+
+
+PREFIX = "keyword_master_"
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+# Seconds between two writes of the Prometheus text file
+EXPORT_INTERVAL = 10.0
+
+# (metric name, sorted label pairs)
+Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _series(key: Key, extra: dict | None = None) -> str:
+    name, labels = key
+    pairs = list(labels) + sorted((extra or {}).items())
+    if not pairs:
+        return PREFIX + name
+    return PREFIX + name + "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Registry:
+    """
+    Thread-safe store of counters, gauges and latency histograms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: dict[Key, float] = defaultdict(float)
+        self.gauges: dict[Key, float] = {}
+        # key -> [bucket counts..., sum, count]
+        self.histograms: dict[Key, list[float]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        with self._lock:
+            self.counters[_key(name, labels)] += amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0.0] * (len(BUCKETS) + 2)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+                    break
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    def total(self, name: str) -> float:
+        """
+        Returns the sum of a counter over all of its label sets.
+        """
+        with self._lock:
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def count(self, name: str) -> float:
+        """
+        Returns the number of observations of a histogram over all of its label sets.
+        """
+        with self._lock:
+            return sum(values[-1] for (histogram, _), values in self.histograms.items() if histogram == name)
+
+    def render(self, **extra_labels) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted((key, list(values)) for key, values in self.histograms.items())
+
+        typed = set()
+        for key, value in counters:
+            if key[0] not in typed:
+                typed.add(key[0])
+                lines.append(f"# TYPE {PREFIX}{key[0]} counter")
+            lines.append(f"{_series(key, extra_labels)} {value:g}")
+
+        for key, value in gauges:
+            if key[0] not in typed:
+                typed.add(key[0])
+                lines.append(f"# TYPE {PREFIX}{key[0]} gauge")
+            lines.append(f"{_series(key, extra_labels)} {value:g}")
+
+        for key, values in histograms:
+            if key[0] not in typed:
+                typed.add(key[0])
+                lines.append(f"# TYPE {PREFIX}{key[0]} histogram")
+            name, labels = key
+            cumulative = 0.0
+            for bound, count in zip(BUCKETS, values):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else f"{bound:g}"
+                lines.append(f"{_series((name + '_bucket', labels), {**extra_labels, 'le': le})} {cumulative:g}")
+            lines.append(f"{_series((name + '_sum', labels), extra_labels)} {values[-2]:.6f}")
+            lines.append(f"{_series((name + '_count', labels), extra_labels)} {values[-1]:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+_local = threading.local()
+_worker = {"id": f"{socket.gethostname()}:{os.getpid()}", "index": None}
+_last_export = 0.0
+_log_lock = threading.Lock()
+
+
+class Job:
+    """
+    The metrics recorded while processing one keyword or channel.
+    """
+
+    def __init__(self, kind: str, key: str):
+        self.kind = kind
+        self.key = key
+        self.outcome = "ok"
+        self.stages: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, float] = defaultdict(float)
+
+
+def _current_job() -> Job | None:
+    return getattr(_local, "job", None)
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    """
+    Increments a counter, also attributing it to the job in progress.
+    """
+    registry.inc(name, amount, **labels)
+    job = _current_job()
+    if job is not None:
+        job.counts[_series(_key(name, labels))[len(PREFIX):]] += amount
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """
+    Records a latency, also adding it to the job in progress.
+    """
+    registry.observe(name, seconds, **labels)
+    job = _current_job()
+    if job is not None:
+        job.stages[_series(_key(name, labels))[len(PREFIX):]] += seconds
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """
+    Sets a gauge, e.g. the current depth of a queue.
+    """
+    registry.set(name, value, **labels)
+
+
+@contextmanager
+def timed(name: str, **labels) -> Iterator[None]:
+    """
+    Records how long the `with` block took under a latency histogram.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+@contextmanager
+def job(kind: str, key: str) -> Iterator[Job]:
+    """
+    Tracks one keyword or channel: its total time, outcome and the time spent per stage.
+
+    On exit the job is counted in jobs_total/job_seconds and logged as one JSON line to
+    Metrics_Log. Set `outcome` on the yielded Job to record anything but "ok".
+    """
+    current = Job(kind, key)
+    previous, _local.job = _current_job(), current
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        current.outcome = "error"
+        raise
+    finally:
+        _local.job = previous
+        seconds = time.perf_counter() - started
+        registry.observe("job_seconds", seconds, kind=kind)
+        registry.inc("jobs_total", kind=kind, outcome=current.outcome)
+        _log_job(current, seconds)
+
+
+def _log_job(current: Job, seconds: float) -> None:
+    path = get_config().metrics_log
+    if not path:
+        return
+
+    record = {
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "worker": _worker["id"],
+        "kind": current.kind,
+        "key": current.key,
+        "outcome": current.outcome,
+        "seconds": round(seconds, 4),
+        "stages": {stage: round(value, 4) for stage, value in current.stages.items()},
+        "counts": dict(current.counts),
+    }
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _log_lock, open(path, "a", encoding="utf-8") as file:
+            file.write(line)
+    except OSError as e:
+        print(colored(f"⚠️  | Could not write {path}: {e}", "red"))
+
+
+def set_worker(index: int | None) -> None:
+    """
+    Names this process in the exported metrics. Worker processes export to their own
+    file ("metrics.prom" -> "metrics-1.prom") and port (Metrics_Port + index).
+    """
+    _worker["id"] = f"{socket.gethostname()}:{os.getpid()}"
+    _worker["index"] = index
+
+
+def _export_path(path: str) -> str:
+    if _worker["index"] is None:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{_worker['index']}{extension}"
+
+
+def render() -> str:
+    return registry.render(worker=_worker["id"])
+
+
+def export(force: bool = False) -> None:
+    """
+    Writes the Prometheus text file (Metrics_File), at most every EXPORT_INTERVAL seconds unless forced.
+    The file is replaced atomically, as the node_exporter textfile collector expects.
+    """
+    global _last_export
+    path = get_config().metrics_file
+    now = time.monotonic()
+    if not path or (not force and now - _last_export < EXPORT_INTERVAL):
+        return
+    _last_export = now
+
+    path = _export_path(path)
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            file.write(render())
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(colored(f"⚠️  | Could not write {path}: {e}", "red"))
+
+
+def serve() -> ThreadingHTTPServer | None:
+    """
+    Serves the metrics on http://<host>:<Metrics_Port>/metrics from a background thread, if a port is configured.
+    """
+    port = get_config().metrics_port
+    if not port:
+        return None
+    port += _worker["index"] or 0
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render().encode()
+            self.send_response(200 if self.path.split("?")[0] in ("/", "/metrics") else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    except OSError as e:
+        print(colored(f"⚠️  | Could not serve metrics on port {port}: {e}", "red"))
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(colored(f"📊  | Serving metrics on port {port}", "cyan"))
+    return server
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+import re
+
+
+# Distinct strings remembered per parser; YouTube repeats the same texts ("1.2K views", "3 days ago") constantly
+CACHE_SIZE = 65536
+
+# A count ending the text: "1,234", "1.2", "12" with an optional K/M/B suffix and unit word,
+# e.g. "1.2K views", "345 subscribers", "12K watching", "Subscribers: 1,234"
+_COUNT = re.compile(r'(?:^|(?<=[\s:]))(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*([KMB])?'
+                    r'(?:\s+(?:views?|subscribers?|watching|waiting))?\s*$', re.IGNORECASE)
+_NO_COUNT = re.compile(r'\bno\s+(?:views?|subscribers?)\b', re.IGNORECASE)
+
+# "3 days ago", "Streamed 2 hours ago", "1 second ago"
+_AGE = re.compile(r'(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE)
+
+# "1:23", "12:34", "1:23:45"
+_DURATION = re.compile(r'\s*(?:(\d+):)?(\d+):(\d+)')
+
+_MULTIPLIERS = {"": 1, "K": 1000, "M": 1000000, "B": 1000000000}
+
+# Length of each age unit in seconds; a month is 30 days and a year 365 days throughout the scraper
+AGE_UNIT_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_count(text: str) -> int | None:
+    """
+    Parses a view or subscriber count text.
+
+    Handles comma grouping ("1,234 views"), K/M/B suffixes ("1.2K", "3.4M", "1.2B") and
+    "No views"/"No subscribers" (0). Suffixed values are computed exactly, so "1.15K" is 1150.
+
+    Args:
+        text (str): The count text.
+
+    Returns:
+        int | None: The count, or None if the text holds no count.
+    """
+    if not text:
+        return None
+
+    match = _COUNT.search(text)
+    if match is None:
+        return 0 if _NO_COUNT.search(text) else None
+
+    number, suffix = match.groups()
+    try:
+        return int(Decimal(number.replace(",", "")) * _MULTIPLIERS[(suffix or "").upper()])
+    except InvalidOperation:
+        return None
+
+
+def parse_views(text: str) -> int:
+    """
+    Parses a view count text, returning 0 when there is no count (e.g. upcoming premieres).
+    """
+    return parse_count(text) or 0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_age(text: str) -> tuple[int, str] | None:
+    """
+    Parses a relative upload text such as "3 days ago" or "Streamed 2 hours ago".
+
+    Args:
+        text (str): The upload text.
+
+    Returns:
+        tuple[int, str] | None: (amount, singular unit), or None if the text is not a relative age.
+    """
+    if not text:
+        return None
+
+    match = _AGE.search(text)
+    if match is None:
+        return None
+    return int(match.group(1)), match.group(2).lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_age_days(text: str, default: float = 0.01) -> float:
+    """
+    Converts a relative upload text to days, as used for the recency score.
+
+    Minutes, hours and seconds are rounded to 4 decimals. Texts without an age, and ages
+    that round to 0 days, give `default` so the age can always be divided by.
+
+    Args:
+        text (str): The upload text.
+        default (float): The value returned when the text has no usable age.
+
+    Returns:
+        float: The age in days.
+    """
+    age = parse_age(text)
+    if age is None:
+        return default
+
+    amount, unit = age
+    if unit in ("second", "minute", "hour"):
+        days = round(amount * AGE_UNIT_SECONDS[unit] / 86400, 4)
+    else:
+        days = float(amount * AGE_UNIT_SECONDS[unit] // 86400)
+
+    return days or default
+
+
+def parse_upload_date(text: str, now: datetime | None = None) -> datetime | None:
+    """
+    Converts a relative upload text to the upload time.
+
+    Args:
+        text (str): The upload text, e.g. "2 days ago" or "1 month ago".
+        now (datetime | None): The time the text was read, defaults to now.
+
+    Returns:
+        datetime | None: The upload time, or None if the text is not a relative age.
+    """
+    age = parse_age(text)
+    if age is None:
+        return None
+
+    amount, unit = age
+    return (now or datetime.now()) - timedelta(seconds=amount * AGE_UNIT_SECONDS[unit])
+
+
+def parse_earliest_upload_date(text: str, now: datetime | None = None) -> datetime | None:
+    """
+    Returns the earliest time a video with a relative upload text can have been uploaded.
+
+    Relative ages are rounded down ("5 weeks ago" reads "1 month ago"), so the upload is
+    at most one unit older than parse_upload_date says.
+
+    Args:
+        text (str): The upload text, e.g. "2 days ago" or "1 month ago".
+        now (datetime | None): The time the text was read, defaults to now.
+
+    Returns:
+        datetime | None: The earliest upload time, or None if the text is not a relative age.
+    """
+    age = parse_age(text)
+    if age is None:
+        return None
+
+    amount, unit = age
+    return (now or datetime.now()) - timedelta(seconds=(amount + 1) * AGE_UNIT_SECONDS[unit])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_duration_minutes(text: str) -> float | None:
+    """
+    Parses a duration such as "1:23", "12:34" or "1:23:45" to minutes.
+
+    Args:
+        text (str): The duration text.
+
+    Returns:
+        float | None: The duration in minutes, or None for texts without one (live streams, "SHORTS").
+    """
+    if not text:
+        return None
+
+    match = _DURATION.match(text)
+    if match is None:
+        return None
+
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 60 + int(minutes) + int(seconds) / 60
@@ -0,0 +1,142 @@
+from database import fail_job
+from dataclasses import dataclass
+from termcolor import colored
+from typing import Any, Callable
+
+import threading
+import metrics
+import queue
+import time
+
+
+@dataclass
+class Task:
+    """
+    One step of a keyword or channel job, run on a stage's thread.
+    """
+    kind: str
+    key: str
+    run: Callable[[], None]
+
+
+# Tells a stage's thread to exit
+_STOP = Task("", "", lambda: None)
+
+
+class Stage:
+    """
+    A thread running the tasks of one bounded queue in order.
+
+    `put` blocks while the queue is full, so a slow stage holds back the stage feeding it
+    instead of letting work pile up in memory. A task that raises marks its job failed.
+
+    Attributes:
+        stats (dict): Tasks run, tasks failed, the deepest the queue got and the seconds producers spent blocked.
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.queue: queue.Queue[Task] = queue.Queue(max(1, maxsize))
+        self.thread = threading.Thread(target=self._run, name=f"pipeline-{name}", daemon=True)
+        self.stats = {"tasks": 0, "errors": 0, "max_depth": 0, "blocked_seconds": 0.0}
+
+    def _depth_changed(self) -> None:
+        depth = self.queue.qsize()
+        self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+        metrics.set_gauge("pipeline_queue_depth", depth, queue=self.name)
+
+    def put(self, task: Task) -> None:
+        started = time.perf_counter()
+        self.queue.put(task)
+        blocked = time.perf_counter() - started
+        self.stats["blocked_seconds"] += blocked
+        metrics.observe("pipeline_blocked_seconds", blocked, queue=self.name)
+        self._depth_changed()
+
+    def _run(self) -> None:
+        while True:
+            task = self.queue.get()
+            self._depth_changed()
+            try:
+                if task is _STOP:
+                    return
+                with metrics.timed("pipeline_seconds", stage=self.name):
+                    task.run()
+                self.stats["tasks"] += 1
+
+            except Exception as e:
+                self.stats["errors"] += 1
+                metrics.inc("pipeline_errors_total", stage=self.name)
+                print(colored(f"❌  | {self.name.capitalize()} of {task.kind} {task.key} failed: {e}", "red"))
+                try:
+                    fail_job(task.kind, task.key)
+                except Exception as e:
+                    print(colored(f"❌  | Could not mark {task.kind} {task.key} as failed: {e}", "red"))
+
+            finally:
+                self.queue.task_done()
+
+
+class Pipeline:
+    """
+    Overlaps the browser with scoring and database writes.
+
+    The caller's thread is the fetch stage: it drives the browser and hands each job's
+    results to the score stage, which hands its scores to the persist stage. Both run on
+    their own threads behind queues of Pipeline_Queue_Size tasks, so the browser only
+    waits when storage falls that far behind.
+    """
+
+    def __init__(self, queue_size: int):
+        self.score = Stage("score", queue_size)
+        self.persist = Stage("persist", queue_size)
+
+    def start(self) -> "Pipeline":
+        self.score.thread.start()
+        self.persist.thread.start()
+        return self
+
+    def score_then_persist(self, kind: str, key: str, score: Callable[[], Any], persist: Callable[[Any], None]) -> None:
+        """
+        Queues `score()` on the score stage, then `persist(result)` on the persist stage.
+        """
+        def run() -> None:
+            result = score()
+            self.persist.put(Task(kind, key, lambda: persist(result)))
+
+        self.score.put(Task(kind, key, run))
+
+    def persist_later(self, kind: str, key: str, persist: Callable[[], None]) -> None:
+        """
+        Queues `persist()` on the persist stage, after everything queued there before it.
+        """
+        self.persist.put(Task(kind, key, persist))
+
+    def pending(self) -> int:
+        """
+        Returns the number of tasks queued or running in either stage.
+        """
+        return self.score.queue.unfinished_tasks + self.persist.queue.unfinished_tasks
+
+    def drain(self) -> None:
+        """
+        Blocks until every queued task has been scored and stored.
+        """
+        self.score.queue.join()
+        self.persist.queue.join()
+
+    def close(self) -> None:
+        """
+        Drains both stages and stops their threads.
+        """
+        for stage in (self.score, self.persist):
+            if stage.thread.is_alive():
+                stage.queue.join()
+                stage.put(_STOP)
+                stage.thread.join()
+
+    def print_summary(self) -> None:
+        for stage in (self.score, self.persist):
+            print(colored(f"🕒  | Pipeline {stage.name}: {stage.stats['tasks']} tasks, {stage.stats['errors']} failed, "
+                          f"max queue {stage.stats['max_depth']}, producers blocked {stage.stats['blocked_seconds']:.1f}s",
+                          "yellow"))
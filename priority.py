@@ -0,0 +1,63 @@
+from datetime import datetime
+from settings import get_config
+
+import math
+
+
+# Subscriber growth is measured per this many days
+GROWTH_PERIOD_DAYS = 30
+
+# Visits closer together than this give no growth reading, as the counts are rounded
+MIN_GROWTH_DAYS = 1
+
+
+def subscriber_growth(previous_subs: int | None, previous_at: datetime | None, subs: int,
+                      now: datetime | None = None) -> float | None:
+    """
+    Measures how fast a channel grows between two visits.
+
+    Parameters:
+        previous_subs (int | None): The subscribers stored on the previous visit, None if never counted.
+        previous_at (datetime | None): When the channel was last researched, None if never.
+        subs (int): The subscribers now.
+        now (datetime | None): The time of this visit, the current time if None.
+
+    Returns:
+        float | None: The growth of log10(1 + subscribers) per GROWTH_PERIOD_DAYS (0.3 is
+        about doubling every month), or None if there is no earlier visit to compare with.
+    """
+    if previous_subs is None or previous_at is None:
+        return None
+    days = ((now or datetime.now()) - previous_at).total_seconds() / 86400
+    if days < MIN_GROWTH_DAYS:
+        return None
+    return (math.log10(1 + subs) - math.log10(1 + previous_subs)) / days * GROWTH_PERIOD_DAYS
+
+
+def keyword_priority(source_subs: int | None, sources: int, growth: float | None, added_days: float) -> float:
+    """
+    The priority reprioritize_keywords stores for a pending keyword, highest claimed first:
+
+        Priority_Subscriber_Weight * log10(1 + source channel subscribers)
+        + Priority_Growth_Weight * the source channel's subscriber_growth
+        + Priority_Sources_Weight * ln(channels the term was found on)
+        - Priority_Age_Weight * (days since 1970 the keyword was added)
+
+    With the default weights a small channel's keywords rank above a big one's, and a
+    fast-growing channel's above a stagnant one's. database.reprioritize_keywords computes
+    the same expression in SQL.
+
+    Parameters:
+        source_subs (int | None): The subscribers of the channel the keyword was found on.
+        sources (int): The channels the term was found on.
+        growth (float | None): The source channel's subscriber_growth, None if unknown.
+        added_days (float): When the keyword was added, in days since 1970.
+
+    Returns:
+        float: The priority.
+    """
+    config = get_config()
+    return (config.priority_subscriber_weight * math.log10(1 + (source_subs or 0))
+            + config.priority_growth_weight * (growth or 0)
+            + config.priority_sources_weight * math.log(sources)
+            - config.priority_age_weight * added_days)
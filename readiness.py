@@ -0,0 +1,192 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from selenium import webdriver
+from termcolor import colored
+from settings import get_config
+from typing import Callable
+
+import metrics
+import time
+
+
+# Seconds the fixed time.sleep calls used to wait at each stage, used to report the time saved
+FIXED_SLEEPS = {
+    "search_results": 10,
+    "watch_page": 5,
+    "channel_scroll": 3,
+}
+
+# stage -> {"waits", "timeouts", "seconds", "max_seconds", "saved_seconds"}
+wait_stats: dict[str, dict[str, float]] = {}
+
+
+def _record(stage: str, elapsed: float, timed_out: bool) -> None:
+    stats = wait_stats.setdefault(stage, {"waits": 0, "timeouts": 0, "seconds": 0.0, "max_seconds": 0.0, "saved_seconds": 0.0})
+    stats["waits"] += 1
+    stats["timeouts"] += timed_out
+    stats["seconds"] += elapsed
+    stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+    stats["saved_seconds"] += FIXED_SLEEPS.get(stage, 0) - elapsed
+
+    metrics.observe("wait_seconds", elapsed, stage=stage)
+    if timed_out:
+        metrics.inc("wait_timeouts_total", stage=stage)
+
+
+def wait_until(driver: webdriver.Firefox, condition: Callable, stage: str, timeout: float | None = None, poll: float = 0.25) -> bool:
+    """
+    Waits until a condition holds or the deadline passes, and records how long it took.
+
+    Parameters:
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
+        condition (Callable): Called with the driver; the wait ends when it returns a truthy value.
+        stage (str): The name the wait is recorded under in wait_stats.
+        timeout (float | None): The deadline in seconds, defaults to the configured Timeout.
+        poll (float): Seconds between checks.
+
+    Returns:
+        bool: True if the condition was met, False if the deadline passed.
+    """
+    if timeout is None:
+        timeout = get_config().timeout
+
+    started = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        timed_out = False
+    except TimeoutException:
+        timed_out = True
+
+    _record(stage, time.perf_counter() - started, timed_out)
+    return not timed_out
+
+
+class count_stable:
+    """
+    Condition met once at least `minimum` elements match `selector` and their number
+    has not changed for `settle` seconds. Pages that never reach `minimum` (e.g. a
+    search with few results) are accepted after the count has been stable for `idle`
+    seconds with the document fully loaded.
+    """
+
+    script = """
+    return [document.querySelectorAll(arguments[0]).length, document.readyState];
+    """
+
+    def __init__(self, selector: str, minimum: int = 1, settle: float = 0.5, idle: float = 3.0):
+        self.selector = selector
+        self.minimum = minimum
+        self.settle = settle
+        self.idle = idle
+        self.count = -1
+        self.since = 0.0
+
+    def __call__(self, driver: webdriver.Firefox) -> int | bool:
+        count, ready_state = driver.execute_script(self.script, self.selector)
+        now = time.monotonic()
+        if count != self.count:
+            self.count, self.since = count, now
+            return False
+
+        stable_for = now - self.since
+        if count >= self.minimum and stable_for >= self.settle:
+            return count or True
+        if ready_state == "complete" and stable_for >= self.idle:
+            return count or True
+        return False
+
+
+class network_idle:
+    """
+    Condition met once the document has loaded and no new resource request has
+    started for `quiet` seconds, based on the Resource Timing entries.
+    """
+
+    script = """
+    if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(100000); }
+    return [performance.getEntriesByType('resource').length, document.readyState];
+    """
+
+    def __init__(self, quiet: float = 0.5):
+        self.quiet = quiet
+        self.count = -1
+        self.since = 0.0
+
+    def __call__(self, driver: webdriver.Firefox) -> bool:
+        count, ready_state = driver.execute_script(self.script)
+        now = time.monotonic()
+        if count != self.count:
+            self.count, self.since = count, now
+            return False
+        return ready_state == "complete" and now - self.since >= self.quiet
+
+
+class more_items_loaded:
+    """
+    Condition met once more than `previous` elements match `selector`, or once the
+    continuation spinner is gone and the count has stopped changing (end of the list).
+    """
+
+    script = """
+    const spinner = document.querySelector('ytd-continuation-item-renderer tp-yt-paper-spinner, ytd-continuation-item-renderer #spinner');
+    return [document.querySelectorAll(arguments[0]).length, !!(spinner && spinner.offsetParent !== null)];
+    """
+
+    def __init__(self, selector: str, previous: int, settle: float = 1.0):
+        self.selector = selector
+        self.previous = previous
+        self.settle = settle
+        self.count = -1
+        self.since = 0.0
+
+    def __call__(self, driver: webdriver.Firefox) -> bool:
+        count, spinning = driver.execute_script(self.script, self.selector)
+        now = time.monotonic()
+        if count > self.previous:
+            return True
+        if count != self.count:
+            self.count, self.since = count, now
+            return False
+        return not spinning and now - self.since >= self.settle
+
+
+def wait_for_search_results(driver: webdriver.Firefox) -> bool:
+    """
+    Waits until the search results needed for scoring have rendered.
+    """
+    minimum = get_config().max_videos_scraped
+    return wait_until(driver, count_stable("ytd-search ytd-video-renderer", minimum), "search_results")
+
+
+def wait_for_watch_page(driver: webdriver.Firefox) -> bool:
+    """
+    Waits until a watch page has finished loading its resources.
+    """
+    return wait_until(driver, network_idle(), "watch_page")
+
+
+def scroll_for_more_videos(driver: webdriver.Firefox) -> bool:
+    """
+    Scrolls a channel's video grid to the bottom and waits until more videos load or the grid ends.
+
+    Returns:
+        bool: True if new videos were loaded, False if the end of the channel was reached.
+    """
+    selector = "ytd-rich-item-renderer"
+    previous = driver.execute_script("""
+    window.scrollTo(0, document.documentElement.scrollHeight);
+    return document.querySelectorAll(arguments[0]).length;
+    """, selector)
+
+    wait_until(driver, more_items_loaded(selector, previous), "channel_scroll")
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector) > previous
+
+
+def print_wait_summary() -> None:
+    """
+    Prints the number, total and worst duration of the waits per stage and the time saved against the old fixed sleeps.
+    """
+    for stage, stats in wait_stats.items():
+        average = stats["seconds"] / stats["waits"] if stats["waits"] else 0
+        print(colored(f"🕒  | {stage}: {stats['waits']} waits, avg {average:.2f}s, max {stats['max_seconds']:.2f}s, "
+                      f"{stats['timeouts']} timeouts, {stats['saved_seconds']:.0f}s saved", "yellow"))
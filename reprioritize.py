@@ -0,0 +1,27 @@
+"""
+Recomputes the priority of every pending keyword, without a browser.
+
+Run this after changing Priority_Subscriber_Weight, Priority_Sources_Weight or
+Priority_Age_Weight; keywords inserted from then on get the new weights anyway:
+
+    python reprioritize.py
+"""
+from database import close_pools, migrate_schema, reprioritize_keywords
+from termcolor import colored
+
+import time
+
+
+def main() -> None:
+    time_start = time.time()
+    try:
+        migrate_schema()
+        updated = reprioritize_keywords()
+        print(colored(f"✅  | Reprioritized {updated} pending keywords in {time.time() - time_start:.2f} seconds",
+                      "green"))
+    finally:
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Recomputes keyword scores from the stored raw observations, without a browser.
+
+Run this after changing the scoring formula or its bucket edges:
+
+    python rescore.py                  # rescore every keyword and clear the SERP cache
+    python rescore.py --keyword "x"    # rescore one keyword
+    python rescore.py --dry-run        # only report what would change
+"""
+from similarity import get_similarity_engine
+from termcolor import colored
+from scoring import Observation, score_observations
+from database import clear_serp_cache, close_pools, iter_latest_observations, migrate_schema, update_keyword_scores
+
+import argparse
+import time
+
+
+# Keywords scored and written per batch
+BATCH_KEYWORDS = 1000
+
+
+def rescore(keyword_term: str | None = None, dry_run: bool = False) -> tuple[int, int]:
+    """
+    Rescores keywords from the latest scrape of each keyword in the observations table.
+
+    Parameters:
+        keyword_term (str | None): Only rescore this keyword.
+        dry_run (bool): Compute the scores without writing them.
+
+    Returns:
+        tuple: The number of keywords rescored and the number of keyword rows changed.
+    """
+    similarity = get_similarity_engine()
+    rescored = changed = 0
+    batch: list[Observation] = []
+    batch_keywords = 0
+
+    def flush() -> None:
+        nonlocal rescored, changed, batch, batch_keywords
+        scores = score_observations(batch, similarity.score_pairs)
+        rescored += len(scores)
+        if not dry_run:
+            changed += update_keyword_scores([(*score, keyword) for keyword, score in scores.items()])
+        batch, batch_keywords = [], 0
+
+    for keyword, rows in iter_latest_observations(keyword_term):
+        batch.extend(Observation(keyword, position, title, views, recency, duration, subscribers, video_id)
+                     for position, video_id, title, views, recency, duration, subscribers in rows)
+        batch_keywords += 1
+        if batch_keywords >= BATCH_KEYWORDS:
+            flush()
+
+    if batch:
+        flush()
+
+    return rescored, changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute keyword scores from stored observations.")
+    parser.add_argument("--keyword", help="only rescore this keyword")
+    parser.add_argument("--dry-run", action="store_true", help="compute scores without writing them")
+    args = parser.parse_args()
+
+    time_start = time.time()
+    try:
+        migrate_schema()
+        rescored, changed = rescore(args.keyword, args.dry_run)
+
+        if not args.dry_run and changed:
+            # Cached scores were computed with the old formula
+            cleared = clear_serp_cache()
+            print(colored(f"🗃️  | Cleared {cleared} SERP cache entries", "yellow"))
+
+        print(colored(f"✅  | Rescored {rescored} keywords, {changed} rows changed "
+                      f"in {time.time() - time_start:.2f} seconds", "green"))
+    finally:
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
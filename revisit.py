@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from settings import get_config
+
+
+# Weight of the latest visit in the smoothed upload rate
+RATE_SMOOTHING = 0.5
+
+# New keywords on a visit that halve the interval to the next one (twice as many divide it by three, ...)
+YIELD_KEYWORDS = 20
+
+
+@dataclass
+class Revisit:
+    """
+    When a channel is due again, and the statistics that decided it.
+    """
+    next_visit_at: datetime
+    upload_rate: float | None
+    idle_visits: int
+    keyword_yield: int
+
+
+def plan_revisit(previous_visit: datetime | None, upload_rate: float | None, idle_visits: int,
+                 new_videos: int, new_keywords: int, now: datetime | None = None) -> Revisit:
+    """
+    Schedules a channel's next visit from its upload cadence and keyword yield.
+
+    The upload rate (videos per day) is smoothed over visits. Each visit observes the new
+    videos uploaded since the previous visit, within the `Days` cutoff. A channel is
+    revisited about when its next upload is expected (Revisit_Base_Days while its rate is
+    unknown). The interval shrinks with the keywords the visit added: YIELD_KEYWORDS new
+    keywords halve it. Every visit in a row that adds no keywords doubles it instead. The
+    result is kept between Revisit_Min_Days and Revisit_Max_Days.
+
+    Parameters:
+        previous_visit (datetime | None): When the channel was last researched, None if never.
+        upload_rate (float | None): The smoothed upload rate so far.
+        idle_visits (int): Visits in a row without keywords so far.
+        new_videos (int): Videos found on this visit.
+        new_keywords (int): Keywords this visit inserted, i.e. not already stored for the channel.
+        now (datetime | None): The time of this visit, the current time if None.
+
+    Returns:
+        Revisit: The next visit time and the updated statistics.
+    """
+    config = get_config()
+    now = now or datetime.now()
+
+    window_days = config.days
+    if previous_visit is not None and previous_visit < now:
+        window_days = min(window_days, (now - previous_visit).total_seconds() / 86400)
+    if window_days > 0:
+        observed = new_videos / window_days
+        upload_rate = observed if upload_rate is None else RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * upload_rate
+
+    idle_visits = 0 if new_keywords else idle_visits + 1
+
+    interval = 1 / upload_rate if upload_rate else config.revisit_base_days
+    interval /= 1 + new_keywords / YIELD_KEYWORDS
+    interval *= 2 ** min(idle_visits, 32)
+    interval = max(config.revisit_min_days, min(config.revisit_max_days, interval))
+
+    return Revisit(now + timedelta(days=interval), upload_rate, idle_visits, new_keywords)
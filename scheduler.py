@@ -0,0 +1,57 @@
+from database import next_channel, next_keyword
+from typing import Callable
+
+
+class Scheduler:
+    """
+    Picks the next job, interleaving keywords and channels.
+
+    Keywords come out of the queue highest priority first (see reprioritize_keywords).
+    For every channel, Keyword_Channel_Ratio keywords are scraped, so new keywords keep
+    arriving while the backlog is worked off; a ratio of 0 scrapes channels only once no
+    keyword is left. When the preferred kind has no work, the other one runs instead.
+
+    Attributes:
+        scheduled (dict): Jobs handed out per kind.
+    """
+
+    def __init__(self, ratio: float, refill: Callable[[], bool] | None = None):
+        """
+        Parameters:
+            ratio (float): Keywords per channel.
+            refill (Callable[[], bool] | None): Called before giving up on keywords; returns True
+                if it may have stored new ones (e.g. by flushing buffered channel keywords).
+        """
+        self.ratio = ratio
+        self.refill = refill
+        # Keywords owed before the next channel
+        self._credit = ratio
+        self.scheduled = {"keyword": 0, "channel": 0}
+
+    def _keyword(self) -> str | None:
+        keyword = next_keyword()
+        if keyword is None and self.refill is not None and self.refill():
+            keyword = next_keyword()
+        return keyword
+
+    def next_job(self) -> tuple[str, str] | None:
+        """
+        Returns the next ("keyword", term) or ("channel", handle) job, or None if there is no work.
+        """
+        order = (("keyword", self._keyword), ("channel", next_channel))
+        if self.ratio and self._credit < 1:
+            order = order[::-1]
+
+        for kind, take in order:
+            key = take()
+            if key is not None:
+                self._scheduled(kind)
+                return kind, key
+        return None
+
+    def _scheduled(self, kind: str) -> None:
+        self.scheduled[kind] += 1
+        if kind == "keyword":
+            self._credit = max(0.0, self._credit - 1)
+        else:
+            self._credit = min(max(self.ratio, 1.0), self._credit + self.ratio)
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+recency_ratings = {
+    1: "Hot",
+    2: "Standard",
+    3: "Old",
+    4: "Very Old",
+}
+
+# Bucket edges of the ladders in yt_keywords.calculate_video_rating.
+# channel/length scores count the edges <= value, recency scores count the edges < value, plus one.
+CHANNEL_SCORE_EDGES = (250, 1000, 2000, 3000, 5000, 7000, 15000, 30000, 50000, 100000)
+LENGTH_SCORE_EDGES = (2, 5, 8)
+RECENCY_SCORE_EDGES = (1, 11, 24)
+
+
+@dataclass
+class Observation:
+    """
+    The raw values of one search result as seen while scraping a keyword.
+    """
+    keyword: str
+    position: int
+    title: str
+    views: int
+    recency: float
+    duration: float
+    subscribers: int
+    video_id: str = ""
+
+
+def score_videos(views: Sequence[int], recency: Sequence[float], duration: Sequence[float],
+                 subscribers: Sequence[int], similarity: Sequence[float],
+                 channel_edges: Sequence[float] = CHANNEL_SCORE_EDGES,
+                 length_edges: Sequence[float] = LENGTH_SCORE_EDGES,
+                 recency_edges: Sequence[float] = RECENCY_SCORE_EDGES) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scores many videos at once. Element i of every output equals
+    calculate_video_rating(...) for video i with the default edges.
+
+    Parameters:
+        views (Sequence[int]): The number of views of each video.
+        recency (Sequence[float]): The number of days since each video was uploaded.
+        duration (Sequence[float]): The duration of each video in minutes.
+        subscribers (Sequence[int]): The subscribers of each video's channel.
+        similarity (Sequence[float]): The title/keyword similarity (0-100) of each video.
+        channel_edges (Sequence[float]): Subscriber counts at which the channel score steps up.
+        length_edges (Sequence[float]): Durations at which the length score steps up.
+        recency_edges (Sequence[float]): Ages at which the recency score steps up.
+
+    Returns:
+        tuple: The volume (int64), competition (float64) and recency (int64) score arrays.
+    """
+    views = np.asarray(views, dtype=np.float64)
+    recency = np.asarray(recency, dtype=np.float64)
+    duration = np.asarray(duration, dtype=np.float64)
+    subscribers = np.asarray(subscribers, dtype=np.float64)
+    similarity_weight = np.asarray(similarity, dtype=np.float64) / 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_score = np.trunc(views / recency).astype(np.int64)
+
+    channel_score = np.searchsorted(np.asarray(channel_edges), subscribers, side="right")
+    length_score = np.searchsorted(np.asarray(length_edges), duration, side="right")
+    competition_score = (channel_score + length_score).astype(np.float64) * similarity_weight
+
+    recency_score = np.searchsorted(np.asarray(recency_edges), recency, side="left") + 1
+
+    return volume_score, competition_score, recency_score.astype(np.int64)
+
+
+def aggregate_keywords(groups: Sequence[int], volume: np.ndarray, competition: np.ndarray, recency: np.ndarray,
+                       videos_per_keyword: int | Sequence[int] | None = None) -> tuple[np.ndarray, np.ndarray, list[str | None]]:
+    """
+    Averages per-video scores into per-keyword scores the way scrape_keyword_data does:
+    competition is rounded per video, and every average is rounded half to even.
+
+    Parameters:
+        groups (Sequence[int]): The keyword index (0..n-1) of every video.
+        volume (np.ndarray): Per-video volume scores.
+        competition (np.ndarray): Per-video competition scores.
+        recency (np.ndarray): Per-video recency scores.
+        videos_per_keyword (int | Sequence[int] | None): The divisor per keyword; defaults to
+            the number of videos of each keyword. scrape_keyword_data divides by Max_Videos_Scraped.
+
+    Returns:
+        tuple: Volume and competition arrays (int64) and the recency rating label of every keyword.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    keywords = int(groups.max()) + 1 if groups.size else 0
+
+    if videos_per_keyword is None:
+        divisor = np.bincount(groups, minlength=keywords).astype(np.float64)
+    else:
+        divisor = np.broadcast_to(np.asarray(videos_per_keyword, dtype=np.float64), (keywords,))
+
+    volume_total = np.bincount(groups, weights=volume, minlength=keywords)
+    competition_total = np.bincount(groups, weights=np.round(competition), minlength=keywords)
+    recency_total = np.bincount(groups, weights=recency, minlength=keywords)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_avg = np.round(volume_total / divisor).astype(np.int64)
+        competition_avg = np.round(competition_total / divisor).astype(np.int64)
+        recency_avg = np.round(recency_total / divisor).astype(np.int64)
+
+    return volume_avg, competition_avg, [recency_ratings.get(int(rating)) for rating in recency_avg]
+
+
+def score_observations(observations: Sequence[Observation],
+                       similarity: Callable[[Sequence[str], Sequence[str]], Sequence[float]],
+                       videos_per_keyword: int | None = None) -> dict[str, tuple[int, int, str | None]]:
+    """
+    Scores raw observations of any number of keywords in one pass.
+
+    Parameters:
+        observations (Sequence[Observation]): The observations, in any order.
+        similarity (Callable): Called with the keywords and titles of all observations, returns
+            their similarities (0-100), e.g. SimilarityEngine.score_pairs.
+        videos_per_keyword (int | None): The divisor per keyword, see aggregate_keywords.
+
+    Returns:
+        dict: keyword -> (volume, competition, recency rating).
+    """
+    keywords: dict[str, int] = {}
+    groups = [keywords.setdefault(o.keyword, len(keywords)) for o in observations]
+    if not groups:
+        return {}
+
+    volume, competition, recency = score_videos(
+        [o.views for o in observations], [o.recency for o in observations], [o.duration for o in observations],
+        [o.subscribers for o in observations], similarity([o.keyword for o in observations], [o.title for o in observations]))
+    volume, competition, recency = aggregate_keywords(groups, volume, competition, recency, videos_per_keyword)
+
+    return {keyword: (int(volume[i]), int(competition[i]), recency[i]) for keyword, i in keywords.items()}
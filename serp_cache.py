@@ -0,0 +1,108 @@
+from database import evict_serp_cache, get_serp_cache, put_serp_cache
+from collections import OrderedDict
+from termcolor import colored
+
+import threading
+import metrics
+import time
+
+
+# Entries kept in memory in front of the serp_cache table
+LOCAL_ENTRIES = 10000
+
+# Puts between two eviction passes over the serp_cache table
+EVICT_EVERY = 200
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Normalizes a keyword for cache lookups: lowercase, single spaces, no surrounding whitespace.
+    """
+    return " ".join(keyword.lower().split())[:191]
+
+
+class SerpCache:
+    """
+    TTL cache of keyword search scores, shared by every scraper through the serp_cache table.
+
+    A small in-process LRU sits in front of the table. Eviction of expired and
+    excess entries runs every EVICT_EVERY puts. Safe to share between the fetch and
+    persistence stages of a pipeline.
+
+    Lookups are exported as the serp_cache_hits_total (labelled by the tier that answered:
+    "memory" or "table") and serp_cache_misses_total counters, and the hit rate so far as
+    the serp_cache_hit_ratio gauge.
+
+    Attributes:
+        stats (dict): Hits, misses and puts.
+    """
+
+    def __init__(self, ttl_hours: float, max_entries: int):
+        self.ttl_hours = ttl_hours
+        self.max_entries = max_entries
+        self._local: OrderedDict[str, tuple[float, tuple[int, int, str]]] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "puts": 0}
+        self._lock = threading.Lock()
+
+    def get(self, keyword: str) -> tuple[int, int, str] | None:
+        """
+        Returns the cached (volume, competition, recency) of a keyword, or None on a miss.
+        """
+        key = normalize_keyword(keyword)
+
+        with self._lock:
+            local = self._local.get(key)
+            if local and time.monotonic() - local[0] < self.ttl_hours * 3600:
+                self._local.move_to_end(key)
+                self._count("hits", tier="memory")
+                return local[1]
+
+        cached = get_serp_cache(key, self.ttl_hours)
+        if cached is None:
+            with self._lock:
+                self._count("misses")
+            return None
+
+        *scores, age = cached
+        self._remember(key, tuple(scores), age)
+        with self._lock:
+            self._count("hits", tier="table")
+        return tuple(scores)
+
+    def _count(self, outcome: str, **labels) -> None:
+        """
+        Counts a hit or miss in `stats` and in the metrics. Call with the lock held.
+        """
+        self.stats[outcome] += 1
+        metrics.inc(f"serp_cache_{outcome}_total", **labels)
+        metrics.set_gauge("serp_cache_hit_ratio", self.hit_rate)
+
+    def put(self, keyword: str, volume: int, competition: int, recency: str) -> None:
+        """
+        Caches the scores of a freshly scraped keyword.
+        """
+        key = normalize_keyword(keyword)
+        put_serp_cache(key, volume, competition, recency)
+        self._remember(key, (volume, competition, recency))
+
+        with self._lock:
+            self.stats["puts"] += 1
+            evict = self.stats["puts"] % EVICT_EVERY == 0
+        if evict:
+            evict_serp_cache(self.ttl_hours, self.max_entries)
+
+    def _remember(self, key: str, scores: tuple[int, int, str], age: float = 0) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() - age, scores)
+            self._local.move_to_end(key)
+            if len(self._local) > LOCAL_ENTRIES:
+                self._local.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def print_summary(self) -> None:
+        print(colored(f"🗃️  | SERP cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+                      f"({self.hit_rate:.0%} hit rate)", "yellow"))
@@ -0,0 +1,218 @@
+from dataclasses import MISSING, dataclass, field, fields
+from termcolor import colored
+
+import threading
+import difflib
+import json
+import time
+import os
+
+
+# How often (in seconds) the config file's mtime is checked for changes
+STAT_INTERVAL = 1.0
+
+
+class ConfigError(ValueError):
+    """
+    Raised when config.json is missing keys, has unknown keys or holds values of the wrong type.
+    """
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Typed view of config.json.
+
+    Every field maps to one JSON key (stored in the field metadata). Fields without
+    a default are required. Keys starting with "_" are treated as comments.
+    """
+    firefox_profile: str = field(metadata={"key": "Firefox Profile"})
+    geckodriver_path: str = field(metadata={"key": "Geckodriver Path"})
+
+    channel_db_host: str = field(metadata={"key": "Channel_DB_host"})
+    channel_db_name: str = field(metadata={"key": "Channel_DB_name"})
+    channel_db_user: str = field(metadata={"key": "Channel_DB_user"})
+    channel_db_password: str = field(metadata={"key": "Channel_DB_password"})
+
+    keyword_db_host: str = field(metadata={"key": "Keyword_DB_host"})
+    keyword_db_name: str = field(metadata={"key": "Keyword_DB_name"})
+    keyword_db_user: str = field(metadata={"key": "Keyword_DB_user"})
+    keyword_db_password: str = field(metadata={"key": "Keyword_DB_password"})
+
+    max_subscriber_count: int = field(metadata={"key": "Max_Subscriber_Count", "min": 0})
+    days: float = field(metadata={"key": "Days", "min": 0})
+    max_videos_scraped: int = field(metadata={"key": "Max_Videos_Scraped", "min": 1})
+    timeout: float = field(metadata={"key": "Timeout", "min": 0})
+    views_threshold: int = field(metadata={"key": "Views_threshold", "min": 0})
+
+    youtube_ascii: str = field(default="", metadata={"key": "YouTube ASCII"})
+    keyword_master: str = field(default="", metadata={"key": "Keyword Master"})
+    db_pool_size: int = field(default=4, metadata={"key": "DB_Pool_Size", "min": 1})
+    keyword_batch_size: int = field(default=500, metadata={"key": "Keyword_Batch_Size", "min": 1})
+    keyword_flush_seconds: float = field(default=5.0, metadata={"key": "Keyword_Flush_Seconds", "min": 0})
+    claim_batch_size: int = field(default=10, metadata={"key": "Claim_Batch_Size", "min": 1})
+    lease_seconds: int = field(default=1800, metadata={"key": "Lease_Seconds", "min": 1})
+    heartbeat_seconds: float = field(default=60.0, metadata={"key": "Heartbeat_Seconds", "min": 1})
+    max_attempts: int = field(default=3, metadata={"key": "Max_Attempts", "min": 1})
+    worker_name: str = field(default="", metadata={"key": "Worker_Name"})
+    pipeline_queue_size: int = field(default=4, metadata={"key": "Pipeline_Queue_Size", "min": 1})
+    driver_spares: int = field(default=1, metadata={"key": "Driver_Spares", "min": 0})
+    driver_max_pages: int = field(default=500, metadata={"key": "Driver_Max_Pages", "min": 0})
+    driver_max_rss_mb: int = field(default=2048, metadata={"key": "Driver_Max_RSS_MB", "min": 0})
+    keyword_channel_ratio: float = field(default=5.0, metadata={"key": "Keyword_Channel_Ratio", "min": 0})
+    priority_subscriber_weight: float = field(default=-1.0, metadata={"key": "Priority_Subscriber_Weight"})
+    priority_growth_weight: float = field(default=10.0, metadata={"key": "Priority_Growth_Weight"})
+    priority_sources_weight: float = field(default=2.0, metadata={"key": "Priority_Sources_Weight"})
+    priority_age_weight: float = field(default=0.25, metadata={"key": "Priority_Age_Weight", "min": 0})
+    revisit_base_days: float = field(default=20.0, metadata={"key": "Revisit_Base_Days", "min": 0})
+    revisit_min_days: float = field(default=1.0, metadata={"key": "Revisit_Min_Days", "min": 0})
+    revisit_max_days: float = field(default=180.0, metadata={"key": "Revisit_Max_Days", "min": 0})
+    lean_mode: bool = field(default=False, metadata={"key": "Lean_Mode"})
+    channel_paging: str = field(default="continuation", metadata={"key": "Channel_Paging",
+                                                                  "choices": ("continuation", "scroll")})
+    workers: int = field(default=1, metadata={"key": "Workers", "min": 1})
+    youtube_base_url: str = field(default="https://www.youtube.com", metadata={"key": "YouTube_Base_URL"})
+    serp_cache_ttl_hours: float = field(default=168.0, metadata={"key": "SERP_Cache_TTL_Hours", "min": 0})
+    serp_cache_max_entries: int = field(default=100000, metadata={"key": "SERP_Cache_Max_Entries", "min": 1})
+    similarity_backend: str = field(default="fuzzywuzzy", metadata={"key": "Similarity_Backend",
+                                                                     "choices": ("fuzzywuzzy", "rapidfuzz")})
+    metrics_file: str = field(default="metrics.prom", metadata={"key": "Metrics_File"})
+    metrics_log: str = field(default="metrics.jsonl", metadata={"key": "Metrics_Log"})
+    metrics_port: int = field(default=0, metadata={"key": "Metrics_Port", "min": 0})
+
+    def db_params(self, database: str) -> dict[str, str]:
+        """
+        Returns the mysql.connector connection arguments for a database.
+
+        Args:
+            database (str): Either "Channel" or "Keyword".
+
+        Returns:
+            dict: host, user, database and password.
+        """
+        prefix = database.lower()
+        return {
+            "host": getattr(self, f"{prefix}_db_host"),
+            "user": getattr(self, f"{prefix}_db_user"),
+            "database": getattr(self, f"{prefix}_db_name"),
+            "password": getattr(self, f"{prefix}_db_password"),
+        }
+
+
+def _coerce(key: str, expected: type, value):
+    """
+    Checks a raw JSON value against the field type, widening int to float where needed.
+    """
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if expected is int and isinstance(value, bool):
+        raise ConfigError(f"'{key}' must be an integer, got {value!r}")
+    if not isinstance(value, expected):
+        raise ConfigError(f"'{key}' must be of type {expected.__name__}, got {type(value).__name__}")
+    return value
+
+
+def parse_config(raw: dict) -> Config:
+    """
+    Validates a raw config dictionary and builds a Config from it.
+
+    Args:
+        raw (dict): The parsed contents of config.json.
+
+    Returns:
+        Config: The validated config.
+
+    Raises:
+        ConfigError: If a key is unknown, a required key is missing or a value has the wrong type.
+    """
+    known = {f.metadata["key"]: f for f in fields(Config)}
+
+    unknown = [key for key in raw if key not in known and not key.startswith("_")]
+    if unknown:
+        hints = []
+        for key in unknown:
+            close = difflib.get_close_matches(key, known, n=1)
+            hints.append(f"'{key}'" + (f" (did you mean '{close[0]}'?)" if close else ""))
+        raise ConfigError(f"Unknown config keys: {', '.join(hints)}")
+
+    values = {}
+    for key, f in known.items():
+        if key not in raw:
+            if f.default is MISSING:
+                raise ConfigError(f"Missing required config key '{key}'")
+            continue
+
+        value = _coerce(key, f.type, raw[key])
+        minimum = f.metadata.get("min")
+        if minimum is not None and value < minimum:
+            raise ConfigError(f"'{key}' must be >= {minimum}, got {value}")
+        choices = f.metadata.get("choices")
+        if choices is not None and value not in choices:
+            raise ConfigError(f"'{key}' must be one of {', '.join(map(repr, choices))}, got {value!r}")
+        values[f.name] = value
+
+    return Config(**values)
+
+
+# The config file used by get_config(); KEYWORD_MASTER_CONFIG points a run (e.g. a benchmark) at another file
+CONFIG_PATH = os.environ.get("KEYWORD_MASTER_CONFIG", "config.json")
+
+_cache: dict[str, dict] = {}
+_cache_lock = threading.Lock()
+
+
+def get_config(config_path: str | None = None) -> Config:
+    """
+    Returns the process-wide config, loading it on first use.
+
+    The file is re-read only when its mtime changes (checked at most once every
+    STAT_INTERVAL seconds), so values can be retuned on a running scraper. A
+    reload that fails validation, or finds the file missing or unreadable (e.g.
+    mid-save), keeps the previous config and prints a warning.
+
+    Args:
+        config_path (str | None): Path to the JSON config file, defaults to CONFIG_PATH.
+
+    Returns:
+        Config: The current config.
+
+    Raises:
+        ConfigError: If the config is invalid on the first load.
+    """
+    config_path = config_path or CONFIG_PATH
+    entry = _cache.get(config_path)
+    now = time.monotonic()
+    if entry is not None and now - entry["checked"] < STAT_INTERVAL:
+        return entry["config"]
+
+    with _cache_lock:
+        entry = _cache.get(config_path)
+        if entry is not None and now - entry["checked"] < STAT_INTERVAL:
+            return entry["config"]
+
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+            if entry is not None and entry["mtime"] == mtime:
+                entry["checked"] = now
+                return entry["config"]
+
+            with open(config_path, 'r') as file:
+                config = parse_config(json.load(file))
+
+        except OSError as e:
+            # E.g. an editor that saves by deleting and rewriting the file; retried on the next check
+            if entry is None:
+                raise
+            print(colored(f"⚠️  | Could not read {config_path}, keeping the last config: {e}", "red"))
+            entry["checked"] = now
+            return entry["config"]
+
+        except (ConfigError, ValueError) as e:
+            if entry is None:
+                raise
+            print(colored(f"⚠️  | Ignoring invalid {config_path} reload: {e}", "red"))
+            entry["mtime"], entry["checked"] = mtime, now
+            return entry["config"]
+
+        _cache[config_path] = {"config": config, "mtime": mtime, "checked": now}
+        return config
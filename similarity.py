@@ -0,0 +1,187 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Sequence
+from termcolor import colored
+from settings import get_config
+
+import numpy as np
+
+try:
+    # A C++ port of difflib giving the same matching blocks and ratios
+    from cydifflib import SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+except ImportError:
+    rapid_fuzz = rapid_process = None
+
+
+BACKENDS = ("fuzzywuzzy", "rapidfuzz")
+
+# (keyword, title) pairs whose similarity is kept in memory
+CACHE_ENTRIES = 200000
+
+
+@lru_cache(maxsize=CACHE_ENTRIES)
+def normalize_text(text: str) -> str:
+    """
+    Normalizes a title or keyword the way calculate_similarity_weight does (lowercase only).
+    """
+    return text.lower()
+
+
+def partial_ratio(s1: str, s2: str) -> int:
+    """
+    fuzzywuzzy's fuzz.partial_ratio as requirements.txt installs it (on difflib, without
+    python-Levenshtein), giving the same scores with less work per pair: the matching runs
+    on cydifflib when it is installed.
+
+    The shorter string is compared with the window of the longer one that each difflib
+    matching block lines up, and the best SequenceMatcher ratio wins. A window is scored
+    once however many blocks line it up, and only if its quick_ratio (an upper bound of
+    its ratio) could beat the best so far. A shorter string found whole in the longer one
+    scores 100 straight away: with no autojunk (under 200 characters) it is the longest
+    matching block, so fuzzywuzzy returns 100 for its window too.
+
+    Returns:
+        int: The similarity, 0-100.
+    """
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+
+    shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+    if len(longer) < 200 and shorter in longer:
+        return 100
+
+    length = len(shorter)
+    best = 0.0
+    window = SequenceMatcher(None, shorter)
+    scored = set()
+    for a, b, _ in SequenceMatcher(None, shorter, longer).get_matching_blocks():
+        start = max(0, b - a)
+        if start in scored:
+            continue
+        scored.add(start)
+
+        window.set_seq2(longer[start:start + length])
+        if window.real_quick_ratio() <= best or window.quick_ratio() <= best:
+            continue
+        ratio = window.ratio()
+        if ratio > .995:
+            return 100
+        best = max(best, ratio)
+    # fuzzywuzzy's utils.intr
+    return int(round(100 * best))
+
+
+class SimilarityEngine:
+    """
+    Computes fuzz.partial_ratio similarities between keywords and titles in bulk.
+
+    Strings are normalized once, duplicate pairs are scored once and every score
+    is cached. The "fuzzywuzzy" backend gives exactly fuzz.partial_ratio's scores,
+    computed by partial_ratio above. The opt-in "rapidfuzz" backend scores a keyword
+    against all of its titles in one C call (rapidfuzz.process.cdist). Its
+    partial_ratio searches every alignment instead of fuzzywuzzy's matching-block
+    heuristic, so its scores are never lower and about half of them are higher;
+    rescore the corpus after switching.
+
+    Attributes:
+        stats (dict): Cache hits, misses (pairs actually scored) and batch calls.
+    """
+
+    def __init__(self, backend: str = "fuzzywuzzy", cache_entries: int = CACHE_ENTRIES):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown similarity backend '{backend}', expected one of {BACKENDS}")
+        if backend == "rapidfuzz" and rapid_process is None:
+            print(colored("⚠️  | rapidfuzz is not installed, falling back to fuzzywuzzy similarity", "yellow"))
+            backend = "fuzzywuzzy"
+
+        self.backend = backend
+        self.cache_entries = cache_entries
+        self._cache: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "batches": 0}
+
+    def score(self, keyword: str, title: str) -> int:
+        """
+        Returns the similarity (0-100) of one keyword and title.
+        """
+        return int(self.score_many(keyword, [title])[0])
+
+    def score_many(self, keyword: str, titles: Sequence[str]) -> np.ndarray:
+        """
+        Scores one keyword against many titles.
+
+        Returns:
+            np.ndarray: The similarity (0-100) of every title, in order.
+        """
+        return self.score_pairs([keyword] * len(titles), titles)
+
+    def score_pairs(self, keywords: Sequence[str], titles: Sequence[str]) -> np.ndarray:
+        """
+        Scores keyword i against title i for every i.
+
+        Parameters:
+            keywords (Sequence[str]): The keywords.
+            titles (Sequence[str]): The titles, as many as keywords.
+
+        Returns:
+            np.ndarray: The similarity (0-100) of every pair, as int64.
+        """
+        self.stats["batches"] += 1
+        pairs = [(normalize_text(keyword), normalize_text(title)) for keyword, title in zip(keywords, titles)]
+
+        # Unique uncached titles per keyword
+        missing: dict[str, dict[str, None]] = {}
+        for pair in dict.fromkeys(pairs):
+            if pair in self._cache:
+                self._cache.move_to_end(pair)
+                self.stats["hits"] += 1
+            else:
+                missing.setdefault(pair[0], {})[pair[1]] = None
+
+        computed: dict[tuple[str, str], int] = {}
+        for keyword, keyword_titles in missing.items():
+            for title, similarity in zip(keyword_titles, self._compute(keyword, list(keyword_titles))):
+                computed[(keyword, title)] = similarity
+            self.stats["misses"] += len(keyword_titles)
+
+        scores = np.fromiter((computed[pair] if pair in computed else self._cache[pair] for pair in pairs),
+                             dtype=np.int64, count=len(pairs))
+
+        for pair, similarity in computed.items():
+            self._cache[pair] = similarity
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+        return scores
+
+    def _compute(self, keyword: str, titles: list[str]) -> list[int]:
+        if self.backend == "rapidfuzz":
+            matrix = rapid_process.cdist([keyword], titles, scorer=rapid_fuzz.partial_ratio, workers=-1)
+            # fuzzywuzzy rounds half to even as well (round())
+            return np.rint(matrix[0]).astype(np.int64).tolist()
+        # calculate_similarity_weight passes the title first, which decides the order of equally long strings
+        return [partial_ratio(title, keyword) for title in titles]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+_engines: dict[str, SimilarityEngine] = {}
+
+
+def get_similarity_engine() -> SimilarityEngine:
+    """
+    Returns the process-wide engine for the configured Similarity_Backend.
+    """
+    backend = get_config().similarity_backend
+    if backend not in _engines:
+        _engines[backend] = SimilarityEngine(backend)
+    return _engines[backend]
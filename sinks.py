@@ -0,0 +1,227 @@
+from database import add_null_keywords, add_observations, complete_channels
+from scoring import Observation
+from termcolor import colored
+from datetime import datetime
+from typing import Any, Callable
+from revisit import Revisit
+
+import threading
+import atexit
+import uuid
+import time
+
+
+class BufferedSink:
+    """
+    Collects rows in memory and writes them in batches.
+
+    A batch is flushed when `batch_size` rows are buffered, when the oldest
+    buffered row is older than `flush_interval` seconds, when `flush()` is
+    called, and on interpreter shutdown. The age limit is enforced by a daemon
+    thread, so a partly filled buffer is written even if no further row arrives.
+
+    Attributes:
+        stats (dict): Rows added, rows written and flushes performed.
+    """
+
+    def __init__(self, writer: Callable[[list], Any], batch_size: int = 500, flush_interval: float = 5.0):
+        self.writer = writer
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self._rows: list = []
+        self._first_row_at: float | None = None
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        # Set while rows are buffered, so the flush thread sleeps on an empty buffer
+        self._pending = threading.Event()
+        self._timer: threading.Thread | None = None
+
+        self.stats = {"rows_added": 0, "rows_written": 0, "flushes": 0}
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _key(self, row) -> Any:
+        """
+        Returns the key used to drop duplicate rows within a batch, or None to keep every row.
+        """
+        return None
+
+    def add(self, row) -> None:
+        """
+        Buffers a row, flushing if the size or time threshold has been reached.
+        """
+        with self._lock:
+            if self._first_row_at is None:
+                self._first_row_at = time.monotonic()
+            self._rows.append(row)
+            self._pending.set()
+            self.stats["rows_added"] += 1
+            if self._timer is None and not self._closed.is_set():
+                self._timer = threading.Thread(target=self._flush_when_due, name=f"{type(self).__name__}-flush",
+                                               daemon=True)
+                self._timer.start()
+
+            if len(self._rows) >= self.batch_size or time.monotonic() - self._first_row_at >= self.flush_interval:
+                self.flush()
+
+    def _flush_when_due(self) -> None:
+        """
+        Flushes the buffer whenever its oldest row gets older than `flush_interval`, until closed.
+        """
+        while not self._closed.is_set():
+            self._pending.wait()
+            with self._lock:
+                first_row_at = self._first_row_at
+                if first_row_at is None:
+                    self._pending.clear()
+                    continue
+
+            # At least a short pause, so a zero interval or a failing writer does not spin
+            if self._closed.wait(max(0.05, first_row_at + self.flush_interval - time.monotonic())):
+                return
+
+            with self._lock:
+                due = self._first_row_at is not None and time.monotonic() - self._first_row_at >= self.flush_interval
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # The rows stay buffered and are retried on the next tick
+                    print(colored(f"⚠️  | Timed flush of {len(self._rows)} rows failed: {e}", "red"))
+
+    def extend(self, rows) -> None:
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> None:
+        """
+        Writes every buffered row in batches of at most `batch_size`.
+        """
+        with self._lock:
+            rows, self._rows, self._first_row_at = self._rows, [], None
+
+            seen = set()
+            unique = []
+            for row in rows:
+                key = self._key(row)
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                unique.append(row)
+
+            for start in range(0, len(unique), self.batch_size):
+                batch = unique[start:start + self.batch_size]
+                try:
+                    self.writer(batch)
+                except Exception:
+                    # Keep the unwritten rows so the next flush retries them
+                    self._rows = unique[start:] + self._rows
+                    raise
+                self.stats["rows_written"] += len(batch)
+                self.stats["flushes"] += 1
+
+    def close(self) -> None:
+        """
+        Flushes whatever is left. Registered with atexit so buffered rows are not lost on shutdown.
+        """
+        self._closed.set()
+        self._pending.set()
+        try:
+            self.flush()
+        except Exception as e:
+            print(colored(f"❌  | Could not flush {len(self._rows)} buffered rows: {e}", "red"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class KeywordSink(BufferedSink):
+    """
+    Write-behind sink for (keyword_term, channel_handle, subscribers, growth) rows found while scraping channels.
+
+    Rows are inserted per channel, so the keywords each channel actually added (not already
+    stored for it) are known when its next visit is planned.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 5.0):
+        super().__init__(self._write, batch_size, flush_interval)
+        self._channels: list[tuple[str, str | None, datetime | None, Revisit | Callable[[int], Revisit] | None]] = []
+        # channel handle -> keywords inserted since it was last completed
+        self._inserted: dict[str, int] = {}
+
+    def _key(self, row: tuple) -> tuple[str, str]:
+        keyword_term, channel_handle = row[:2]
+        return keyword_term, channel_handle.strip("@")
+
+    def _write(self, rows: list[tuple]) -> None:
+        by_channel: dict[str, list[tuple]] = {}
+        for row in rows:
+            by_channel.setdefault(row[1].strip("@"), []).append(row)
+        for channel_handle, channel_rows in by_channel.items():
+            inserted = add_null_keywords(channel_rows)
+            self._inserted[channel_handle] = self._inserted.get(channel_handle, 0) + inserted
+
+    def complete_after_flush(self, channel_handle: str, last_video_id: str | None = None,
+                             last_video_at: datetime | None = None,
+                             plan: Callable[[int], Revisit] | None = None) -> None:
+        """
+        Marks a channel as researched, moves its high-water mark to its newest video and
+        schedules its next visit, once every keyword buffered so far has been written. A crash
+        before the flush leaves the channel to be scraped again from the old mark.
+
+        `plan` is called with the number of keywords the channel inserted and returns its
+        next visit; without it the channel is next visited Revisit_Base_Days from now.
+        """
+        channel = (channel_handle, last_video_id, last_video_at, plan)
+        with self._lock:
+            if self._rows:
+                self._channels.append(channel)
+            else:
+                complete_channels([self._planned(channel)])
+
+    def _planned(self, channel: tuple) -> tuple:
+        """
+        Resolves a pending channel's plan into its Revisit, from the keywords it inserted.
+        """
+        channel_handle, last_video_id, last_video_at, plan = channel
+        if callable(plan):
+            plan = plan(self._inserted.pop(channel_handle.strip("@"), 0))
+        return channel_handle, last_video_id, last_video_at, plan
+
+    def flush(self) -> None:
+        with self._lock:
+            super().flush()
+            channels, self._channels = [self._planned(channel) for channel in self._channels], []
+            try:
+                complete_channels(channels)
+            except Exception:
+                self._channels = channels + self._channels
+                raise
+
+
+class ObservationSink(BufferedSink):
+    """
+    Write-behind sink appending the raw search results of every scraped keyword to the observations table.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 5.0):
+        super().__init__(add_observations, batch_size, flush_interval)
+
+    def add_scrape(self, observations: list[Observation]) -> str:
+        """
+        Buffers the observations of one keyword search under a new scrape id.
+
+        Returns:
+            str: The scrape id.
+        """
+        scrape_id = uuid.uuid4().hex
+        self.extend((scrape_id, o.keyword, o.position, o.video_id, o.title[:255],
+                     o.views, o.recency, o.duration, o.subscribers) for o in observations)
+        return scrape_id
@@ -0,0 +1,175 @@
+from database import close_pools, set_worker_slot
+from termcolor import colored
+from worker import run_worker
+from driver_pool import DriverPool
+
+import multiprocessing
+import metrics
+import signal
+import queue
+import time
+import os
+
+
+# Seconds between throughput reports
+STATS_INTERVAL = 60
+
+# Seconds given to workers to finish their current job after SIGINT/SIGTERM
+DRAIN_TIMEOUT = 300
+
+# Seconds before a worker that ran out of work is started again while others are still busy
+IDLE_RESTART_DELAY = 60
+
+
+def _worker_main(index: int, stop_event, progress_queue, predecessor_pid: int | None = None) -> None:
+    """
+    Entry point of a worker process: starts its own Firefox and runs the worker loop.
+    `predecessor_pid` is the worker this one replaces in its slot, if any.
+
+    Signals are ignored here; the supervisor turns them into `stop_event` so the
+    current job can finish. Exit code 0 means the worker ran out of work.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    if hasattr(os, "setsid"):
+        # Keep Ctrl+C in the terminal from reaching this worker's geckodriver and Firefox
+        os.setsid()
+
+    # A restarted worker keeps its slot and takes over the jobs its predecessor claimed in it
+    set_worker_slot(index)
+    metrics.set_worker(index)
+    metrics.serve()
+
+    # FirefoxProfile copies the configured profile, so every worker browses with its own copies
+    drivers = DriverPool.from_config()
+
+    try:
+        run_worker(drivers, {}, stop_event, on_progress=lambda key, amount: progress_queue.put((index, key, amount)),
+                   predecessor_pid=predecessor_pid)
+    finally:
+        drivers.close()
+        close_pools()
+
+
+def run_supervisor(workers: int) -> dict[str, int]:
+    """
+    Runs `workers` scraper processes, each with its own browser, until the work runs out or a signal arrives.
+
+    Crashed workers are restarted with exponential backoff. The first SIGINT/SIGTERM
+    drains the workers (they finish their current job); a second one, or the drain
+    timeout, terminates them.
+
+    Parameters:
+        workers (int): The number of worker processes.
+
+    Returns:
+        dict[str, int]: The aggregated "keywords_analysed", "channels_analysed", "keywords_found"
+        and "channels_found" counts.
+    """
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    progress_queue = context.Queue()
+
+    processes: dict[int, multiprocessing.Process] = {}
+    restart_at: dict[int, float] = {}
+    # Slot -> pid of the worker that last ran in it, whose unfinished jobs its replacement resumes
+    predecessors: dict[int, int] = {}
+    crashes = {index: 0 for index in range(workers)}
+    totals = {"keywords_analysed": 0, "channels_analysed": 0, "keywords_found": 0, "channels_found": 0}
+    per_worker = {index: 0 for index in range(workers)}
+    restarts = 0
+    drain_deadline: float | None = None
+
+    def start(index: int) -> None:
+        process = context.Process(target=_worker_main, args=(index, stop_event, progress_queue, predecessors.get(index)),
+                                  name=f"scraper-{index}", daemon=True)
+        process.start()
+        processes[index] = process
+
+    def handle_signal(signum, frame) -> None:
+        nonlocal drain_deadline
+        if stop_event.is_set():
+            print(colored("🛑  | Terminating workers...", "red"))
+            for process in processes.values():
+                process.terminate()
+            return
+        print(colored(f"⏳  | Draining {len(processes)} workers (signal again to force)...", "yellow"))
+        stop_event.set()
+        restart_at.clear()
+        drain_deadline = time.monotonic() + DRAIN_TIMEOUT
+
+    previous_handlers = {sig: signal.signal(sig, handle_signal) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    print(colored(f"⏳  | Starting {workers} workers...", "yellow"))
+    for index in range(workers):
+        start(index)
+
+    time_start = last_report = time.monotonic()
+    try:
+        while processes or restart_at:
+            try:
+                index, key, amount = progress_queue.get(timeout=1)
+                totals[key] += amount
+                if key.endswith("_analysed"):
+                    per_worker[index] += 1
+                    crashes[index] = 0
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            for index, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                del processes[index]
+                predecessors[index] = process.pid
+
+                if stop_event.is_set():
+                    continue
+                if process.exitcode == 0:
+                    # Out of work; try again later only if someone may still produce new keywords
+                    if processes:
+                        restart_at[index] = now + IDLE_RESTART_DELAY
+                    continue
+
+                crashes[index] += 1
+                delay = min(300, 5 * 2 ** (crashes[index] - 1))
+                print(colored(f"❌  | Worker {index} exited with code {process.exitcode}, restarting in {delay}s", "red"))
+                restart_at[index] = now + delay
+
+            for index, due in list(restart_at.items()):
+                if now >= due and not stop_event.is_set():
+                    del restart_at[index]
+                    restarts += 1
+                    start(index)
+            if not processes and all(crashes[index] == 0 for index in restart_at):
+                # Every worker is idle, nothing left to wait for
+                break
+
+            if drain_deadline is not None and now > drain_deadline:
+                print(colored("🛑  | Drain timed out, terminating workers...", "red"))
+                for process in processes.values():
+                    process.terminate()
+                drain_deadline = None
+
+            if now - last_report >= STATS_INTERVAL:
+                last_report = now
+                minutes = (now - time_start) / 60
+                print(colored(f"📊  | {len(processes)} workers | "
+                              f"{totals['keywords_analysed'] / minutes:.1f} keywords/min | "
+                              f"{totals['channels_analysed'] / minutes:.1f} channels/min | "
+                              f"jobs per worker {per_worker} | restarts {restarts}", "cyan"))
+
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        for process in processes.values():
+            process.join(timeout=5)
+
+    while True:
+        try:
+            _, key, amount = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+        totals[key] += amount
+
+    return totals
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+import json
+import sys
+import os
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# The modules under test are top-level scripts, and settings reads the config at first use
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("KEYWORD_MASTER_CONFIG", str(ROOT / "config copy.json"))
+
+
+@pytest.fixture
+def fixture_text():
+    """
+    Returns the contents of a file in tests/fixtures.
+    """
+    return lambda name: (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def fixture_json(fixture_text):
+    """
+    Returns the decoded contents of a JSON file in tests/fixtures.
+    """
+    return lambda name: json.loads(fixture_text(name))
@@ -0,0 +1,135 @@
+from conftest import ROOT
+from itertools import islice
+
+import pytest
+import sys
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_youtube import CHANNEL_PAGE_SIZE, FakeYouTube, channel_videos
+from channel_pager import ChannelPager
+from http_client import fetch_text
+from yt_data import ChannelVideo, extract_json_variable, parse_ytcfg
+
+import channel_pager
+import youtube
+
+
+HANDLES = ["minecraft0", "guitar1", "speedrun2"]
+
+
+@pytest.fixture(scope="module")
+def fake_youtube():
+    with FakeYouTube() as server, pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(channel_pager, "youtube_url", lambda path: server.base_url + path)
+        yield server
+
+
+def videos_tab(server: FakeYouTube, handle: str) -> str:
+    return fetch_text(f"{server.base_url}/@{handle}/videos")
+
+
+def expected_ids(handle: str) -> list[str]:
+    return [video["id"] for video in channel_videos(handle)]
+
+
+def fail_continuation(monkeypatch, token: str) -> None:
+    """
+    Makes the browse request for one continuation token fail.
+    """
+    fetch = ChannelPager.fetch
+    monkeypatch.setattr(ChannelPager, "fetch", lambda self, t: None if t == token else fetch(self, t))
+
+
+@pytest.mark.parametrize("handle", HANDLES)
+def test_pager_yields_every_video_in_order(fake_youtube, handle):
+    pager = ChannelPager.from_html(videos_tab(fake_youtube, handle))
+
+    assert [video.video_id for video in pager] == expected_ids(handle)
+    assert pager.pages == len(expected_ids(handle)) // CHANNEL_PAGE_SIZE - 1
+    assert not pager.failed
+
+
+def test_pager_fetches_pages_lazily(fake_youtube):
+    pager = ChannelPager.from_html(videos_tab(fake_youtube, "house3"))
+
+    first = [video.video_id for video in islice(pager, CHANNEL_PAGE_SIZE)]
+
+    assert first == expected_ids("house3")[:CHANNEL_PAGE_SIZE]
+    assert pager.pages == 0
+
+
+def test_failed_continuation_marks_pager(fake_youtube, monkeypatch):
+    fail_continuation(monkeypatch, "lesson4:2")
+    pager = ChannelPager.from_html(videos_tab(fake_youtube, "lesson4"))
+
+    assert [video.video_id for video in pager] == expected_ids("lesson4")[:2 * CHANNEL_PAGE_SIZE]
+    assert pager.failed
+
+
+class FakeDriver:
+    """
+    Stands in for a browser on a channel's videos tab, whose grid grows by one page per scroll.
+    """
+
+    def __init__(self, html: str, handle: str):
+        self.ytcfg = parse_ytcfg(html)
+        self.grid = [ChannelVideo(video["id"], video["title"], f"/watch?v={video['id']}", video["views"], video["age"])
+                     for video in channel_videos(handle)]
+        self.loaded = CHANNEL_PAGE_SIZE
+        self.scrolls = 0
+
+    def execute_script(self, script: str) -> dict:
+        return self.ytcfg
+
+    def extract(self, offset: int) -> list[ChannelVideo]:
+        return self.grid[offset:self.loaded]
+
+    def scroll(self) -> bool:
+        if self.loaded >= len(self.grid):
+            return False
+        self.loaded += CHANNEL_PAGE_SIZE
+        self.scrolls += 1
+        return True
+
+
+@pytest.fixture
+def channel_driver(fake_youtube, monkeypatch):
+    """
+    Returns a function creating a FakeDriver on a channel's videos tab, served by the fake YouTube.
+    """
+    def on_channel(handle: str, grid_data: bool = True) -> FakeDriver:
+        html = videos_tab(fake_youtube, handle)
+        driver = FakeDriver(html, handle)
+        initial_data = extract_json_variable(html, "ytInitialData") if grid_data else None
+        monkeypatch.setattr(youtube, "get_initial_data", lambda d: initial_data)
+        monkeypatch.setattr(youtube, "extract_channel_videos", lambda d, offset: d.extract(offset))
+        monkeypatch.setattr(youtube, "scroll_for_more_videos", lambda d: d.scroll())
+        return driver
+
+    return on_channel
+
+
+def test_channel_video_source_pages_without_scrolling(channel_driver):
+    driver = channel_driver("easy5")
+
+    assert [video.video_id for video in youtube.channel_video_source(driver)] == expected_ids("easy5")
+    assert driver.scrolls == 0
+
+
+@pytest.mark.parametrize("failing_page", [1, 2])
+def test_scroll_fallback_yields_every_video_once(channel_driver, monkeypatch, failing_page):
+    handle = f"recipe{failing_page}"
+    driver = channel_driver(handle)
+    fail_continuation(monkeypatch, f"{handle}:{failing_page}")
+
+    ids = [video.video_id for video in youtube.channel_video_source(driver)]
+
+    assert ids == expected_ids(handle)
+    assert driver.scrolls > 0
+
+
+def test_scroll_fallback_without_grid_data(channel_driver):
+    driver = channel_driver("cake6", grid_data=False)
+
+    assert [video.video_id for video in youtube.channel_video_source(driver)] == expected_ids("cake6")
@@ -0,0 +1,123 @@
+import mysql.connector
+import threading
+import pytest
+
+import db_pool
+from db_pool import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, cnx):
+        self.cnx = cnx
+        self.rowcount = 1
+
+    def execute(self, query, params=()):
+        self.cnx.executed.append(query)
+        if self.cnx.fail_execute:
+            self.cnx.fail_execute -= 1
+            raise mysql.connector.errors.OperationalError("Lost connection to MySQL server during query")
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Stands in for a mysql.connector connection; the server side is a list of executed statements.
+    """
+    instances: list["FakeConnection"] = []
+
+    def __init__(self, **kwargs):
+        self.executed = []
+        self.fail_execute = 0
+        self.fail_commit = 0
+        self.pings = 0
+        FakeConnection.instances.append(self)
+
+    def cursor(self, prepared=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.fail_commit:
+            self.fail_commit -= 1
+            raise mysql.connector.errors.OperationalError("Lost connection to MySQL server during query")
+
+    def rollback(self):
+        pass
+
+    def reconnect(self, attempts=1, delay=0):
+        pass
+
+    def ping(self):
+        self.pings += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeConnection.instances = []
+    monkeypatch.setattr(mysql.connector, "connect", FakeConnection)
+    return ConnectionPool("Keyword", 2)
+
+
+def connection_of(pool) -> FakeConnection:
+    pool.run("SELECT 1", fetch="one")
+    return FakeConnection.instances[0]
+
+
+def test_read_is_retried_after_a_broken_connection(pool):
+    cnx = connection_of(pool)
+    cnx.fail_execute = 1
+
+    assert pool.run("SELECT 2", fetch="all") == [(1,)]
+    assert cnx.executed.count("SELECT 2") == 2
+    assert pool.stats["reconnects"] == 1
+
+
+def test_write_is_not_repeated_when_commit_fails(pool):
+    cnx = connection_of(pool)
+    cnx.fail_commit = 1
+
+    with pytest.raises(mysql.connector.errors.OperationalError):
+        pool.run("UPDATE keywords SET attempts = attempts + 1", commit=True)
+    assert cnx.executed.count("UPDATE keywords SET attempts = attempts + 1") == 1
+
+
+def test_write_marked_safe_is_retried(pool):
+    cnx = connection_of(pool)
+    cnx.fail_execute = 1
+
+    assert pool.run("UPDATE keywords SET heartbeat_at = NOW()", commit=True, retry=True) == 1
+    assert cnx.executed.count("UPDATE keywords SET heartbeat_at = NOW()") == 2
+
+
+def test_idle_connection_is_pinged_before_use(pool, monkeypatch):
+    cnx = connection_of(pool)
+    pool.run("SELECT 3", fetch="one")
+    assert cnx.pings == 0
+
+    monkeypatch.setattr(db_pool, "IDLE_PING_SECONDS", 0)
+    pool.run("SELECT 3", fetch="one")
+    assert cnx.pings == 1
+
+
+def test_stats_are_counted_across_threads(pool):
+    def work():
+        for _ in range(2000):
+            pool.run("SELECT 1", fetch="one")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.stats["checkouts"] == 16000
@@ -0,0 +1,90 @@
+from parsing import (parse_age_days, parse_count, parse_duration_minutes, parse_earliest_upload_date,
+                     parse_upload_date, parse_views)
+from datetime import datetime
+
+import pytest
+
+
+# (parser, text, expected)
+CORPUS = [
+    (parse_count, "1,234 views", 1234),
+    (parse_count, "1,234,567 views", 1234567),
+    (parse_count, "987 views", 987),
+    (parse_count, "1 view", 1),
+    (parse_count, "No views", 0),
+    (parse_count, "no views", 0),
+    (parse_count, "1.2K views", 1200),
+    (parse_count, "1.15K views", 1150),
+    (parse_count, "12K views", 12000),
+    (parse_count, "3.4M views", 3400000),
+    (parse_count, "1.005M views", 1005000),
+    (parse_count, "1.2B views", 1200000000),
+    (parse_count, "12K watching", 12000),
+    (parse_count, "1.2k views", 1200),
+    (parse_count, "345 subscribers", 345),
+    (parse_count, "1 subscriber", 1),
+    (parse_count, "No subscribers", 0),
+    (parse_count, "1.23M subscribers", 1230000),
+    (parse_count, "Subscribers: 12,345", 12345),
+    (parse_count, "1.2K", 1200),
+    (parse_count, "42", 42),
+    (parse_count, "", None),
+    (parse_count, "views", None),
+    (parse_count, "Scheduled for 5/6/25", None),
+    (parse_views, "Premieres in 3 hours", 0),
+    (parse_views, "", 0),
+    (parse_views, "No views", 0),
+    (parse_age_days, "3 days ago", 3.0),
+    (parse_age_days, "1 day ago", 1.0),
+    (parse_age_days, "2 weeks ago", 14.0),
+    (parse_age_days, "1 month ago", 30.0),
+    (parse_age_days, "11 months ago", 330.0),
+    (parse_age_days, "2 years ago", 730.0),
+    (parse_age_days, "5 hours ago", 0.2083),
+    (parse_age_days, "1 hour ago", 0.0417),
+    (parse_age_days, "30 minutes ago", 0.0208),
+    (parse_age_days, "1 minute ago", 0.0007),
+    (parse_age_days, "Streamed 3 hours ago", 0.125),
+    (parse_age_days, "Streamed 2 days ago", 2.0),
+    (parse_age_days, "Premiered 1 week ago", 7.0),
+    (parse_age_days, "45 seconds ago", 0.0005),
+    (parse_age_days, "1 second ago", 0.01),
+    (parse_age_days, "Scheduled for 5/6/25", 0.01),
+    (parse_age_days, "", 0.01),
+    (parse_duration_minutes, "4:05", 4 + 5 / 60),
+    (parse_duration_minutes, "12:34", 12 + 34 / 60),
+    (parse_duration_minutes, "1:23:45", 83 + 45 / 60),
+    (parse_duration_minutes, " 0:59", 59 / 60),
+    (parse_duration_minutes, "LIVE", None),
+    (parse_duration_minutes, "SHORTS", None),
+    (parse_duration_minutes, "", None),
+]
+
+NOW = datetime(2024, 6, 9, 12, 0, 0)
+UPLOAD_DATES = [
+    ("2 days ago", datetime(2024, 6, 7, 12, 0, 0)),
+    ("Streamed 3 hours ago", datetime(2024, 6, 9, 9, 0, 0)),
+    ("1 month ago", datetime(2024, 5, 10, 12, 0, 0)),
+    ("10 seconds ago", datetime(2024, 6, 9, 11, 59, 50)),
+    ("Premieres 6/10/24", None),
+]
+EARLIEST_UPLOAD_DATES = [
+    ("2 days ago", datetime(2024, 6, 6, 12, 0, 0)),
+    ("1 month ago", datetime(2024, 4, 10, 12, 0, 0)),
+    ("Premieres 6/10/24", None),
+]
+
+
+@pytest.mark.parametrize("parser, text, expected", CORPUS, ids=lambda value: repr(value) if isinstance(value, str) else None)
+def test_metric_text(parser, text, expected):
+    assert parser(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", UPLOAD_DATES)
+def test_upload_date(text, expected):
+    assert parse_upload_date(text, NOW) == expected
+
+
+@pytest.mark.parametrize("text, expected", EARLIEST_UPLOAD_DATES)
+def test_earliest_upload_date(text, expected):
+    assert parse_earliest_upload_date(text, NOW) == expected
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from priority import keyword_priority, subscriber_growth
+
+
+NOW = datetime(2026, 6, 1)
+ADDED = NOW.timestamp() / 86400
+
+
+def test_small_fast_growing_channel_ranks_above_big_channel():
+    small = keyword_priority(2000, 1, subscriber_growth(1000, NOW - timedelta(days=20), 2000, NOW), ADDED)
+    big = keyword_priority(5_000_000, 1, subscriber_growth(5_000_000, NOW - timedelta(days=20), 5_010_000, NOW), ADDED)
+
+    assert small > big
+
+
+def test_growing_channel_ranks_above_stagnant_one_of_the_same_size():
+    growing = keyword_priority(50_000, 1, subscriber_growth(30_000, NOW - timedelta(days=30), 50_000, NOW), ADDED)
+    stagnant = keyword_priority(50_000, 1, subscriber_growth(50_000, NOW - timedelta(days=30), 50_000, NOW), ADDED)
+
+    assert growing > stagnant
+
+
+def test_older_and_more_common_keywords_rank_higher():
+    assert keyword_priority(1000, 1, None, ADDED - 10) > keyword_priority(1000, 1, None, ADDED)
+    assert keyword_priority(1000, 4, None, ADDED) > keyword_priority(1000, 1, None, ADDED)
+
+
+@pytest.mark.parametrize("previous_subs, previous_at", [
+    (None, NOW - timedelta(days=10)),
+    (1000, None),
+    # Too close together for rounded counts to mean anything
+    (1000, NOW - timedelta(hours=6)),
+])
+def test_growth_unknown(previous_subs, previous_at):
+    assert subscriber_growth(previous_subs, previous_at, 2000, NOW) is None
+
+
+def test_growth_per_month():
+    # Doubling in 30 days
+    assert subscriber_growth(999, NOW - timedelta(days=30), 1999, NOW) == pytest.approx(0.301, abs=1e-3)
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+from revisit import plan_revisit
+from settings import get_config
+
+
+NOW = datetime(2026, 1, 1)
+
+
+def days_until(revisit) -> float:
+    return (revisit.next_visit_at - NOW).total_seconds() / 86400
+
+
+def test_keyword_yield_brings_the_next_visit_forward():
+    previous = NOW - timedelta(days=10)
+    barren = plan_revisit(previous, 0.1, 0, 1, 0, now=NOW)
+    fertile = plan_revisit(previous, 0.1, 0, 1, 40, now=NOW)
+
+    assert days_until(fertile) < days_until(barren)
+    assert fertile.idle_visits == 0
+    assert fertile.keyword_yield == 40
+
+
+def test_interval_stays_within_bounds():
+    config = get_config()
+    previous = NOW - timedelta(days=1)
+
+    busy = plan_revisit(previous, 50.0, 0, 50, 10000, now=NOW)
+    idle = plan_revisit(previous, 0.001, 40, 0, 0, now=NOW)
+
+    assert days_until(busy) == config.revisit_min_days
+    assert days_until(idle) == config.revisit_max_days
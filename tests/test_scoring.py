@@ -0,0 +1,113 @@
+from scoring import (score_observations, score_videos, aggregate_keywords, recency_ratings, Observation,
+                     CHANNEL_SCORE_EDGES, LENGTH_SCORE_EDGES, RECENCY_SCORE_EDGES)
+from yt_keywords import calculate_video_rating, calculate_similarity_weight
+from settings import get_config
+
+import random
+import pytest
+
+
+WORDS = ["minecraft", "tutorial", "how", "to", "build", "house", "guitar", "lesson", "easy", "recipe", "cake", "review"]
+
+# Videos per keyword, as scrape_keyword_data groups Max_Videos_Scraped results
+PER_KEYWORD = 3
+
+
+def boundary_values() -> list[float]:
+    """
+    Every bucket edge, Views_threshold and Days, with their neighbours on both sides.
+    """
+    config = get_config()
+    values = [*CHANNEL_SCORE_EDGES, *LENGTH_SCORE_EDGES, *RECENCY_SCORE_EDGES, config.views_threshold, config.days]
+    return [value + delta for value in values for delta in (-0.01, 0, 0.01) if value + delta > 0]
+
+
+def seeded_corpus(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    config = get_config()
+    edges = boundary_values()
+
+    corpus = []
+    for _ in range(count):
+        corpus.append({
+            "title": " ".join(rng.sample(WORDS, rng.randint(2, 6))),
+            "keyword": " ".join(rng.sample(WORDS, rng.randint(1, 3))),
+            "views": rng.choice([0, 1, config.views_threshold, rng.randint(0, 10**9)]),
+            "recency": rng.choice([0.01, config.days, rng.choice(edges), round(rng.uniform(0.01, 500), 2)]),
+            "duration": rng.choice([0.01, rng.choice(edges), round(rng.uniform(0, 120), 2)]),
+            "subscribers": rng.choice([int(rng.choice(edges)), rng.randint(0, 10**7)]),
+        })
+    return corpus
+
+
+def batch_scores(corpus: list[dict]):
+    similarity = [calculate_similarity_weight(video["title"], video["keyword"]) for video in corpus]
+    return score_videos([video["views"] for video in corpus], [video["recency"] for video in corpus],
+                        [video["duration"] for video in corpus], [video["subscribers"] for video in corpus],
+                        similarity)
+
+
+def old_keyword_scores(videos: list[dict]) -> tuple[int, int, str | None]:
+    """
+    The per-video loop scrape_keyword_data averaged before scoring was vectorised.
+    """
+    ratings = [calculate_video_rating(**video) for video in videos]
+    return (round(sum(rating[0] for rating in ratings) / PER_KEYWORD),
+            round(sum(round(rating[1]) for rating in ratings) / PER_KEYWORD),
+            recency_ratings.get(round(sum(rating[2] for rating in ratings) / PER_KEYWORD)))
+
+
+@pytest.fixture(scope="module")
+def corpus() -> list[dict]:
+    return seeded_corpus(3000, seed=1)
+
+
+def test_video_scores_match_old_loop(corpus):
+    volume, competition, recency = batch_scores(corpus)
+
+    for i, video in enumerate(corpus):
+        assert (int(volume[i]), float(competition[i]), int(recency[i])) == calculate_video_rating(**video), video
+
+
+@pytest.mark.parametrize("value", boundary_values())
+def test_boundary_video_scores_match_old_loop(value):
+    video = {"title": "how to build a house", "keyword": "build house", "views": int(value),
+             "recency": value, "duration": value, "subscribers": int(value)}
+    volume, competition, recency = batch_scores([video])
+
+    assert (int(volume[0]), float(competition[0]), int(recency[0])) == calculate_video_rating(**video)
+
+
+def test_keyword_averages_match_old_loop(corpus):
+    volume, competition, recency = batch_scores(corpus)
+    groups = [i // PER_KEYWORD for i in range(len(corpus))]
+    volume_avg, competition_avg, labels = aggregate_keywords(groups, volume, competition, recency, PER_KEYWORD)
+
+    for group in range(len(corpus) // PER_KEYWORD):
+        expected = old_keyword_scores(corpus[group * PER_KEYWORD:(group + 1) * PER_KEYWORD])
+        assert (int(volume_avg[group]), int(competition_avg[group]), labels[group]) == expected
+
+
+def test_score_observations_matches_old_loop(corpus):
+    videos = corpus[:PER_KEYWORD * 50]
+    # Each keyword's videos under one keyword string, as a search records them
+    observations = [Observation(f"keyword {i // PER_KEYWORD}", i % PER_KEYWORD + 1, video["title"], video["views"],
+                                video["recency"], video["duration"], video["subscribers"])
+                    for i, video in enumerate(videos)]
+
+    def similarity(keywords, titles):
+        return [calculate_similarity_weight(title, videos[i]["keyword"]) for i, title in enumerate(titles)]
+
+    scores = score_observations(observations, similarity, PER_KEYWORD)
+    for group in range(len(videos) // PER_KEYWORD):
+        assert scores[f"keyword {group}"] == old_keyword_scores(videos[group * PER_KEYWORD:(group + 1) * PER_KEYWORD])
+
+
+def test_empty_inputs():
+    volume, competition, recency = score_videos([], [], [], [], [])
+    assert volume.size == competition.size == recency.size == 0
+
+    volume_avg, competition_avg, labels = aggregate_keywords([], volume, competition, recency, PER_KEYWORD)
+    assert volume_avg.size == competition_avg.size == 0 and labels == []
+
+    assert score_observations([], lambda keywords, titles: []) == {}
@@ -0,0 +1,38 @@
+import pytest
+
+import metrics
+import serp_cache
+from serp_cache import SerpCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    table = {}
+    monkeypatch.setattr(serp_cache, "get_serp_cache", lambda key, ttl: table.get(key))
+    monkeypatch.setattr(serp_cache, "put_serp_cache", lambda key, *scores: None)
+    monkeypatch.setattr(metrics, "registry", metrics.Registry())
+    cache = SerpCache(ttl_hours=1, max_entries=100)
+    cache.table = table
+    return cache
+
+
+def test_hits_and_misses_are_exported(cache):
+    cache.table["minecraft house"] = (120, 40, "3", 0.0)
+
+    assert cache.get("How to build") is None
+    assert cache.get("Minecraft  House") == (120, 40, "3")
+    assert cache.get("minecraft house") == (120, 40, "3")
+
+    registry = metrics.registry
+    assert registry.total("serp_cache_misses_total") == 1
+    assert registry.counters[("serp_cache_hits_total", (("tier", "table"),))] == 1
+    assert registry.counters[("serp_cache_hits_total", (("tier", "memory"),))] == 1
+    assert registry.gauges[("serp_cache_hit_ratio", ())] == pytest.approx(2 / 3)
+    assert "keyword_master_serp_cache_misses_total 1" in registry.render()
+
+
+def test_put_is_served_from_memory(cache):
+    cache.put("guitar lesson", 10, 5, "1")
+
+    assert cache.get("guitar lesson") == (10, 5, "1")
+    assert cache.stats == {"hits": 1, "misses": 0, "puts": 1}
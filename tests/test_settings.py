@@ -0,0 +1,49 @@
+from conftest import ROOT
+
+import shutil
+import pytest
+import json
+
+import settings
+from settings import ConfigError, get_config
+
+
+def copy_config(tmp_path, **changes) -> str:
+    raw = json.loads((ROOT / "config copy.json").read_text())
+    raw.update(changes)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(raw))
+    return str(path)
+
+
+def test_reload_keeps_config_while_file_is_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STAT_INTERVAL", 0)
+    path = copy_config(tmp_path, Days=30)
+    config = get_config(path)
+
+    # An editor saving by deleting and rewriting the file
+    shutil.move(path, path + ".tmp")
+    assert get_config(path) is config
+
+    copy_config(tmp_path, Days=45)
+    assert get_config(path).days == 45
+
+
+def test_reload_keeps_config_when_invalid(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STAT_INTERVAL", 0)
+    path = copy_config(tmp_path, Days=30)
+    config = get_config(path)
+
+    with open(path, "w") as file:
+        file.write("{")
+    assert get_config(path) is config
+
+
+def test_first_load_of_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        get_config(str(tmp_path / "missing.json"))
+
+
+def test_unknown_key_is_rejected(tmp_path):
+    with pytest.raises(ConfigError, match="did you mean 'Days'"):
+        get_config(copy_config(tmp_path, Dayz=30))
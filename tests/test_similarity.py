@@ -0,0 +1,87 @@
+from conftest import ROOT
+from fuzzywuzzy import fuzz
+from similarity import SimilarityEngine, partial_ratio
+from yt_keywords import calculate_similarity_weight
+
+import similarity
+import difflib
+import random
+import pytest
+
+
+WORDS = ["minecraft", "tutorial", "how", "to", "build", "a", "house", "guitar", "lesson", "easy", "recipe",
+         "cake", "review", "2024", "best", "beginner", "tips", "survival", "vlog", "|", "part", "1", "é", "日本"]
+
+
+def seeded_pairs(count: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        keyword = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+        title = " ".join(rng.choices(WORDS, k=rng.randint(1, 12)))
+        if rng.random() < 0.1:
+            # Typos, so partial alignments are exercised as well as whole words
+            position = rng.randrange(len(title))
+            title = title[:position] + rng.choice("xyz ") + title[position + 1:]
+        pairs.append((keyword, title))
+    return pairs
+
+
+EDGE_PAIRS = [
+    ("", ""), ("", "abc"), ("abc", ""), ("abc", "abc"), ("a", "b"), ("abcd", "XXXbcdeEEE"),
+    ("house", "how to build a house"), ("how to build a house", "house"), ("aaaa", "aaab aaab"),
+    ("minecraft tutorial", "tutorial minecraft"), ("x" * 300, "y" + "x" * 299 + "z" * 40),
+    ("abc", "cab"), ("cab", "abc"), ("the cake", "cake the"),
+    # Over 200 characters difflib's autojunk drops popular characters, so a contained string may score below 100
+    ("a b " * 30, "x " * 80 + "a b " * 30), ("house " * 40, "a " + "house " * 45),
+]
+
+
+def test_fuzzywuzzy_runs_on_difflib():
+    # The scores stored so far come from fuzzywuzzy's difflib path; python-Levenshtein would change them
+    assert fuzz.SequenceMatcher is difflib.SequenceMatcher
+    requirements = (ROOT / "requirements.txt").read_text().lower()
+    assert "python-levenshtein" not in requirements
+
+
+@pytest.mark.parametrize("s1, s2", EDGE_PAIRS)
+def test_partial_ratio_edge_cases(s1, s2):
+    assert partial_ratio(s1, s2) == fuzz.partial_ratio(s1, s2)
+
+
+def test_partial_ratio_matches_fuzzywuzzy():
+    for keyword, title in seeded_pairs(8000, seed=3):
+        assert partial_ratio(keyword, title) == fuzz.partial_ratio(keyword, title), (keyword, title)
+
+
+def test_partial_ratio_matches_fuzzywuzzy_without_cydifflib(monkeypatch):
+    monkeypatch.setattr(similarity, "SequenceMatcher", difflib.SequenceMatcher)
+    for keyword, title in seeded_pairs(2000, seed=6) + EDGE_PAIRS:
+        assert partial_ratio(keyword, title) == fuzz.partial_ratio(keyword, title), (keyword, title)
+
+
+def test_partial_ratio_matches_fuzzywuzzy_on_long_strings():
+    for keyword, title in seeded_pairs(300, seed=5):
+        keyword, title = keyword * 15, title * 25
+        assert partial_ratio(keyword, title) == fuzz.partial_ratio(keyword, title), (keyword, title)
+
+
+def test_engine_matches_per_pair_scores():
+    pairs = seeded_pairs(5000, seed=4)
+    keywords = [keyword.upper() if i % 7 == 0 else keyword for i, (keyword, _) in enumerate(pairs)]
+    titles = [title for _, title in pairs]
+    expected = [calculate_similarity_weight(title, keyword) for keyword, title in zip(keywords, titles)]
+
+    engine = SimilarityEngine("fuzzywuzzy")
+    assert engine.score_pairs(keywords, titles).tolist() == expected
+    # Second pass comes from the cache
+    assert engine.score_pairs(keywords, titles).tolist() == expected
+    assert engine.stats["hits"] > 0
+
+
+def test_engine_keeps_argument_order_of_equally_long_strings():
+    keywords = ["abc", "the cake", "ab ba"]
+    titles = ["cab", "cake the", "ba ab"]
+    expected = [calculate_similarity_weight(title, keyword) for keyword, title in zip(keywords, titles)]
+
+    assert SimilarityEngine("fuzzywuzzy").score_pairs(keywords, titles).tolist() == expected
@@ -0,0 +1,63 @@
+from sinks import BufferedSink
+
+import sinks
+import threading
+import time
+
+
+def test_timed_flush_writes_a_partial_batch():
+    written = []
+    flushed = threading.Event()
+    sink = BufferedSink(lambda batch: (written.extend(batch), flushed.set()), batch_size=100, flush_interval=0.1)
+
+    sink.add("row")
+
+    assert flushed.wait(2)
+    assert written == ["row"]
+    sink.close()
+
+
+def test_idle_flush_thread_does_not_spin():
+    sink = BufferedSink(lambda batch: None, batch_size=100, flush_interval=0)
+    sink.add("row")
+
+    started = time.process_time()
+    time.sleep(0.5)
+    busy = time.process_time() - started
+
+    assert len(sink) == 0
+    assert busy < 0.1
+    sink.close()
+
+
+def test_close_stops_the_flush_thread():
+    sink = BufferedSink(lambda batch: None, batch_size=100, flush_interval=60)
+    sink.add("row")
+
+    sink.close()
+    sink._timer.join(1)
+
+    assert not sink._timer.is_alive()
+    assert sink.stats["rows_written"] == 1
+
+
+def test_keyword_sink_plans_revisits_from_inserted_keywords(monkeypatch):
+    stored = {("old", "@a")}
+    completed = []
+
+    def insert(rows):
+        new = {(term, "@" + handle.strip("@")) for term, handle, *_ in rows} - stored
+        stored.update(new)
+        return len(new)
+
+    monkeypatch.setattr(sinks, "add_null_keywords", insert)
+    monkeypatch.setattr(sinks, "complete_channels", completed.extend)
+    sink = sinks.KeywordSink(batch_size=100, flush_interval=60)
+
+    for row in [("old", "a"), ("new", "a"), ("new", "@b"), ("other", "b")]:
+        sink.add(row)
+    sink.complete_after_flush("@a", plan=lambda inserted: inserted)
+    sink.complete_after_flush("b", plan=lambda inserted: inserted)
+    sink.close()
+
+    assert completed == [("@a", None, None, 1), ("b", None, None, 2)]
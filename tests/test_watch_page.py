@@ -0,0 +1,88 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from conftest import FIXTURES
+
+import threading
+import pytest
+
+import watch_page
+from watch_page import fetch_video_keywords, parse_watch_keywords
+
+
+# Video id -> saved watch page served by the local stand-in
+VIDEOS = {
+    "aqz-KE-bpKQ": "watch_keywords.html",
+    "untagged001": "watch_no_tags.html",
+    "metaonly001": "watch_meta_only.html",
+    "malformed01": "watch_malformed.html",
+    "unavailabl1": "watch_unavailable.html",
+}
+
+
+class WatchHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        name = VIDEOS.get(parse_qs(url.query).get("v", [""])[0]) if url.path == "/watch" else None
+        if name is None:
+            self.send_error(404)
+            return
+        body = (FIXTURES / name).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def watch_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WatchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(watch_page, "youtube_url", lambda path: base_url + path)
+        yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_keywords_from_player_response(fixture_text):
+    keywords = parse_watch_keywords(fixture_text("watch_keywords.html"))
+    assert keywords == ["python", "python tutorial", "learn python", "programming"]
+
+
+def test_video_without_tags_is_empty(fixture_text):
+    assert parse_watch_keywords(fixture_text("watch_no_tags.html")) == []
+
+
+def test_keywords_from_meta_tag(fixture_text):
+    assert parse_watch_keywords(fixture_text("watch_meta_only.html")) == ["rock & roll", "guitar lesson", "music"]
+
+
+def test_malformed_player_response_is_none(fixture_text):
+    # None makes the scraper fall back to opening the video in the browser
+    assert parse_watch_keywords(fixture_text("watch_malformed.html")) is None
+
+
+def test_page_without_video_details_is_none(fixture_text):
+    assert parse_watch_keywords(fixture_text("watch_unavailable.html")) is None
+
+
+@pytest.mark.parametrize("video, expected", [
+    ("aqz-KE-bpKQ", ["python", "python tutorial", "learn python", "programming"]),
+    ("/watch?v=aqz-KE-bpKQ", ["python", "python tutorial", "learn python", "programming"]),
+    ("untagged001", []),
+    ("metaonly001", ["rock & roll", "guitar lesson", "music"]),
+    ("malformed01", None),
+    ("unavailabl1", None),
+    ("missing0001", None),
+])
+def test_fetch_video_keywords(watch_server, video, expected):
+    assert fetch_video_keywords(video) == expected
+
+
+def test_fetch_path_with_extra_parameters(watch_server):
+    assert fetch_video_keywords("/watch?v=metaonly001&t=10s") == ["rock & roll", "guitar lesson", "music"]
@@ -0,0 +1,82 @@
+from yt_data import extract_json_variable, parse_channel_info, parse_channel_videos, parse_search_results, parse_ytcfg
+
+
+def test_search_results_in_page_order(fixture_text):
+    data = extract_json_variable(fixture_text("search_page.html"), "ytInitialData")
+    results = parse_search_results(data)
+
+    # Ads, channels and shelves are skipped; later sections are still read
+    assert [result.video_id for result in results] == ["aqz-KE-bpKQ", "kqtD5dpn9C8", "rfscVS0vtbw"]
+
+    first = results[0]
+    assert first.title == "Python Tutorial for Beginners - Full Course"
+    assert first.views_text == "12M views"
+    assert first.published_text == "2 years ago"
+    assert first.duration_text == "4:26:52"
+    assert first.channel_name == "Code Academy"
+    assert first.channel_id == "UC8butISFwT-Wl7EV0hUK0BQ"
+    assert first.channel_handle == "@codeacademy"
+
+
+def test_search_result_handle_is_unquoted(fixture_text):
+    data = extract_json_variable(fixture_text("search_page.html"), "ytInitialData")
+    assert parse_search_results(data)[1].channel_handle == "@tinyéchannel"
+
+
+def test_search_results_of_other_pages_are_empty(fixture_text):
+    data = extract_json_variable(fixture_text("channel_page.html"), "ytInitialData")
+    assert parse_search_results(data) == []
+
+
+def test_channel_info_page_header(fixture_text):
+    data = extract_json_variable(fixture_text("channel_page.html"), "ytInitialData")
+    info = parse_channel_info(data)
+
+    assert info.title == "Tiny Channel"
+    assert info.handle == "@tinychannel"
+    assert info.channel_id == "UCtiny"
+    assert info.subscribers_text == "1.23K subscribers"
+
+
+def test_channel_info_c4_header(fixture_json):
+    info = parse_channel_info(fixture_json("channel_c4.json"))
+
+    assert info.title == "Old Layout"
+    assert info.handle == "@oldlayout"
+    assert info.subscribers_text == "345 subscribers"
+
+
+def test_channel_info_of_other_pages_is_none(fixture_text):
+    data = extract_json_variable(fixture_text("search_page.html"), "ytInitialData")
+    assert parse_channel_info(data) is None
+
+
+def test_channel_videos_first_page(fixture_text):
+    data = extract_json_variable(fixture_text("channel_videos.html"), "ytInitialData")
+    videos, token = parse_channel_videos(data)
+
+    # Items without a videoRenderer (shorts) are skipped
+    assert [video.video_id for video in videos] == ["vid00000001", "vid00000002", "vid00000003"]
+    assert videos[0].title == "Newest upload"
+    assert videos[0].video_url == "/watch?v=vid00000001"
+    assert videos[0].views_text == "1,204 views"
+    assert videos[0].published_text == "3 hours ago"
+    assert token == "videos-page-2"
+
+
+def test_channel_videos_last_continuation(fixture_json):
+    videos, token = parse_channel_videos(fixture_json("browse_continuation.json"))
+
+    assert [video.video_id for video in videos] == ["vid00000004", "vid00000005"]
+    assert token is None
+
+
+def test_ytcfg(fixture_text):
+    config = parse_ytcfg(fixture_text("channel_videos.html"))
+    assert config["INNERTUBE_API_KEY"] == "AIzaTestKey"
+    assert config["INNERTUBE_CONTEXT"]["client"]["clientName"] == "WEB"
+
+
+def test_missing_or_malformed_initial_data():
+    assert extract_json_variable("<html><body>no data</body></html>", "ytInitialData") is None
+    assert extract_json_variable('<script>var ytInitialData = {"contents": [1, 2</script>', "ytInitialData") is None
@@ -2,26 +2,83 @@
 from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
 from selenium import webdriver
-import json
+from settings import get_config
+from urllib.parse import quote
 import time
 
 
-def load_config(config_path: str):
-    with open(config_path, 'r') as file:
-        config = json.load(file)
-    return config
+# Hosts lean mode never loads: thumbnails and avatars, video streams, fonts, ads and telemetry
+LEAN_BLOCKED_HOSTS = (
+    "i.ytimg.com", "i9.ytimg.com", "yt3.ggpht.com", "yt3.googleusercontent.com", "googlevideo.com",
+    "fonts.gstatic.com", "fonts.googleapis.com",
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "googletagservices.com",
+    "google-analytics.com", "googletagmanager.com", "ad.youtube.com", "play.google.com", "jnn-pa.googleapis.com",
+)
 
+# Preferences that stop Firefox from loading or playing anything but the page's text and scripts
+LEAN_PREFERENCES = {
+    "permissions.default.image": 2,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.autoplay.block-webaudio": True,
+    "gfx.downloadable_fonts.enabled": False,
+    "browser.display.use_document_fonts": 0,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "toolkit.telemetry.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+}
 
-def start_firefox() -> webdriver.Firefox:
-    config = load_config('config.json')
-    geckodriver_path = config['Geckodriver Path']
-    firefox_profile_path = config['Firefox Profile']
+# Returns how long the current page took to load and how much it transferred, from the
+# Navigation and Resource Timing entries. Cross-origin resources without Timing-Allow-Origin
+# report a transferSize of 0, so their bytes are missing (they are still counted as requests).
+PAGE_TRANSFER_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = navigation ? navigation.transferSize : 0;
+for (const entry of resources) { bytes += entry.transferSize || 0; }
+return {
+    load_seconds: navigation ? navigation.loadEventEnd / 1000 : 0,
+    bytes: bytes,
+    requests: resources.length + 1,
+};
+"""
+
+
+def lean_pac_script(blocked_hosts: tuple[str, ...] = LEAN_BLOCKED_HOSTS) -> str:
+    """
+    Returns a proxy auto-config script that sends requests to the blocked hosts (and their
+    subdomains) to a closed local port, so they fail at once, and everything else direct.
+    """
+    conditions = " || ".join(f'host == "{host}" || dnsDomainIs(host, ".{host}")' for host in blocked_hosts)
+    return (f"function FindProxyForURL(url, host) {{ if ({conditions}) {{ return \"PROXY 127.0.0.1:9\"; }} "
+            f"return \"DIRECT\"; }}")
+
+
+def start_firefox(lean: bool | None = None) -> webdriver.Firefox:
+    """
+    Starts Firefox with a copy of the configured profile.
+
+    In lean mode (Lean_Mode, unless `lean` says otherwise) images, autoplay and web fonts
+    are disabled and thumbnail, video, ad and telemetry hosts are blocked, since the
+    scraper only reads text.
+    """
+    config = get_config()
+    geckodriver_path = config.geckodriver_path
+    firefox_profile_path = config.firefox_profile
 
     profile = webdriver.FirefoxProfile(firefox_profile_path)
 
     options = Options()
     options.profile = profile
 
+    if config.lean_mode if lean is None else lean:
+        for name, value in LEAN_PREFERENCES.items():
+            options.set_preference(name, value)
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference("network.proxy.autoconfig_url", "data:text/javascript," + quote(lean_pac_script()))
+
     service = Service(geckodriver_path)
 
     driver = webdriver.Firefox(
@@ -32,6 +89,13 @@ def start_firefox() -> webdriver.Firefox:
     return driver
 
 
+def page_transfer(driver: webdriver.Firefox) -> dict:
+    """
+    Returns the load time (seconds), bytes transferred and request count of the current page.
+    """
+    return driver.execute_script(PAGE_TRANSFER_SCRIPT)
+
+
 def store_report(keywords_analysed, keywords_found, channels_analysed, channels_found, time_started):
     """
         Storing details in reports.md file
@@ -0,0 +1,52 @@
+from yt_data import extract_json_variable
+from http_client import fetch_text, youtube_url
+
+import html as html_lib
+import re
+
+
+_META_KEYWORDS = re.compile(r'<meta\s+name="keywords"\s+content="([^"]*)"', re.IGNORECASE)
+
+
+def parse_watch_keywords(html: str) -> list[str] | None:
+    """
+    Parses the tags of a video out of its watch page source.
+
+    Reads videoDetails.keywords from ytInitialPlayerResponse, falling back to the
+    <meta name="keywords"> tag (which joins the tags with commas).
+
+    Args:
+        html (str): The watch page source.
+
+    Returns:
+        list[str] | None: The tags (possibly empty), or None if the page holds neither source.
+    """
+    player = extract_json_variable(html, "ytInitialPlayerResponse")
+    if player and isinstance(player.get("videoDetails"), dict):
+        return [keyword.strip() for keyword in player["videoDetails"].get("keywords", []) if keyword.strip()]
+
+    match = _META_KEYWORDS.search(html)
+    if match:
+        content = html_lib.unescape(match.group(1))
+        return [keyword.strip() for keyword in content.split(',') if keyword.strip()]
+
+    return None
+
+
+def fetch_video_keywords(video: str) -> list[str] | None:
+    """
+    Fetches a watch page over HTTP and returns the tags of the video.
+
+    Args:
+        video (str): A video id, a "/watch?v=..." path or a full watch URL.
+
+    Returns:
+        list[str] | None: The tags, or None if the page could not be fetched or parsed.
+    """
+    if re.fullmatch(r'[\w-]{11}', video):
+        video = f"/watch?v={video}"
+
+    html = fetch_text(youtube_url(video))
+    if html is None:
+        return None
+    return parse_watch_keywords(html)
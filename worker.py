@@ -0,0 +1,296 @@
+from typing import Callable
+from termcolor import colored
+from selenium import webdriver
+from readiness import print_wait_summary, wait_for_search_results
+from serp_cache import SerpCache
+from sinks import KeywordSink, ObservationSink
+from pipeline import Pipeline
+from driver_pool import DriverPool
+from scheduler import Scheduler
+from revisit import Revisit, plan_revisit
+from priority import subscriber_growth
+from yt_keywords import *
+from database import *
+from youtube import *
+from settings import get_config
+
+import threading
+import metrics
+import time
+
+
+# counts key -> counter in metrics.registry
+FOUND_COUNTERS = {"keywords_found": "keywords_found_total", "channels_found": "channels_found_total"}
+
+
+class Heartbeat(threading.Thread):
+    """
+    Renews the leases of every job this worker holds until stopped, so only the jobs of
+    dead workers expire and get re-queued.
+    """
+
+    def __init__(self, interval: float, lease_seconds: int):
+        super().__init__(name="heartbeat", daemon=True)
+        # At least two beats per lease, so one slow beat does not let a lease lapse
+        self.interval = min(interval, lease_seconds / 2)
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                heartbeat(self.lease_seconds)
+            except Exception as e:
+                print(colored(f"⚠️  | Heartbeat failed: {e}", "red"))
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join(timeout=5)
+
+
+def driver_alive(driver: webdriver.Firefox) -> bool:
+    """
+    Returns False if the browser behind the driver has crashed or been closed.
+    """
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def process_keyword(keyword: str, driver: webdriver.Firefox, serp_cache: SerpCache,
+                    observation_sink: ObservationSink, pipeline: Pipeline, on_stored: Callable[[], None]) -> bool:
+    """
+    Searches a keyword on YouTube and hands its top results to the pipeline to be scored and stored.
+    Keywords scored recently (by any scraper) are filled in from the SERP cache without searching.
+
+    Parameters:
+        keyword (str): The keyword to analyse.
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
+        serp_cache (SerpCache): The cache of recently scored keywords.
+        observation_sink (ObservationSink): Receives the raw search results the scores are computed from.
+        pipeline (Pipeline): Scores and stores the keyword off the browser's thread.
+        on_stored (Callable[[], None]): Called on the persist stage once the scores are stored.
+
+    Returns:
+        bool: True if the keyword was searched or found in the cache, False if it could not be searched and was removed.
+    """
+    print(colored(f"✅  | Keyword selected: {keyword}", "green"))
+
+    cached = serp_cache.get(keyword)
+    if cached:
+        print(colored("✅  | Keyword found in cache...", "green"))
+
+        def store_cached() -> None:
+            update_keyword(keyword, *cached)
+            on_stored()
+
+        pipeline.persist_later("keyword", keyword, store_cached)
+        return True
+
+    for _ in range(3):
+        if keyword_search(keyword, driver):
+            break
+        metrics.inc("retries_total", stage="keyword_search")
+    else:
+        print(colored("❌  | Keyword not found", "red"))
+        pipeline.persist_later("keyword", keyword, lambda: remove_keyword(keyword))
+        return False
+
+    wait_for_search_results(driver)
+    print(colored("⏳  | Analyzing Keyword...", "yellow"))
+    channels: list[tuple[str, int]] = []
+    observations = collect_keyword_observations(keyword, driver, lambda *channel: channels.append(channel))
+    pipeline.persist_later("keyword", keyword, lambda: mark_scraped("keyword", keyword))
+
+    def store(scores: list) -> None:
+        volume, competition, recency = scores
+        for channel_id, subscribers in channels:
+            add_channel_to_db(channel_id, subscribers)
+        observation_sink.add_scrape(observations)
+        update_keyword(keyword, volume, competition, recency)
+        serp_cache.put(keyword, volume, competition, recency)
+        on_stored()
+
+    pipeline.score_then_persist("keyword", keyword, lambda: score_keyword_observations(keyword, observations), store)
+    print(colored("✅  | Keyword scraped, queued for scoring...", "green"))
+    return True
+
+
+def process_channel(channel: str, driver: webdriver.Firefox, keyword_sink: KeywordSink, pipeline: Pipeline,
+                    on_stored: Callable[[], None]) -> bool:
+    """
+    Opens a channel, reads its subscriber count and the keywords of its recent videos, and
+    hands them to the pipeline to be stored.
+
+    Parameters:
+        channel (str): The handle of the channel.
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
+        keyword_sink (KeywordSink): The sink new keywords are written to.
+        pipeline (Pipeline): Stores the channel off the browser's thread.
+        on_stored (Callable[[], None]): Called on the persist stage once the channel is stored.
+
+    Returns:
+        bool: True if the channel was scraped, False if it could not be found and was removed.
+    """
+    print(colored(f"✅  | Channel selected: {channel}", "green"))
+
+    for _ in range(3):
+        if search_youtube_channel(channel, driver):
+            break
+        metrics.inc("retries_total", stage="channel_search")
+        print(colored(f"⏳  | Searching YouTube for channel...", "yellow"))
+    else:
+        print(colored("❌  | Channel not found", "red"))
+        pipeline.persist_later("channel", channel, lambda: remove_channel(channel))
+        return False
+
+    channel_subs = get_channel_subs(driver)
+    print(colored(f"✅  | Subscribers: {channel_subs}", "green"))
+
+    print(colored("⏳  | Scraping videos...", "yellow"))
+    known_video_id, known_upload_date = get_channel_high_water(channel)
+    video_data = get_channel_videos(driver, known_video_id, known_upload_date)
+
+    def store() -> None:
+        growth = subscriber_growth(*get_channel_previous_subs(channel), channel_subs)
+        update_channel(channel, channel_subs)
+        mark_scraped("channel", channel)
+        for videos in video_data:
+            keywords = videos.get("keywords")
+            keyword_sink.extend((keyword, channel, channel_subs, growth) for keyword in keywords)
+
+        previous = get_channel_revisit(channel)
+
+        def plan(inserted: int) -> Revisit:
+            # Runs once the channel's keywords are written, with the number that were new
+            revisit = plan_revisit(*previous, len(video_data), inserted)
+            print(colored(f"📅  | {channel}: {len(video_data)} new videos, {inserted} new keywords, "
+                          f"next visit {revisit.next_visit_at:%Y-%m-%d %H:%M}", "cyan"))
+            return revisit
+
+        if video_data:
+            newest = video_data[0]
+            keyword_sink.complete_after_flush(channel, newest["video_id"] or None, newest["earliest_upload"], plan)
+        else:
+            keyword_sink.complete_after_flush(channel, plan=plan)
+        on_stored()
+
+    pipeline.persist_later("channel", channel, store)
+    print(colored("✅  | Videos scraped, keywords queued", "green"))
+    return True
+
+
+def run_worker(drivers: DriverPool, counts: dict[str, int], stop_event: threading.Event | None = None,
+               on_progress: Callable[[str, int], None] | None = None, predecessor_pid: int | None = None) -> None:
+    """
+    Processes keywords and channels, interleaved by a Scheduler, until there is no work left
+    or `stop_event` is set.
+
+    The browser runs on this thread; scoring and database writes run on the stages of a
+    Pipeline, so they overlap with the next job. Every keyword and channel is recorded as
+    a metrics job; the metrics file is rewritten as the worker goes. Jobs this worker's slot
+    left unfinished in an earlier run are resumed first: at once from `predecessor_pid`,
+    otherwise once their heartbeats stop. A job that raises is marked failed (and retried later, up to Max_Attempts)
+    and the worker moves on; if the browser died, it is replaced first. Between jobs the
+    driver pool closes stray windows and recycles bloated browsers.
+
+    Parameters:
+        drivers (DriverPool): The browsers owned by this worker.
+        counts (dict[str, int]): Updated in place with "keywords_analysed", "channels_analysed",
+            "keywords_found" and "channels_found".
+        stop_event (threading.Event | None): Checked between jobs to drain gracefully.
+        on_progress (Callable[[str, int], None] | None): Called with a counts key and the amount it grew by.
+        predecessor_pid (int | None): The pid of the dead worker this one replaces, whose jobs it takes over.
+    """
+    config = get_config()
+    keyword_sink = KeywordSink(config.keyword_batch_size, config.keyword_flush_seconds)
+    observation_sink = ObservationSink(config.keyword_batch_size, config.keyword_flush_seconds)
+    serp_cache = SerpCache(config.serp_cache_ttl_hours, config.serp_cache_max_entries)
+    pipeline = Pipeline(config.pipeline_queue_size).start()
+    time_start = time.time()
+    found_reported = {key: metrics.registry.total(counter) for key, counter in FOUND_COUNTERS.items()}
+
+    def progress(key: str, amount: int = 1) -> None:
+        counts[key] = counts.get(key, 0) + amount
+        if on_progress:
+            on_progress(key, amount)
+
+    def report_found() -> None:
+        for key, counter in FOUND_COUNTERS.items():
+            total = metrics.registry.total(counter)
+            if total > found_reported[key]:
+                progress(key, int(total - found_reported[key]))
+                found_reported[key] = total
+
+    beat = Heartbeat(config.heartbeat_seconds, config.lease_seconds)
+    # Two missed beats: the process that claimed the job is gone
+    resumed_keywords, resumed_channels = resume_claims(config.lease_seconds, 2 * beat.interval + 5, predecessor_pid)
+    if resumed_keywords or resumed_channels:
+        print(colored(f"♻️  | Resuming {resumed_keywords} keywords and {resumed_channels} channels", "cyan"))
+    beat.start()
+
+    def refill() -> bool:
+        if not (pipeline.pending() or len(keyword_sink)):
+            return False
+        # Make the queued and buffered channel keywords visible before falling back to channels
+        pipeline.drain()
+        keyword_sink.flush()
+        return True
+
+    scheduler = Scheduler(config.keyword_channel_ratio, refill)
+
+    def attempt(kind: str, key: str, process: Callable[[], bool], job: metrics.Job) -> None:
+        start_job(kind, key)
+        try:
+            if not process():
+                job.outcome = "removed"
+        except Exception as e:
+            job.outcome = "failed"
+            fail_job(kind, key)
+            print(colored(f"❌  | Failed to process {kind} {key}: {e}", "red"))
+            if not driver_alive(driver):
+                drivers.recycle("crashed")
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            print(colored("-"*50, "white"))
+            driver = drivers.checkpoint()
+            scheduled = scheduler.next_job()
+            if scheduled is None:
+                print(colored("🚫  | No keyword or channel found", "red"))
+                break
+            kind, key = scheduled
+
+            if kind == "keyword":
+                with metrics.job("keyword", key) as job:
+                    attempt("keyword", key,
+                            lambda: process_keyword(key, driver, serp_cache, observation_sink, pipeline,
+                                                    lambda: progress("keywords_analysed")), job)
+
+            else:
+                with metrics.job("channel", key) as job:
+                    attempt("channel", key,
+                            lambda: process_channel(key, driver, keyword_sink, pipeline,
+                                                    lambda: progress("channels_analysed")), job)
+
+            report_found()
+            metrics.export()
+
+            time_end = time.time()
+            print(colored(f"🕒  | Time running: {time_end - time_start:.2f} seconds", "yellow"))
+
+    finally:
+        # Store everything already scraped before the leases are released
+        pipeline.close()
+        beat.stop()
+        keyword_sink.close()
+        observation_sink.close()
+        release_claims()
+        report_found()
+        metrics.export(force=True)
+        print_wait_summary()
+        serp_cache.print_summary()
+        pipeline.print_summary()
+        drivers.print_summary()
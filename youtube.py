@@ -7,11 +7,18 @@ from selenium.webdriver.common.by import By
 from datetime import datetime, timedelta
 from selenium import webdriver
 from termcolor import colored
-from utils import load_config
-from typing import Any
+from readiness import scroll_for_more_videos, wait_for_watch_page
+from yt_data import ChannelVideo, channel_info, extract_channel_videos, get_initial_data, invalidate
+from channel_pager import ChannelPager
+from watch_page import fetch_video_keywords
+from http_client import youtube_url
+from urllib.parse import quote
+from settings import get_config
+from parsing import parse_count, parse_earliest_upload_date, parse_upload_date, parse_views
+from typing import Any, Iterator
 
 import pyperclip
-import time
+import metrics
 
 
 def search_youtube_channel(channel: str, driver: webdriver.Firefox) -> bool:
@@ -28,7 +35,9 @@ def search_youtube_channel(channel: str, driver: webdriver.Firefox) -> bool:
     channel = channel.strip("@")
 
     try:
-        driver.get(f"https://www.youtube.com/@{channel}/videos")
+        with metrics.timed("navigation_seconds", page="channel"):
+            driver.get(youtube_url(f"/@{quote(channel)}/videos"))
+        invalidate(driver)
         return True
 
     except:
@@ -45,128 +54,128 @@ def get_channel_subs(driver: webdriver.Firefox) -> int:
     Returns:
         int: The number of subscribers for the channel. Returns 0 if an error occurs.
     """
-    config = load_config('config.json')
-    wait = WebDriverWait(driver, config["Timeout"])
+    config = get_config()
+    wait = WebDriverWait(driver, config.timeout)
 
     try:
-        subscribers_element = wait.until(ec.presence_of_element_located(
-            (By.XPATH,
-             '/html/body/ytd-app/div[1]/ytd-page-manager/ytd-browse/div[3]/ytd-tabbed-page-header/tp-yt-app-header-layout/div/tp-yt-app-header/div[2]/div/div[2]/yt-page-header-renderer/yt-page-header-view-model/div/div[1]/div/yt-content-metadata-view-model/div[2]/span[1]')
-        ))
-
-        subscribers = str(subscribers_element.text).replace("subscribers", "").strip()
-
-        if 'K' in subscribers:
-            return int(float(subscribers.replace('K', '')) * 1000)
-        elif 'M' in subscribers:
-            return int(float(subscribers.replace('M', '')) * 1000000)
+        info = channel_info(driver)
+        if info and info.subscribers_text:
+            subscribers_text = info.subscribers_text
         else:
-            return int(subscribers)
+            subscribers_element = wait.until(ec.presence_of_element_located(
+                (By.XPATH,
+                 '/html/body/ytd-app/div[1]/ytd-page-manager/ytd-browse/div[3]/ytd-tabbed-page-header/tp-yt-app-header-layout/div/tp-yt-app-header/div[2]/div/div[2]/yt-page-header-renderer/yt-page-header-view-model/div/div[1]/div/yt-content-metadata-view-model/div[2]/span[1]')
+            ))
+            subscribers_text = subscribers_element.text
+
+        return parse_count(str(subscribers_text)) or 0
 
     except Exception as e:
         return 0
 
 
-def get_channel_videos(driver: webdriver.Firefox) -> list[dict]:
+def scrolled_channel_videos(driver: webdriver.Firefox) -> Iterator[ChannelVideo]:
     """
-    Retrieves a list of video data from a YouTube channel.
-
-    This function clicks on the "Videos" tab, scrapes video titles, views, and dates,
-    and extracts keywords from each video. It continues to load more videos until
-    it encounters a video older than two months.
-
-    Parameters:
-        driver (webdriver): A WebDriver instance used to interact with the YouTube page.
-
-    Returns:
-        list[dict]: A list of dictionaries containing video data, including title, views,
-        upload date, and keywords. If an error occurs, an empty list is returned.
+    Yields the videos of the channel grid the driver is on, reading only the newly appended
+    ones after every scroll, until the end of the channel.
     """
+    offset = 0
+    while True:
+        videos = extract_channel_videos(driver, offset)
+        offset += len(videos)
+        yield from videos
 
-    video_data: list[dict[str, Any]] = []
-    config = load_config("config.json")
-    try:
-        two_months_ago = datetime.now() - timedelta(days=config["Days"])
-
-        while True:
-            # Scrape video titles, views, and dates
-            video_titles = driver.find_elements(By.XPATH, '//*[@id="video-title"]')
-            video_views = driver.find_elements(By.XPATH, '//*[@id="metadata-line"]/span[1]')
-            video_dates = driver.find_elements(By.XPATH, '//*[@id="metadata-line"]/span[2]')
-
-            for title, views, date in zip(video_titles, video_views, video_dates):
-                upload_date = parse_upload_date(date.text)
-                if upload_date and upload_date < two_months_ago:
-                    return video_data
-
-                view = views.text.strip("views").strip("view").strip()
-                if 'K' in view:
-                    view = int(float(views.replace('K', '')) * 1000)
-                elif 'M' in view:
-                    view = int(float(views.replace('M', '')) * 1000000)
-                else:
-                    try:
-                        view = int(view)
-                    except:
-                        view = 0
-
-                # Open the video in a new tab, extract keywords, and close the tab
-                extracted_data = open_video(driver, title.text)
-                video_data.append({
-                    "title": title.text,
-                    "views": views.text,
-                    "upload_date": date.text,
-                    "keywords": extracted_data.get("keywords", [])  # Add only the keywords
-                })
-
-            # Scroll down to load more videos
-            driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-            time.sleep(3)
-
-    except Exception as e:
-        print(f"Error: {e}")
-        return video_data
+        # Scroll down to load more videos, stopping at the end of the channel
+        if not scroll_for_more_videos(driver):
+            return
 
 
-def parse_upload_date(date_str: str) -> datetime | None:
+def channel_video_source(driver: webdriver.Firefox) -> Iterator[ChannelVideo]:
     """
-    Parse a string representing the time ago and return a datetime object representing the time.
+    Yields the videos of the channel the driver is on, newest first.
 
-    Args:
-        date_str (str): A string representing the time ago, such as "2 days ago", "1 month ago", etc.
-
-    Returns:
-        datetime | None: A datetime object representing the time if the string is in the correct format, None otherwise.
+    With Channel_Paging "continuation" the videos are paged as JSON from the browse
+    endpoint (see channel_pager.py); if the page carries no parseable grid, or a
+    continuation fails, the rest is read by scrolling. "scroll" always scrolls. Every
+    video is yielded once: the grid is scrolled from the top, so videos the pager already
+    yielded are skipped.
     """
+    yielded: set[str] = set()
+    if get_config().channel_paging == "continuation":
+        pager = ChannelPager.from_driver(driver, get_initial_data(driver))
+        if pager.videos:
+            for video in pager:
+                if video.video_id:
+                    yielded.add(video.video_id)
+                yield video
+            if not pager.failed:
+                return
+        metrics.inc("retries_total", stage="channel_paging_scroll")
+
+    for video in scrolled_channel_videos(driver):
+        if video.video_id not in yielded:
+            yield video
+
+
+def get_channel_videos(driver: webdriver.Firefox, known_video_id: str | None = None,
+                       known_upload_date: datetime | None = None) -> list[dict]:
+    """
+    Retrieves a list of video data from a YouTube channel.
 
-    date_str = date_str.lower()
-
-    if "seconds ago" in date_str or "second ago" in date_str:
-        seconds = int(date_str.split()[0])
-        return datetime.now() - timedelta(seconds=seconds)
-
-    elif "minutes ago" in date_str or "minute ago" in date_str:
-        minutes = int(date_str.split()[0])
-        return datetime.now() - timedelta(minutes=minutes)
-
-    elif "days ago" in date_str or "day ago" in date_str:
-        days = int(date_str.split()[0])
-        return datetime.now() - timedelta(days=days)
+    Videos come from channel_video_source (continuation paging or incremental scrolling),
+    and video ids already seen in this crawl are skipped (videos whose id could not be read are all kept). Loading stops at the first video
+    older than `Days`, and at the first video known from the previous visit (the channel's
+    high-water mark), since the grid is newest first.
 
-    elif "weeks ago" in date_str or "week ago" in date_str:
-        weeks = int(date_str.split()[0])
-        return datetime.now() - timedelta(weeks=weeks)
+    Parameters:
+        driver (webdriver): A WebDriver instance used to interact with the YouTube page.
+        known_video_id (str | None): The newest video id stored on the previous visit.
+        known_upload_date (datetime | None): The earliest upload time of that video, used when it was deleted.
 
-    elif "months ago" in date_str or "month ago" in date_str:
-        months = int(date_str.split()[0])
-        return datetime.now() - timedelta(days=months * 30)
+    Returns:
+        list[dict]: A list of dictionaries containing video data, including video id, title,
+        views, upload date, and keywords, newest first.
 
-    elif "years ago" in date_str or "year ago" in date_str:
-        years = int(date_str.split()[0])
-        return datetime.now() - timedelta(days=years * 365)
+    Raises:
+        WebDriverException: If the grid cannot be read or scrolled; the channel is then retried
+        instead of being stored with a partial crawl.
+    """
 
-    else:
-        return None
+    video_data: list[dict[str, Any]] = []
+    config = get_config()
+    two_months_ago = datetime.now() - timedelta(days=config.days)
+    seen: set[str] = set()
+
+    for video in channel_video_source(driver):
+        if video.video_id:
+            if video.video_id in seen:
+                continue
+            seen.add(video.video_id)
+
+        upload_date = parse_upload_date(video.published_text)
+        if upload_date and upload_date < two_months_ago:
+            return video_data
+        if known_video_id and video.video_id == known_video_id:
+            metrics.inc("channel_high_water_stops_total")
+            return video_data
+        # The parsed date is the latest this video can have been uploaded; before the
+        # earliest upload of the known video, it is certainly older
+        if known_upload_date and upload_date and upload_date < known_upload_date:
+            metrics.inc("channel_high_water_stops_total")
+            return video_data
+
+        # Fetch the video's watch page (or open it in a new tab) and extract keywords
+        extracted_data = open_video(driver, video.title, video.video_url or None)
+        video_data.append({
+            "video_id": video.video_id,
+            "title": video.title,
+            "views": parse_views(video.views_text),
+            "upload_date": video.published_text,
+            "earliest_upload": parse_earliest_upload_date(video.published_text),
+            "keywords": extracted_data.get("keywords", [])  # Add only the keywords
+        })
+
+    return video_data
 
 
 def extract_from_clipboard() -> str:
@@ -194,11 +203,11 @@ def extract_keywords(driver) -> dict:
     Returns:
         dict: A dictionary containing the extracted keywords. The dictionary has a single key "keywords" which is a list of strings.
     """
-    config = load_config('config.json')
+    config = get_config()
     keywords_button_xpath = '/html/body/ytd-app/div[1]/ytd-page-manager/ytd-watch-flexy/div[5]/div[2]/div[1]/div/div[8]/div[2]/div/div[1]/div[2]'
     expand_button_xpath = '/html/body/ytd-app/div[1]/ytd-page-manager/ytd-watch-flexy/div[5]/div[2]/div[1]/div/div[1]/div[2]'
 
-    wait = WebDriverWait(driver, config["Timeout"])
+    wait = WebDriverWait(driver, config.timeout)
 
     try:
         keywords_button = wait.until(ec.element_to_be_clickable((By.XPATH, keywords_button_xpath)))
@@ -225,25 +234,38 @@ def extract_keywords(driver) -> dict:
     return {"keywords": []}
 
 
-def open_video(driver: webdriver.Firefox, video_title) -> dict:
+def open_video(driver: webdriver.Firefox, video_title, video_url: str | None = None) -> dict:
     """
-    Opens a video in a new browser window, extracts its keywords, and returns the extracted data.
+    Extracts the keywords of a video and returns the extracted data.
+
+    The watch page is fetched over HTTP when its URL is known. The video is only opened
+    in a new browser window when that fails.
 
     Args:
         driver (webdriver.Firefox): The Firefox webdriver instance used to interact with the browser.
         video_title (str): The title of the video to be opened.
+        video_url (str | None): The link of the video, if known.
 
     Returns:
         dict: A dictionary containing the extracted keywords.
     """
+    if video_url:
+        with metrics.timed("keyword_extraction_seconds", source="http"):
+            keywords = fetch_video_keywords(video_url)
+        if keywords is not None:
+            return {"keywords": keywords}
+        metrics.inc("retries_total", stage="watch_keywords_browser")
+
     try:
         video_element = driver.find_element(By.LINK_TEXT, video_title)
-        video_element.send_keys(Keys.CONTROL + Keys.RETURN)
+        with metrics.timed("navigation_seconds", page="watch"):
+            video_element.send_keys(Keys.CONTROL + Keys.RETURN)
 
-        driver.switch_to.window(driver.window_handles[-1])
-        time.sleep(5)
+            driver.switch_to.window(driver.window_handles[-1])
+            wait_for_watch_page(driver)
 
-        extracted_data = extract_keywords(driver)
+        with metrics.timed("keyword_extraction_seconds", source="clipboard"):
+            extracted_data = extract_keywords(driver)
 
         driver.close()
         driver.switch_to.window(driver.window_handles[0])
@@ -0,0 +1,455 @@
+from dataclasses import dataclass
+from selenium import webdriver
+from urllib.parse import unquote
+from typing import Any, Iterator
+
+import metrics
+import json
+import re
+
+
+_JSON_VARIABLE = r'(?:var\s+{name}|window\[["\']{name}["\']\]|{name})\s*=\s*'
+_decoder = json.JSONDecoder()
+
+
+@dataclass
+class SearchResult:
+    """
+    One video of a search results page, as found in ytInitialData.
+    """
+    title: str
+    video_id: str
+    views_text: str
+    published_text: str
+    duration_text: str
+    channel_name: str
+    channel_url: str
+    channel_id: str
+    subscribers_text: str = ""
+
+    @property
+    def channel_handle(self) -> str:
+        """
+        The "@handle" of the channel if its URL contains one, otherwise an empty string.
+        """
+        if self.channel_url.startswith("/@"):
+            return unquote(self.channel_url[1:].split("/")[0].split("?")[0])
+        return ""
+
+
+@dataclass
+class ChannelVideo:
+    """
+    One video of a channel's videos tab, as rendered in the grid.
+    """
+    video_id: str
+    title: str
+    video_url: str
+    views_text: str
+    published_text: str
+
+
+@dataclass
+class ChannelInfo:
+    """
+    The header of a channel page, as found in ytInitialData.
+    """
+    title: str
+    handle: str
+    channel_id: str
+    subscribers_text: str
+
+
+def extract_json_variable(html: str, name: str) -> dict | None:
+    """
+    Extracts a JSON object assigned to a JavaScript variable in an HTML page.
+
+    Args:
+        html (str): The page source.
+        name (str): The variable name, e.g. "ytInitialData".
+
+    Returns:
+        dict | None: The decoded object, or None if it is missing or malformed.
+    """
+    for match in re.finditer(_JSON_VARIABLE.format(name=re.escape(name)), html):
+        start = match.end()
+        if html.startswith("{", start):
+            try:
+                data, _ = _decoder.raw_decode(html, start)
+                return data
+            except ValueError:
+                continue
+    return None
+
+
+def parse_ytcfg(html: str) -> dict:
+    """
+    Merges every ytcfg.set({...}) call of a page, which holds the InnerTube API key and client context.
+
+    Args:
+        html (str): The page source.
+
+    Returns:
+        dict: The merged config, empty if the page sets none.
+    """
+    config = {}
+    for match in re.finditer(r'ytcfg\.set\(\s*', html):
+        if html.startswith("{", match.end()):
+            try:
+                data, _ = _decoder.raw_decode(html, match.end())
+            except ValueError:
+                continue
+            config.update(data)
+    return config
+
+
+def _text(node: Any) -> str:
+    """
+    Returns the text of a YouTube text object ({"simpleText": ...} or {"runs": [...]}).
+    """
+    if not isinstance(node, dict):
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    if "content" in node:
+        return node["content"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+def _get(node: Any, *path) -> Any:
+    """
+    Follows a path of keys/indexes through nested dicts and lists, returning None on any miss.
+    """
+    for key in path:
+        try:
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return node
+
+
+def _find(node: Any, key: str) -> Iterator[Any]:
+    """
+    Yields every value stored under `key` anywhere in a nested structure, in document order.
+    """
+    if isinstance(node, dict):
+        for k, value in node.items():
+            if k == key:
+                yield value
+            else:
+                yield from _find(value, key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _find(item, key)
+
+
+def parse_video_renderer(renderer: dict) -> SearchResult:
+    """
+    Maps a videoRenderer object to a SearchResult.
+    """
+    owner = _get(renderer, "ownerText", "runs", 0) or {}
+    browse = _get(owner, "navigationEndpoint", "browseEndpoint") or {}
+
+    return SearchResult(
+        title=_text(renderer.get("title")),
+        video_id=renderer.get("videoId", ""),
+        # The short form ("1.2M views") is what the results page displays
+        views_text=_text(renderer.get("shortViewCountText")) or _text(renderer.get("viewCountText")),
+        published_text=_text(renderer.get("publishedTimeText")),
+        duration_text=_text(renderer.get("lengthText")),
+        channel_name=owner.get("text", ""),
+        channel_url=browse.get("canonicalBaseUrl", ""),
+        channel_id=browse.get("browseId", ""),
+    )
+
+
+def parse_search_results(data: dict) -> list[SearchResult]:
+    """
+    Maps the ytInitialData of a search page to its video results, in page order.
+
+    Only videos listed directly in the result sections are returned; shelves such as
+    "People also watched" are skipped, matching the ytd-video-renderer[index] XPaths.
+
+    Args:
+        data (dict): The decoded ytInitialData.
+
+    Returns:
+        list[SearchResult]: The video results, empty if this is not a search page.
+    """
+    sections = _get(data, "contents", "twoColumnSearchResultsRenderer", "primaryContents",
+                    "sectionListRenderer", "contents") or []
+
+    results = []
+    for section in sections:
+        for item in _get(section, "itemSectionRenderer", "contents") or []:
+            if "videoRenderer" in item:
+                results.append(parse_video_renderer(item["videoRenderer"]))
+    return results
+
+
+def parse_channel_videos(data: dict) -> tuple[list[ChannelVideo], str | None]:
+    """
+    Maps the ytInitialData of a channel's videos tab, or a browse continuation response,
+    to its videos and the continuation token of the next page.
+
+    Args:
+        data (dict): The decoded ytInitialData or continuation response.
+
+    Returns:
+        tuple: The videos in page order, and the token of the next page (None on the last page).
+    """
+    videos = []
+    for item in _find(data, "richItemRenderer"):
+        renderer = _get(item, "content", "videoRenderer")
+        if not renderer:
+            continue
+        video_id = renderer.get("videoId", "")
+        videos.append(ChannelVideo(
+            video_id=video_id,
+            title=_text(renderer.get("title")),
+            video_url=f"/watch?v={video_id}" if video_id else "",
+            views_text=_text(renderer.get("viewCountText")) or _text(renderer.get("shortViewCountText")),
+            published_text=_text(renderer.get("publishedTimeText")),
+        ))
+
+    token = None
+    for item in _find(data, "continuationItemRenderer"):
+        token = _get(item, "continuationEndpoint", "continuationCommand", "token") or token
+    return videos, token
+
+
+def parse_channel_info(data: dict) -> ChannelInfo | None:
+    """
+    Maps the ytInitialData of a channel page to its header details.
+
+    Supports both the pageHeaderRenderer layout and the older c4TabbedHeaderRenderer.
+
+    Args:
+        data (dict): The decoded ytInitialData.
+
+    Returns:
+        ChannelInfo | None: The channel details, or None if this is not a channel page.
+    """
+    metadata = _get(data, "metadata", "channelMetadataRenderer") or {}
+    header = data.get("header") or {}
+    if not metadata and "c4TabbedHeaderRenderer" not in header and "pageHeaderRenderer" not in header:
+        return None
+
+    title = metadata.get("title", "")
+    channel_id = metadata.get("externalId", "")
+    vanity = metadata.get("vanityChannelUrl", "")
+    handle = vanity[vanity.index("/@") + 1:] if "/@" in vanity else ""
+    subscribers = ""
+
+    if "c4TabbedHeaderRenderer" in header:
+        renderer = header["c4TabbedHeaderRenderer"]
+        title = title or renderer.get("title", "")
+        handle = handle or _text(renderer.get("channelHandleText"))
+        subscribers = _text(renderer.get("subscriberCountText"))
+
+    elif "pageHeaderRenderer" in header:
+        for part in _find(header["pageHeaderRenderer"], "metadataParts"):
+            for item in part:
+                text = _text(item.get("text"))
+                if text.startswith("@") and not handle:
+                    handle = text
+                elif "subscriber" in text:
+                    subscribers = text
+
+    return ChannelInfo(title=title, handle=handle, channel_id=channel_id, subscribers_text=subscribers)
+
+
+# Runs in the page and returns every ytd-video-renderer of the results list in one WebDriver call.
+# The XPaths are the same ones the per-field helpers in yt_keywords.py wait on.
+SEARCH_RESULTS_SCRIPT = """
+const limit = arguments[0];
+const text = (node, xpath) => {
+    const found = document.evaluate(xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return found ? (found.innerText || found.textContent || "").trim() : "";
+};
+const href = (node, xpath) => {
+    const found = document.evaluate(xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return found ? (found.getAttribute("href") || "") : "";
+};
+const renderers = document.evaluate(
+    "/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const results = [];
+for (let i = 0; i < renderers.snapshotLength && (!limit || i < limit); i++) {
+    const node = renderers.snapshotItem(i);
+    results.push({
+        title: text(node, "./div[1]/div/div[1]/div/h3/a/yt-formatted-string"),
+        video_url: href(node, "./div[1]/div/div[1]/div/h3/a"),
+        views: text(node, "./div[1]/div/div[1]/ytd-video-meta-block/div[1]/div[2]/span[1]"),
+        published: text(node, "./div[1]/div/div[1]/ytd-video-meta-block/div[1]/div[2]/span[2]"),
+        duration: text(node, "./div[1]/ytd-thumbnail/a/div[1]/ytd-thumbnail-overlay-time-status-renderer/div[1]/badge-shape/div"),
+        subscribers: text(node, "./div[1]/div/div[2]/div/div/div[1]"),
+        channel_name: text(node, "./div[1]/div/div[2]/ytd-channel-name/div/div/yt-formatted-string/a"),
+        channel_url: href(node, "./div[1]/div/div[2]/ytd-channel-name/div/div/yt-formatted-string/a"),
+    });
+}
+return results;
+"""
+
+
+def _video_id(url: str) -> str:
+    """
+    Returns the video id of a "/watch?v=..." or "/shorts/..." link.
+    """
+    match = re.search(r'(?:[?&]v=|/shorts/)([\w-]{11})', url)
+    return match.group(1) if match else ""
+
+
+# Returns the ytd-rich-item-renderers of a channel's video grid from index arguments[0] on, so
+# every scroll only reads the videos it appended. Same fields as the #video-title/#metadata-line XPaths.
+CHANNEL_VIDEOS_SCRIPT = """
+const text = (node, xpath) => {
+    const found = document.evaluate(xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return found ? (found.innerText || found.textContent || "").trim() : "";
+};
+const href = (node, xpath) => {
+    const found = document.evaluate(xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return found ? (found.getAttribute("href") || "") : "";
+};
+const renderers = document.querySelectorAll("ytd-rich-item-renderer");
+const results = [];
+for (let i = arguments[0]; i < renderers.length; i++) {
+    const node = renderers[i];
+    results.push({
+        title: text(node, ".//*[@id='video-title']"),
+        video_url: href(node, ".//*[@id='video-title']") || href(node, ".//a[@id='video-title-link']"),
+        views: text(node, ".//*[@id='metadata-line']/span[1]"),
+        published: text(node, ".//*[@id='metadata-line']/span[2]"),
+    });
+}
+return results;
+"""
+
+
+def extract_channel_videos(driver: webdriver.Firefox, offset: int = 0) -> list[ChannelVideo]:
+    """
+    Reads the videos of a channel's grid from `offset` on with a single execute_script call.
+
+    Args:
+        driver (webdriver.Firefox): A Firefox WebDriver instance on a channel's videos tab.
+        offset (int): The number of grid items already read.
+
+    Returns:
+        list[ChannelVideo]: The videos rendered after `offset`, in page order.
+    """
+    with metrics.timed("extraction_seconds", stage="channel_videos"):
+        rows = driver.execute_script(CHANNEL_VIDEOS_SCRIPT, offset) or []
+
+    return [ChannelVideo(video_id=_video_id(row["video_url"]), title=row["title"], video_url=row["video_url"],
+                         views_text=row["views"], published_text=row["published"]) for row in rows]
+
+
+def extract_rendered_results(driver: webdriver.Firefox, limit: int = 0) -> list[SearchResult]:
+    """
+    Reads the rendered search results with a single execute_script call.
+
+    Args:
+        driver (webdriver.Firefox): A Firefox WebDriver instance on a search page.
+        limit (int): The maximum number of results to read, 0 for all.
+
+    Returns:
+        list[SearchResult]: The rendered results, in page order.
+    """
+    with metrics.timed("extraction_seconds", stage="rendered_results"):
+        rows = driver.execute_script(SEARCH_RESULTS_SCRIPT, limit) or []
+
+    results = []
+    for row in rows:
+        channel_url = row["channel_url"]
+        results.append(SearchResult(
+            title=row["title"].split(" by ")[0].strip(),
+            video_id=_video_id(row["video_url"]),
+            views_text=row["views"],
+            published_text=row["published"],
+            duration_text=row["duration"],
+            channel_name=row["channel_name"],
+            channel_url=channel_url,
+            channel_id=channel_url.split("/channel/")[1] if "/channel/" in channel_url else "",
+            subscribers_text=row["subscribers"],
+        ))
+    return results
+
+
+# id(driver) -> (url, ytInitialData) of the page last parsed for that driver
+_page_cache: dict[int, tuple[str, dict | None]] = {}
+
+# id(driver) -> (url, results) of the search page last read for that driver
+_results_cache: dict[int, tuple[str, list[SearchResult]]] = {}
+
+
+def get_initial_data(driver: webdriver.Firefox) -> dict | None:
+    """
+    Returns the ytInitialData of the page the driver is on, parsing page_source once per URL.
+
+    Args:
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
+
+    Returns:
+        dict | None: The decoded ytInitialData, or None if the page does not embed it.
+    """
+    url = driver.current_url
+    cached = _page_cache.get(id(driver))
+    if cached and cached[0] == url:
+        return cached[1]
+
+    with metrics.timed("extraction_seconds", stage="initial_data"):
+        data = extract_json_variable(driver.page_source, "ytInitialData")
+    _page_cache[id(driver)] = (url, data)
+    return data
+
+
+def invalidate(driver: webdriver.Firefox) -> None:
+    """
+    Forgets the parsed page of a driver. Call after every full page load.
+    """
+    _page_cache.pop(id(driver), None)
+    _results_cache.pop(id(driver), None)
+
+
+def search_results(driver: webdriver.Firefox, minimum: int = 1) -> list[SearchResult]:
+    """
+    Returns the video results of the search page the driver is on.
+
+    The rendered results are read in one execute_script call, since they also carry
+    the subscriber text. If fewer than `minimum` have rendered, the page's ytInitialData
+    is used instead. Results are cached per URL once `minimum` of them are available.
+
+    Args:
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
+        minimum (int): How many results the caller needs.
+
+    Returns:
+        list[SearchResult]: The video results, in page order.
+    """
+    url = driver.current_url
+    cached = _results_cache.get(id(driver))
+    if cached and cached[0] == url and len(cached[1]) >= minimum:
+        return cached[1]
+
+    try:
+        results = extract_rendered_results(driver)
+    except Exception:
+        results = []
+
+    if len(results) < minimum:
+        data = get_initial_data(driver)
+        parsed = parse_search_results(data) if data else []
+        if len(parsed) > len(results):
+            results = parsed
+
+    if len(results) >= minimum:
+        _results_cache[id(driver)] = (url, results)
+    return results
+
+
+def channel_info(driver: webdriver.Firefox) -> ChannelInfo | None:
+    """
+    Returns the header details of the channel page the driver is on.
+    """
+    data = get_initial_data(driver)
+    return parse_channel_info(data) if data else None
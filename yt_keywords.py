@@ -3,21 +3,20 @@ from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from database import add_channel_to_db
+from yt_data import SearchResult, search_results, invalidate
+from scoring import Observation, score_observations
+from parsing import parse_age_days, parse_count, parse_duration_minutes, parse_views
 from selenium import webdriver
-from utils import load_config
+from http_client import youtube_url
+from urllib.parse import quote_plus
+from settings import get_config
 from termcolor import colored
+from similarity import get_similarity_engine
 from fuzzywuzzy import fuzz
 from typing import Tuple
-from typing import Any
+from typing import Any, Callable
 
-import re
-
-recency_ratings = {
-    1: "Hot",
-    2: "Standard",
-    3: "Old",
-    4: "Very Old",
-}
+import metrics
 
 
 def keyword_search(keyword: str, driver: webdriver.Firefox) -> bool:
@@ -33,38 +32,19 @@ def keyword_search(keyword: str, driver: webdriver.Firefox) -> bool:
         bool: True if the search was successful, False otherwise.
     """
     try:
-        driver.get(f"https://www.youtube.com/results?search_query={keyword}&sp=EgIQAQ%253D%253D")
+        with metrics.timed("navigation_seconds", page="search"):
+            driver.get(youtube_url(f"/results?search_query={quote_plus(keyword)}&sp=EgIQAQ%253D%253D"))
+        invalidate(driver)
         return True
     except Exception as e:
         print(f"Error searching for keyword: {e}")
         return False
 
 
-def views_to_int(views: str) -> int:
-    """
-    Convert views to an integer value.
-
-    Parameters:
-        views (str): The string representation of the views.
-
-    Returns:
-        int: The integer value of the views.
-    """
-    views = views.strip("views").strip("view").strip()
-    if 'K' in views:
-        return int(float(views.replace('K', '')) * 1000)
-    elif 'M' in views:
-        return int(float(views.replace('M', '')) * 1000000)
-    else:
-        try:
-            return int(views)
-        except:  #If views = "No views"
-            return 0
-
-
 def get_title_views_recency(driver: webdriver.Firefox, index: int) -> Tuple[str, int, float]:
     """
     Retrieves the title, views, and recency of a YouTube video using the provided Firefox WebDriver and index.
+    Reads the page's ytInitialData, falling back to the rendered elements if it is unavailable.
 
     Parameters:
         driver (webdriver.Firefox): A Firefox WebDriver instance.
@@ -73,8 +53,13 @@ def get_title_views_recency(driver: webdriver.Firefox, index: int) -> Tuple[str,
     Returns:
         tuple: A tuple containing the title of the video as a string, the views as an integer, and the recency as a float.
     """
-    config = load_config('config.json')
-    wait = WebDriverWait(driver, config["Timeout"])
+    results = search_results(driver, index)
+    if len(results) >= index:
+        result = results[index - 1]
+        return result.title, parse_views(result.views_text), parse_age_days(result.published_text)
+
+    config = get_config()
+    wait = WebDriverWait(driver, config.timeout)
 
     # Wait for the video title to be present
     title_xpath = f'/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[1]/div/h3/a/yt-formatted-string'
@@ -85,45 +70,16 @@ def get_title_views_recency(driver: webdriver.Firefox, index: int) -> Tuple[str,
     # Wait for the video views to be present
     views_xpath = f"/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[1]/ytd-video-meta-block/div[1]/div[2]/span[1]"
     views_element = wait.until(ec.presence_of_element_located((By.XPATH, views_xpath)))
-    views_data = views_element.text.strip("views")
-    views = views_to_int(views_data)
+    views = parse_views(views_element.text)
 
     # Wait for the recency information to be present
     recency_xpath = f"/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[1]/ytd-video-meta-block/div[1]/div[2]/span[2]"
     recency_element = wait.until(ec.presence_of_element_located((By.XPATH, recency_xpath)))
-    recency_data = recency_element.text
-    recency_match = re.search(r'(\d+)\s(hours?|days?|minutes?|weeks?|months?|years?)\sago', recency_data)
-
-    # Convert recency to days if matched
-    recency_in_days = convert_recency_to_days(recency_match.group(1), recency_match.group(2)) if recency_match else 0.01
+    recency_in_days = parse_age_days(recency_element.text)
 
     return title, views, recency_in_days
 
 
-def convert_recency_to_days(amount: str, unit: str) -> float:
-    """
-    Converts a YouTube video recency from a string format to a float format in days.
-
-    Parameters:
-        amount (str): The amount of time in the unit provided.
-        unit (str): The unit of time.
-    """
-    amount = int(amount)
-    if "minute" in unit:
-        return round(amount / 1440, 4)
-    elif "hour" in unit:
-        return round(amount / 24, 4)
-    elif "day" in unit:
-        return float(amount)
-    elif "week" in unit:
-        return float(amount * 7)
-    elif "month" in unit:
-        return float(amount * 30)
-    elif "year" in unit:
-        return float(amount * 365)
-    return 0.0
-
-
 def get_subscribers(driver: webdriver.Firefox, index: int) -> int:
     """
     Retrieves the number of subscribers of the channel of a video.
@@ -135,28 +91,39 @@ def get_subscribers(driver: webdriver.Firefox, index: int) -> int:
     Returns:
         int: The number of subscribers of the channel of the video.
     """
-    config = load_config('config.json')
-    wait = WebDriverWait(driver, config["Timeout"])
+    config = get_config()
+    wait = WebDriverWait(driver, config.timeout)
+
+    results = search_results(driver, index)
+    subscribers_text = results[index - 1].subscribers_text if len(results) >= index else ""
 
     # In case of any issue (e.g., empty or invalid text), return the maximum subscriber count to avoid adding the channel and bugging out later
-    try:
-        xpath = f'/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[2]/div/div/div[1]'
-        subscribers_element = wait.until(ec.presence_of_element_located((By.XPATH, xpath)))
-        subscribers_text = subscribers_element.text
+    if not subscribers_text:
+        try:
+            xpath = f'/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[2]/div/div/div[1]'
+            subscribers_element = wait.until(ec.presence_of_element_located((By.XPATH, xpath)))
+            subscribers_text = subscribers_element.text
 
-    except:
-        return config["Max_Subscriber_Count"]+1
+        except:
+            return config.max_subscriber_count+1
 
-    try:
-        if 'K' in subscribers_text:
-            return int(float(subscribers_text.replace('K', '').replace(',', '').strip()) * 1000)
-        elif 'M' in subscribers_text:
-            return int(float(subscribers_text.replace('M', '').replace(',', '').strip()) * 1000000)
-        else:
-            return int(subscribers_text.replace(',', '').strip())
+    return subscribers_to_int(subscribers_text)
 
-    except:
-        return config["Max_Subscriber_Count"]+1
+
+def subscribers_to_int(subscribers_text: str) -> int:
+    """
+    Converts a subscriber count text such as "1.2K subscribers" to an integer.
+
+    Parameters:
+        subscribers_text (str): The subscriber count text.
+
+    Returns:
+        int: The number of subscribers, or one more than Max_Subscriber_Count if the text is invalid.
+    """
+    subscribers = parse_count(subscribers_text)
+    if subscribers is None:
+        return get_config().max_subscriber_count+1
+    return subscribers
 
 
 def get_channel_id(driver: webdriver.Firefox, index: int) -> str:
@@ -169,8 +136,8 @@ def get_channel_id(driver: webdriver.Firefox, index: int) -> str:
     Returns:
         str: The channel ID of the channel of the video.
     """
-    config = load_config('config.json')
-    wait = WebDriverWait(driver, config["Timeout"])
+    config = get_config()
+    wait = WebDriverWait(driver, config.timeout)
 
     xpath_to_channel = f"/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/div/div[2]/ytd-channel-name/div/div/yt-formatted-string/a"
     wait.until(ec.element_to_be_clickable((By.XPATH, xpath_to_channel))).click()
@@ -186,6 +153,38 @@ def get_channel_id(driver: webdriver.Firefox, index: int) -> str:
         return ""
 
 
+# Channel id (UC...) -> handle, for results that only link to /channel/<id>
+_channel_handles: dict[str, str] = {}
+
+
+def resolve_channel_handle(driver: webdriver.Firefox, result: SearchResult, index: int) -> str:
+    """
+    Resolves the handle of a result's channel without leaving the search page when possible.
+
+    The handle is read from the channel link of the result. Only legacy /channel/UC... links
+    need the channel page to be opened; those id -> handle mappings are memoized.
+
+    Parameters:
+        driver (webdriver.Firefox): A Firefox WebDriver instance on the search page.
+        result (SearchResult): The search result.
+        index (int): The index of the result in the YouTube search results, used for the fallback.
+
+    Returns:
+        str: The channel handle, or an empty string if it could not be resolved.
+    """
+    if result.channel_handle:
+        return result.channel_handle
+
+    if result.channel_id in _channel_handles:
+        return _channel_handles[result.channel_id]
+
+    handle = get_channel_id(driver, index)
+    driver.back()
+    if handle and result.channel_id:
+        _channel_handles[result.channel_id] = handle
+    return handle
+
+
 def get_video_duration(driver: webdriver.Firefox, index: int) -> float:
     """
     Retrieves the duration of a video and converts it to minutes.
@@ -197,43 +196,28 @@ def get_video_duration(driver: webdriver.Firefox, index: int) -> float:
     Returns:
         float: The duration of the video in minutes.
     """
-    config = load_config('config.json')
-    wait = WebDriverWait(driver, config["Timeout"])
+    results = search_results(driver, index)
+    if len(results) >= index:
+        return duration_text_to_minutes(results[index - 1].duration_text)
+
+    config = get_config()
+    wait = WebDriverWait(driver, config.timeout)
 
     try:
         xpath = f"/html/body/ytd-app/div[1]/ytd-page-manager/ytd-search/div[1]/ytd-two-column-search-results-renderer/div/ytd-section-list-renderer/div[2]/ytd-item-section-renderer/div[3]/ytd-video-renderer[{index}]/div[1]/ytd-thumbnail/a/div[1]/ytd-thumbnail-overlay-time-status-renderer/div[1]/badge-shape/div"
         duration_element = wait.until(ec.presence_of_element_located((By.XPATH, xpath)))
 
-        duration_text = duration_element.text.strip()
-        return convert_duration_to_minutes(duration_text)
+        return duration_text_to_minutes(duration_element.text)
     except Exception as e:
         return 0.01
 
 
-def convert_duration_to_minutes(duration: str) -> float:
+def duration_text_to_minutes(duration_text: str) -> float:
     """
-    Converts a duration string to minutes.
-
-    Parameters:
-        duration (str): The duration as a string, in the format "1:23", "12:34", "1:23:45".
-
-    Returns:
-        float: The duration in minutes.
+    Converts a duration text to minutes, returning 0.01 for live streams and premieres that have none.
     """
-    pattern = re.compile(r'(?:(\d+):)?(\d+):(\d+)')
-    match = pattern.match(duration)
-
-    if not match:
-        raise ValueError("Invalid duration format")
-
-    hours, minutes, seconds = match.groups()
-
-    hours = int(hours or 0)
-    minutes = int(minutes)
-    seconds = int(seconds)
-
-    total_minutes = hours * 60 + minutes + seconds / 60
-    return total_minutes
+    minutes = parse_duration_minutes(duration_text)
+    return 0.01 if minutes is None else minutes
 
 
 def calculate_similarity_weight(title: str, keyword: str) -> float:
@@ -317,47 +301,80 @@ def calculate_video_rating(title: str, keyword: str, views: int, recency: float,
     return volume_score, competition_score, recency_score
 
 
-def scrape_keyword_data(keyword: str, driver: webdriver.Firefox) -> Any:
+def collect_keyword_observations(keyword: str, driver: webdriver.Firefox,
+                                 on_channel: Callable[[str, int], None] | None = None) -> list[Observation]:
     """
-    Scrapes the title, views, and recency for the top 3 videos for a given keyword.
+    Reads the raw values of the top videos for a keyword from the search results page.
+    All results are read in one batch; per-field waits are only used for results missing from it.
+    Channels under the subscriber threshold are stored as they are found, or handed to `on_channel`.
 
     Parameters:
-        keyword (str): The keyword to search for on YouTube.
-        driver (webdriver.Firefox): A Firefox WebDriver instance.
+        keyword (str): The keyword that was searched.
+        driver (webdriver.Firefox): A Firefox WebDriver instance showing the search results.
+        on_channel (Callable[[str, int], None] | None): Receives (channel handle, subscribers) instead
+            of add_channel_to_db, e.g. to store the channels off the browser's thread.
 
     Returns:
-        list[dict]: A list of dictionaries, each containing the title, views, and recency of a video.
+        list[Observation]: One observation per scraped video, in result order.
     """
-    config = load_config('config.json')
+    config = get_config()
+    observations = []
 
-    # Default values
-    volume_total = 0
-    competition_total = 0
-    recency_rating_total = 0
+    results = search_results(driver, config.max_videos_scraped)
 
-    for i in range(1, config["Max_Videos_Scraped"]+1):
-        title, views, recency = get_title_views_recency(driver, i)
-        duration = round(get_video_duration(driver, i), 2)
+    for i in range(1, config.max_videos_scraped+1):
+        result = results[i - 1] if i <= len(results) else None
+        if result:
+            title, views, recency = result.title, parse_views(result.views_text), parse_age_days(result.published_text)
+            duration = round(duration_text_to_minutes(result.duration_text), 2)
 
-        subscribers = get_subscribers(driver, i)
+            subscribers = subscribers_to_int(result.subscribers_text) if result.subscribers_text else get_subscribers(driver, i)
+        else:
+            title, views, recency = get_title_views_recency(driver, i)
+            duration = round(get_video_duration(driver, i), 2)
 
-        if subscribers < config.get('Max_Subscriber_Count', 5000):
+            subscribers = get_subscribers(driver, i)
+
+        if subscribers < config.max_subscriber_count:
             print(colored("⏳  | Subscriber count under threshold, storing in database...", "yellow"))
-            channel_id = get_channel_id(driver, i)
-            driver.back()
+            if result:
+                channel_id = resolve_channel_handle(driver, result, i)
+            else:
+                channel_id = get_channel_id(driver, i)
+                driver.back()
             if channel_id != "":
-                add_channel_to_db(channel_id, subscribers)
+                (on_channel or add_channel_to_db)(channel_id, subscribers)
+
+        observations.append(Observation(keyword, i, title, views, recency, duration, subscribers,
+                                        result.video_id if result else ""))
+
+    return observations
+
+
+def score_keyword_observations(keyword: str, observations: list[Observation]) -> list:
+    """
+    Averages the scores of a keyword's observations into its volume, competition and recency rating.
+
+    Parameters:
+        keyword (str): The keyword the observations belong to.
+        observations (list[Observation]): The observations returned by collect_keyword_observations.
+
+    Returns:
+        list: [volume, competition, recency rating].
+    """
+    scores = score_observations(observations, get_similarity_engine().score_pairs, get_config().max_videos_scraped)
+    return list(scores[keyword])
 
-        volume, competition, recency_score = calculate_video_rating(keyword, title, views, recency, duration, subscribers)
-        competition = round(competition)
 
-        volume_total += volume
-        competition_total += competition
-        recency_rating_total += recency_score
+def scrape_keyword_data(keyword: str, driver: webdriver.Firefox) -> Any:
+    """
+    Scrapes the top videos for a given keyword and scores them.
 
+    Parameters:
+        keyword (str): The keyword to search for on YouTube.
+        driver (webdriver.Firefox): A Firefox WebDriver instance.
 
-    volume = round(volume_total/config["Max_Videos_Scraped"])
-    competition = round(competition_total/config["Max_Videos_Scraped"])
-    recency_rating = round(recency_rating_total/config["Max_Videos_Scraped"])
-    recency_rating = recency_ratings.get(recency_rating)
-    return [volume, competition, recency_rating]
+    Returns:
+        list: [volume, competition, recency rating].
+    """
+    return score_keyword_observations(keyword, collect_keyword_observations(keyword, driver))